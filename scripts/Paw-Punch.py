@@ -1,163 +1,209 @@
+import argparse
+import os  # add os module for path checks
+import sys
+import time  # add time module for countdowns
+from concurrent.futures import ThreadPoolExecutor
+
+from render_layout import Layout, open_window, parse_size
+
+LAUNCH_TIME = time.perf_counter()
+
+# =======================
+# Command line
+# =======================
+parser = argparse.ArgumentParser(description="Paw-Punch: Rock-Paper-Scissors against a cat paw")
+parser.add_argument("--source", default="0",
+                    help="camera index, video file, directory of frames or synthetic[:WxH[@FPS]] (default: camera 0)")
+parser.add_argument("--camera-size", type=parse_size, metavar="WxH",
+                    help="camera resolution to request, e.g. 640x480 (default: driver default)")
+parser.add_argument("--camera-fps", type=float, help="camera frame rate to request")
+parser.add_argument("--camera-format", choices=("MJPG", "YUYV"),
+                    help="camera pixel format: MJPG (compressed, high resolutions at full rate) or YUYV (raw)")
+parser.add_argument("--camera-buffer", type=int, metavar="N",
+                    help="driver frame queue length; 1 keeps frames fresh (not supported by every backend)")
+parser.add_argument("--headless", action="store_true",
+                    help="no window or sound; process every frame of --source as fast as possible and print a benchmark report")
+parser.add_argument("--max-frames", type=int, default=0,
+                    help="stop after this many frames (0 = until the source ends)")
+parser.add_argument("--full-inference", action="store_true",
+                    help="run MediaPipe on every full-resolution frame in every game phase (disables adaptive scheduling)")
+parser.add_argument("--dump-landmarks", metavar="NPZ",
+                    help="save every detected hand's landmarks + handedness to this .npz on exit (corpus for bench_classifier.py)")
+parser.add_argument("--record-trace", metavar="PATH",
+                    help="append every inference (landmarks, handedness, gestures, phase, vote buffers) to this trace file")
+parser.add_argument("--model", metavar="NPZ",
+                    help="learned gesture model (train_classifier.py) used where the rule-based classifier is uncertain")
+parser.add_argument("--model-confidence", type=float, default=0.7,
+                    help="minimum calibrated confidence for a --model prediction to count (default: 0.7)")
+parser.add_argument("--size", type=parse_size, metavar="WxH",
+                    help="window size, e.g. 1280x720 (default: 800x480, or the desktop size with --fullscreen)")
+parser.add_argument("--fullscreen", action="store_true", help="run fullscreen")
+parser.add_argument("--vsync", action="store_true", help="sync presentation to the display refresh (if supported)")
+parser.add_argument("--fps", type=int,
+                    help="render frame rate cap; 0 = uncapped (default: from the performance profile, 60 when balanced)")
+parser.add_argument("--perf-profile", default="balanced", choices=("low-power", "balanced", "quality"),
+                    help="performance profile: model, inference rates, preview size and frame cap (cycle with F4)")
+parser.add_argument("--config", metavar="JSON",
+                    help="runtime settings file on top of --perf-profile; edits are applied while the game runs")
+parser.add_argument("--asset-cache", metavar="DIR",
+                    help="where scaled paw atlases are cached (default: ~/.cache/paw-punch; empty string disables)")
+parser.add_argument("--cat-strategy", default="uniform", choices=("uniform", "frequency", "markov"),
+                    help="how the cat picks its move: random, counter the player's favourite, or predict their next move")
+parser.add_argument("--stats-db", metavar="PATH",
+                    help="append every finished round to this SQLite statistics database (see stats_report.py)")
+parser.add_argument("--station", type=int, default=0, help="station id recorded with --stats-db")
+parser.add_argument("--record-rounds", metavar="DIR",
+                    help="write a video clip of every round (countdown to result) into this directory")
+parser.add_argument("--record-fps", type=float, default=15.0, help="frame rate of the round clips (default: 15)")
+parser.add_argument("--record-scale", type=float, default=0.5,
+                    help="size of the round clips as a fraction of the window (default: 0.5)")
+parser.add_argument("--record-camera", action="store_true",
+                    help="also write the raw camera frames of every round (a second clip per round)")
+parser.add_argument("--profile", action="store_true",
+                    help="collect per-stage timings and show the profiling overlay (toggle with F3)")
+parser.add_argument("--metrics-file", metavar="PATH",
+                    help="periodically write per-stage latency percentiles and pipeline counters to this file")
+parser.add_argument("--metrics-format", choices=("jsonl", "prom"), default="jsonl",
+                    help="metrics file format: appended JSON lines or Prometheus text (default: jsonl)")
+parser.add_argument("--metrics-interval", type=float, default=10.0, help="seconds between metrics writes")
+args = parser.parse_args()
+
+if args.headless:
+    # SDL dummy drivers: pygame renders into an off-screen surface, no display or audio device needed
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
 import cv2
 import mediapipe as mp
-mp_drawing = mp.solutions.drawing_utils
-mp_styles = mp.solutions.drawing_styles
+import numpy as np
 import pygame
-import sys
-import os  # add os module for path checks
-import time  # add time module for countdowns
-import random  # add random module for random gesture selection
-from collections import deque
+from assets import AssetManager, SoundBank
+from background import DirtyRegions, ScrollingBackground
+from capture_pipeline import CapturePipeline, SynchronousPipeline
+from debug_overlay import HandOverlay
+from frame_clock import FixedTimestep
+from frame_sources import open_source
+from game_session import GameSession
+from gesture_classifier import classify_batch, gesture_name, results_to_arrays, save_corpus
+from inference_scheduler import InferenceScheduler
+from learned_classifier import GestureModel
+from metrics import MetricsExporter, MetricsOverlay
+from preview import CameraPreview
+from round_recorder import RoundRecorder
+from runtime_config import GRAPH_SETTINGS, PROFILES, ConfigError, ConfigWatcher, ProfileMeter, build_config, \
+    changed_settings
+from stage_timer import Milestones, StageTimer
+from stats_store import StatsRecorder
+from text_cache import TextCache
+from trace_log import TraceWriter
 
 # =======================
 # Initialization
 # =======================
-# Open camera
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
-    print("Unable to open camera")
+startup = Milestones(LAUNCH_TIME)
+startup.mark("imports")
+
+# Runtime settings: performance profile + optional config file (re-read while running)
+config_watcher = ConfigWatcher(args.config, args.perf_profile) if args.config else None
+try:
+    config = config_watcher.load() if config_watcher else build_config(args.perf_profile)
+except (OSError, ConfigError) as e:
+    print(f"Invalid config: {e}")
     sys.exit()
+if args.fps is not None:
+    config["render"]["fps"] = args.fps
 
 # Initialize MediaPipe Hands module
 mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=False,
-                       max_num_hands=2,
-                       min_detection_confidence=0.5,
-                       min_tracking_confidence=0.5)
+
+def make_hands(max_num_hands, static_image_mode=False):
+    # Reads the active config, so graphs rebuilt after a reload pick up its model and confidences
+    settings = config["inference"]
+    return mp_hands.Hands(static_image_mode=static_image_mode,
+                          max_num_hands=max_num_hands,
+                          model_complexity=settings["model_complexity"],
+                          min_detection_confidence=settings["min_detection_confidence"],
+                          min_tracking_confidence=settings["min_tracking_confidence"])
+
+
+def scheduler_settings(settings):
+    return {"max_num_hands": settings["max_num_hands"], "search_width": settings["search_width"],
+            "use_roi": settings["use_roi"],
+            "phase_rates": {"idle": settings["idle_hz"], "reveal": settings["reveal_hz"]}}
+
+# Inference only runs in the game phases that read landmarks, on a downscaled frame or a crop around the hand
+# The session follows hands by track id, so the scheduler keeps looking for every hand and crops around the player's
+scheduler = InferenceScheduler(make_hands, enabled=not args.full_inference, track_hands=True,
+                               **scheduler_settings(config["inference"]))
+
+# Opening the camera (or the recorded video / frame directory given by --source) and building the
+# MediaPipe graphs (a tracking graph for the search frames, a static one for the crops) both block for a while;
+# run them while pygame, the window and the assets load
+init_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="init")
+camera_width, camera_height = args.camera_size or (None, None)
+cap_future = init_pool.submit(open_source, args.source, camera_width, camera_height, args.camera_fps,
+                              args.camera_format, args.camera_buffer)
+graph_future = init_pool.submit(scheduler.prebuild)
+
+# Optional learned classifier: fills in hands the rules can't decide (None) when it is confident enough
+gesture_model = GestureModel.load(args.model) if args.model else None
 
 # Initialize pygame
 pygame.init()
 
-# Configuration: whether to draw MediaPipe landmark control points on the camera preview
-SHOW_LANDMARKS = False
+# Configuration: whether to draw landmarks, finger states and the start buffer on the camera preview
+SHOW_LANDMARKS = config["render"]["show_landmarks"]
+# Hands older than this (frames the scheduler skipped) are not drawn on a newer preview frame
+OVERLAY_MAX_AGE_S = 0.2
 
 # Compute project path so the script uses relative paths; moving the folder won't break it
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 ASSETS_DIR = os.path.join(PROJECT_ROOT, 'assets')
 SOUNDS_DIR = os.path.join(PROJECT_ROOT, 'sounds')
 
-# Initialize mixer and load cat meow sound (if present)
+# Initialize mixer (if present)
 try:
     pygame.mixer.init()
 except Exception:
     # In some environments the mixer may fail to initialize (no sound card, etc.), ignore error so program continues
     pass
-# Use relative paths to find sound files (more robust)
-cat_sound = None
-cat_sound_path = os.path.join(SOUNDS_DIR, 'Cat_Meow.wav')
-if os.path.exists(cat_sound_path):
-    try:
-        cat_sound = pygame.mixer.Sound(cat_sound_path)
-        cat_sound.set_volume(0.9)
-    except Exception:
-        cat_sound = None
-# Play the cat meow once at startup (play only once)
-try:
-    if cat_sound:
-        cat_sound.play()
-except Exception:
-    pass
-
-# Result sound effects (win/lose/draw)
-win_sound = None
-lose_sound = None
-draw_sound = None
-win_sound_path = os.path.join(SOUNDS_DIR, 'Win.wav')
-lose_sound_path = os.path.join(SOUNDS_DIR, 'Lose.wav')
-draw_sound_path = os.path.join(SOUNDS_DIR, 'Draw.wav')
-if os.path.exists(win_sound_path):
-    try:
-        win_sound = pygame.mixer.Sound(win_sound_path)
-        win_sound.set_volume(0.9)
-    except Exception:
-        win_sound = None
-if os.path.exists(lose_sound_path):
-    try:
-        lose_sound = pygame.mixer.Sound(lose_sound_path)
-        lose_sound.set_volume(0.9)
-    except Exception:
-        lose_sound = None
-if os.path.exists(draw_sound_path):
-    try:
-        draw_sound = pygame.mixer.Sound(draw_sound_path)
-        draw_sound.set_volume(0.9)
-    except Exception:
-        draw_sound = None
-
-# Background music (BGM) - play looped at low volume if present
-bgm_path = os.path.join(SOUNDS_DIR, 'Hopeful.mp3')
-bgm_playing = False
-if os.path.exists(bgm_path):
-    try:
-        # Use pygame's music module for streaming longer music files
-        pygame.mixer.music.load(bgm_path)
-        pygame.mixer.music.set_volume(0.12)  # low volume
-        pygame.mixer.music.play(-1)  # loop indefinitely
-        bgm_playing = True
-    except Exception:
-        bgm_playing = False
-
-# Create pygame window
-WINDOW_WIDTH, WINDOW_HEIGHT = 800, 480
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+# Cat meow (played once at startup), win/lose/draw effects and looped low-volume background music.
+# They are decoded on a background thread so the window doesn't wait for them.
+sounds = SoundBank(SOUNDS_DIR, {"meow": ("Cat_Meow.wav", 0.9), "win": ("Win.wav", 0.9),
+                                "lose": ("Lose.wav", 0.9), "draw": ("Draw.wav", 0.9)},
+                   music="Hopeful.mp3", music_volume=0.12)
+sounds.start(play_first="meow")
+
+# Create pygame window; everything below is laid out for 800x480 and scaled to the actual size
+screen = open_window(args.size, fullscreen=args.fullscreen, vsync=args.vsync)
 pygame.display.set_caption("Paw-Punch")
+WINDOW_WIDTH, WINDOW_HEIGHT = screen.get_size()
+layout = Layout((WINDOW_WIDTH, WINDOW_HEIGHT))
+startup.mark("window")
 
 # Define left and right panels
 LEFT_PANEL_WIDTH = WINDOW_WIDTH // 2
 RIGHT_PANEL_WIDTH = WINDOW_WIDTH - LEFT_PANEL_WIDTH
 
-# Load cat hand assets
-cat_hands_path = os.path.join(ASSETS_DIR, "Cat Hands.png")
-if not os.path.exists(cat_hands_path):
-    print(f"Cat hand image not found: {cat_hands_path}")
+# Cat paws: cut, flipped and scaled to their final size once, packed into one atlas that is cached on disk
+assets = AssetManager(ASSETS_DIR, cache_dir=args.asset_cache)
+try:
+    cat_hands = assets.load_paws((WINDOW_WIDTH, WINDOW_HEIGHT))
+    background_image = assets.load_background_tile((layout.px(100), layout.px(100)))  # tile scaled to 100x100
+except FileNotFoundError as e:
+    print(f"Image not found: {e}")
     sys.exit()
+startup.mark("assets")
 
-cat_hands_image = pygame.image.load(cat_hands_path)
-cat_hands_width, cat_hands_height = cat_hands_image.get_size()
-
-# Split the full image into three separate images and flip vertically
-single_width = cat_hands_width // 3
-cat_hands = {
-    "paper": pygame.transform.flip(cat_hands_image.subsurface((0, 0, single_width, cat_hands_height)), False, True),
-    "rock": pygame.transform.flip(cat_hands_image.subsurface((single_width, 0, single_width, cat_hands_height)), False, True),
-    "scissors": pygame.transform.flip(cat_hands_image.subsurface((2 * single_width, 0, single_width, cat_hands_height)), False, True)
-}
-
-# Example: prepare left-side display
-current_hand = "paper"  # currently displayed hand
-
-# Scale down cat hand images
-for gesture in cat_hands:
-    cat_hands[gesture] = pygame.transform.scale(cat_hands[gesture], (cat_hands[gesture].get_width() // 2, cat_hands[gesture].get_height() // 2))
-
-# Load background tile
-background_path = os.path.join(ASSETS_DIR, 'Background.png')
-if not os.path.exists(background_path):
-    print(f"Background image not found: {background_path}")
+# Frame source and MediaPipe graph were opening in the background meanwhile
+cap = cap_future.result()
+if not cap.isOpened():
+    print(f"Unable to open frame source: {args.source}")
     sys.exit()
-
-background_image = pygame.image.load(background_path)
-background_image = pygame.transform.scale(background_image, (100, 100))  # scale tile to 100x100
-
-# Define left cat-hand area and right camera display area
-cat_hand_area = (50, 50)  # top-left of left cat-hand area
-cam_area = (WINDOW_WIDTH - cat_hand_area[0] - 50, 50)  # top-left of right camera area
-
-# Nudge camera area to be closer to the window edge
-cam_area = (cam_area[0] - 10, cam_area[1] - 10)
-
-# Enlarge cat hand images
-for gesture in cat_hands:
-    cat_hands[gesture] = pygame.transform.scale(cat_hands[gesture], (cat_hands[gesture].get_width() * 2, cat_hands[gesture].get_height() * 2))
-
-# Further enlarge by 1.5x to make the paw larger
-for gesture in cat_hands:
-    w, h = cat_hands[gesture].get_size()
-    cat_hands[gesture] = pygame.transform.scale(cat_hands[gesture], (int(w * 1.5), int(h * 1.5)))
-
-# Position camera preview smaller and in bottom-right
-cam_width, cam_height = WINDOW_WIDTH // 4, WINDOW_HEIGHT // 4
-cam_area = (WINDOW_WIDTH - cam_width - 10, WINDOW_HEIGHT - cam_height - 10)
+startup.mark("camera")
+graph_future.result()
+startup.mark("mediapipe")
+init_pool.shutdown(wait=False)
 
 # Center cat-hand display area
 cat_hand_area = (WINDOW_WIDTH // 2 - cat_hands["rock"].get_width() // 2, WINDOW_HEIGHT // 2 - cat_hands["rock"].get_height() // 2)
@@ -166,431 +212,364 @@ cat_hand_area = (WINDOW_WIDTH // 2 - cat_hands["rock"].get_width() // 2, WINDOW_
 # Layout and positions
 # =======================
 cat_hand_x = WINDOW_WIDTH // 2 - cat_hands["rock"].get_width() // 2
-cat_start_y = -50  # initial (idle) cat paw Y position; moved further up so the paw sits higher on the title/idle screen
-cat_target_y = WINDOW_HEIGHT // 2 - cat_hands["rock"].get_height() // 2 - 140  # move up 140px (a bit more)
-cat_hand_y = cat_start_y
-# Movement speed of the cat paw
-cat_speed = 5
+cat_start_y = layout.px(-50)  # initial (idle) cat paw Y position; moved further up so the paw sits higher on the title/idle screen
+cat_target_y = WINDOW_HEIGHT // 2 - cat_hands["rock"].get_height() // 2 - layout.px(140)  # move up 140px (a bit more)
+# Movement speed of the cat paw (pixels per 60 Hz animation step, whatever the render rate)
+cat_speed = config["render"]["cat_speed"] * layout.scale
 
-cam_width, cam_height = WINDOW_WIDTH // 4, WINDOW_HEIGHT // 4
-cam_area = (WINDOW_WIDTH - cam_width - 10, WINDOW_HEIGHT - cam_height - 10)
 
-# =======================
-# Game state
-# =======================
-current_hand = "paper"
-player_gesture = None
-cat_gesture = None
-
-# Cat paw animation state
-revealing = False  # cat paw is extending animation
-# Whether the player has triggered the round (previously fist/rock, now paper allowed)
-start_triggered = False
-
-# Temporal smoothing: require N consecutive frames to trigger start
-start_buffer = deque(maxlen=3)
-# Final gesture buffer collected during revealing; majority vote used
-final_gesture_buffer = deque(maxlen=5)
-
-counting_down = False
-countdown_start = 0
-countdown = 3
-
-show_result = False
-result_text = ""
-result_timer = 0
-
-# Background scrolling parameters (scroll toward bottom-right)
-bg_offset_x = 0.0
-bg_offset_y = 0.0
-bg_speed_x = 0.5  # pixels/frame to the right (tweakable)
-bg_speed_y = 0.25  # pixels/frame downward (tweakable)
-
-# Add pygame clock object
-clock = pygame.time.Clock()
+def preview_size(scale):
+    # Camera preview sits in the bottom-right corner, a fraction of the window
+    return int(WINDOW_WIDTH * scale), int(WINDOW_HEIGHT * scale)
 
-# Text outline drawing helper
-def draw_text_with_outline(surface, text, font, pos, fg_color, outline_color, outline_width=2):
-    # Draw a multi-layer outline (simple but effective)
-    for ox in range(-outline_width, outline_width+1):
-        for oy in range(-outline_width, outline_width+1):
-            if ox == 0 and oy == 0:
-                continue
-            outline_surf = font.render(text, True, outline_color)
-            surface.blit(outline_surf, (pos[0] + ox, pos[1] + oy))
-    main_surf = font.render(text, True, fg_color)
-    surface.blit(main_surf, pos)
+# Preview-sized buffer + surface, reused every frame
+camera_preview = CameraPreview(preview_size(config["render"]["preview_scale"]))
+# Debug overlay drawn onto that preview surface (SHOW_LANDMARKS)
+hand_overlay = HandOverlay()
+overlay_hands = None  # (landmarks, handedness, capture time) of the newest inference that ran
 
 # =======================
-# Recognition / decision functions
+# Game state (one station: start trigger, countdown, paw reveal, reveal vote and result)
 # =======================
-def recognize_hand_gesture(hand_landmarks, hand_label=None):
-    """More robust hand gesture recognition (thresholds + majority rules):
-    - Uses TIP vs PIP y-differences with thresholds to avoid jitter
-    - Uses TIP.x - IP.x for thumb with handedness info
-    - Returns: 'rock' / 'paper' / 'scissors' / None
-    """
-    lm = hand_landmarks.landmark
-
-    # Thresholds (empirical, tweakable)
-    THRESH_Y = 0.04  # TIP above PIP by this amount => finger considered extended
-    THRESH_THUMB_X = 0.03  # thumb x-axis difference threshold
-
-    # safe reader to avoid index errors
-    def y_diff(tip_idx, pip_idx):
-        try:
-            return lm[pip_idx].y - lm[tip_idx].y
-        except Exception:
-            return 0.0
-
-    # For the other four fingers: PIP.y - TIP.y > THRESH_Y indicates extended
-    index_open = y_diff(mp_hands.HandLandmark.INDEX_FINGER_TIP, mp_hands.HandLandmark.INDEX_FINGER_PIP) > THRESH_Y
-    middle_open = y_diff(mp_hands.HandLandmark.MIDDLE_FINGER_TIP, mp_hands.HandLandmark.MIDDLE_FINGER_PIP) > THRESH_Y
-    ring_open = y_diff(mp_hands.HandLandmark.RING_FINGER_TIP, mp_hands.HandLandmark.RING_FINGER_PIP) > THRESH_Y
-    pinky_open = y_diff(mp_hands.HandLandmark.PINKY_TIP, mp_hands.HandLandmark.PINKY_PIP) > THRESH_Y
-
-    # Thumb detection: use x-axis difference and handedness
-    try:
-        thumb_tip = lm[mp_hands.HandLandmark.THUMB_TIP]
-        thumb_ip = lm[mp_hands.HandLandmark.THUMB_IP]
-        thumb_dx = thumb_tip.x - thumb_ip.x
-    except Exception:
-        thumb_dx = 0.0
-
-    if hand_label == 'Right':
-        thumb_open = thumb_dx > THRESH_THUMB_X
-    elif hand_label == 'Left':
-        thumb_open = thumb_dx < -THRESH_THUMB_X
-    else:
-        # When handedness is unavailable, relax condition: either x diff or y diff can indicate thumb open
-        thumb_open = abs(thumb_dx) > THRESH_THUMB_X or y_diff(mp_hands.HandLandmark.THUMB_TIP, mp_hands.HandLandmark.THUMB_IP) > THRESH_Y
-
-    # Count opened fingers
-    fingers_open = [thumb_open, index_open, middle_open, ring_open, pinky_open]
-    open_count = sum(1 for f in fingers_open if f)
-
-    # Decision rules (thresholds + open count)
-    # paper: majority of fingers (>=4) extended
-    if open_count >= 4:
-        return "paper"
-    # Scissors: index and middle fingers extended, others bent
-    if index_open and middle_open and not ring_open and not pinky_open:
-        # Thumb can be any state and it's still counted as scissors
-        return "scissors"
-    # Rock: no fingers clearly extended
-    if open_count == 0:
-        return "rock"
-
-    # If uncertain, return None (upper layer can use buffering/fallback)
-    return None
-
-def determine_result(player, cat):
-    """Determine result of the round.
-    Normalizes inputs and handles invalid input by returning "No Move".
-    Returns: "Draw" / "You Win!" / "You Lose!" / "No Move"
-    """
-    if not player or not cat:
-        return "No Move"
-
-    p = str(player).lower()
-    c = str(cat).lower()
-
-    if p == c:
-        return "Draw"
-    if (p == "rock" and c == "scissors") or \
-       (p == "scissors" and c == "paper") or \
-       (p == "paper" and c == "rock"):
-        return "You Win!"
-    return "You Lose!"
-
-def reset_round():
-    global player_gesture, current_hand, counting_down, countdown_start, cat_hand_y
-    player_gesture = None
-    counting_down = False
-    countdown_start = 0
-    current_hand = random.choice(["rock","paper","scissors"])
-    cat_hand_y = cat_start_y
-    # require player to trigger the next round again
-    global start_triggered
-    start_triggered = False
+session = GameSession(cat_start_y=cat_start_y, cat_target_y=cat_target_y, cat_speed=cat_speed,
+                      strategy=args.cat_strategy, **config["smoothing"])
+
+# Background scrolling parameters (scroll toward bottom-right), pixels/step right and down
+bg_speed_x, bg_speed_y = (v * layout.scale for v in config["render"]["bg_speed"])
+# Tiles are composited once into an oversized surface; each frame blits one window-sized sub-rect
+background = ScrollingBackground(background_image, (WINDOW_WIDTH, WINDOW_HEIGHT), (bg_speed_x, bg_speed_y))
+# Scrolling advances in fixed 60 Hz steps, so its speed doesn't depend on the render rate
+background_clock = FixedTimestep()
+# When the background didn't move, only the regions drawn on top of it are pushed to the display
+dirty = DirtyRegions()
+
+# Add pygame clock object; rendering runs at a steady rate independent of inference speed (0 = uncapped)
+clock = pygame.time.Clock()
+RENDER_FPS = config["render"]["fps"]
+
+# Per-stage timers: off unless benchmarking, profiling or exporting metrics (start/stop are no-ops then).
+# The live game keeps a rolling window; the headless benchmark keeps every sample.
+timer = StageTimer(enabled=args.headless or args.profile or bool(args.metrics_file),
+                   window=None if args.headless else 600)
+BENCH_STAGES = ("capture", "flip_convert", "hands_process", "classify", "render")
+PROFILE_STAGES = ("frame", "capture", "flip_convert", "hands_process", "classify", "background", "preview",
+                  "text", "update", "present")
+
+# Camera capture and MediaPipe run on their own threads; the render loop only picks up the newest result.
+# Headless mode processes every frame inline instead so each stage can be timed.
+if args.headless:
+    pipeline = SynchronousPipeline(cap, scheduler, timer)
+else:
+    pipeline = CapturePipeline(cap, scheduler, timer)
+latest = None  # newest InferenceResult (frame + landmarks) drawn by the renderer
+dumped_landmarks, dumped_handedness = [], []
+# Opt-in landmark/gesture trace for reproducing recognition problems offline (replay_trace.py)
+trace_writer = TraceWriter(args.record_trace) if args.record_trace else None
+# Opt-in round statistics; rounds are queued here and written in batches by a background thread
+stats_recorder = StatsRecorder(args.stats_db) if args.stats_db else None
+# Opt-in round clips; the render loop only copies the finished frame, a background thread encodes it
+round_recorder = RoundRecorder(args.record_rounds, args.record_fps, args.record_scale, args.record_camera,
+                               prefix="station%d" % args.station) if args.record_rounds else None
+clip_tag = None  # outcome of the round being recorded, added to the clip's file name
+
+# Outlined HUD text: fonts load once and each string is rendered once, then reused from an LRU cache
+text_cache = TextCache(max_entries=64)
+
+# Profiling overlay (F3) and periodic metrics dump for fleet monitoring
+profile_overlay = MetricsOverlay(timer, font_size=layout.font(20), stage_order=PROFILE_STAGES)
+profile_overlay.visible = args.profile
+metrics_exporter = MetricsExporter(args.metrics_file, args.metrics_format, args.metrics_interval,
+                                   station=str(args.station)) \
+    if args.metrics_file else None
+
+
+# What the active profile costs (CPU, frame rate, inference time), shown in the overlay and exported
+profile_meter = ProfileMeter()
+profile_meter.reset(config["profile"])
+
+
+def metrics_extra():
+    extra = {"pipeline": pipeline.stats(), "scheduler": scheduler.stats(), "text_cache": text_cache.stats(),
+             "display": dirty.stats(), "profile": profile_meter.summary()}
+    if round_recorder:
+        extra["recorder"] = round_recorder.stats()
+    return extra
+
+
+def apply_config(new):
+    """Switch to a new config without restarting: only what changed is touched, the camera stays open."""
+    global config, SHOW_LANDMARKS, RENDER_FPS
+    if args.fps is not None:
+        new["render"]["fps"] = args.fps  # the command line wins over every profile
+    changed = changed_settings(config, new)
+    config = new
+    render = config["render"]
+    SHOW_LANDMARKS = render["show_landmarks"]
+    RENDER_FPS = render["fps"]
+    if ("render", "preview_scale") in changed:
+        camera_preview.resize(preview_size(render["preview_scale"]))
+    background.speed_x, background.speed_y = (v * layout.scale for v in render["bg_speed"])
+    scheduler.configure(rebuild_graphs=any(("inference", key) in changed for key in GRAPH_SETTINGS),
+                        **scheduler_settings(config["inference"]))
+    session.configure(cat_speed=render["cat_speed"] * layout.scale, **config["smoothing"])
+    profile_meter.reset(config["profile"])
+    print("Applied %s profile (%d settings changed)" % (config["profile"], len(changed)))
 
 # =======================
 # Main loop
 # =======================
+pipeline.start()
+frames_rendered = 0
+bench_start = time.perf_counter()
 running = True
 while running:
+    timer.start("frame")
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
-
-    # Capture camera
-    ret, frame = cap.read()
-    if not ret:
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profile_overlay.toggle()
+            # Timers only need to run while someone is looking at them
+            timer.enabled = profile_overlay.visible or args.headless or bool(args.metrics_file)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+            # Cycle performance profiles (the config file's own overrides are not reapplied)
+            names = list(PROFILES)
+            apply_config(build_config(names[(names.index(config["profile"]) + 1) % len(names)]))
+    if config_watcher:
+        reloaded = config_watcher.poll()
+        if reloaded is not None:
+            apply_config(reloaded)
+
+    # Tell the inference scheduler which game phase we're in (it skips phases that don't read landmarks)
+    scheduler.set_phase(session.phase)
+
+    # Pick up the newest capture + MediaPipe result (None if inference hasn't produced a new one yet)
+    new_results = pipeline.poll_all()
+    if new_results:
+        # Only the newest frame is drawn (older ones just carry landmarks): the others' buffers and the
+        # previous frame's go back to the capture ring
+        for stale in new_results[:-1]:
+            pipeline.release(stale)
+        if latest is not None:
+            pipeline.release(latest)
+        latest = new_results[-1]
+    elif pipeline.finished:
+        # Camera stopped delivering frames
         break
-    frame = cv2.flip(frame, 1)
-    # Prepare RGB image for MediaPipe
-    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-    # Let MediaPipe process the frame (one pass, results used below)
-    results = hands.process(frame_rgb)
-
-    # =======================
-    # Player gesture recognition (using processed results)
-    # =======================
-    if not counting_down and not show_result and results.multi_hand_landmarks:
-    # Read handedness list (may be None)
-        handedness_list = results.multi_handedness if results.multi_handedness else [None] * len(results.multi_hand_landmarks)
-        for hand_landmarks, hand_handedness in zip(results.multi_hand_landmarks, handedness_list):
-            hand_label = None
-            try:
-                hand_label = hand_handedness.classification[0].label
-            except Exception:
-                hand_label = None
-            gesture = recognize_hand_gesture(hand_landmarks, hand_label)
-            # Start trigger: require consecutive frames of paper (hand extended) to begin; reduces false triggers
-            start_buffer.append(gesture)
-            # When N consecutive frames are paper (or rock for tolerance) start countdown
-            # Accept either paper or rock for robustness
-            if len(start_buffer) == start_buffer.maxlen and all((g in ("paper","rock")) and g is not None for g in start_buffer):
-                # Set the player's current gesture to the most frequent gesture in the recent buffer
-                # Prefer the most common (e.g., if buffer contains paper/rock, choose the one with higher count)
-                try:
-                    counts_start = {}
-                    for g in start_buffer:
-                        if g:
-                            counts_start[g] = counts_start.get(g, 0) + 1
-                    if counts_start:
-                        player_gesture = max(counts_start.items(), key=lambda x: x[1])[0]
-                    else:
-                        player_gesture = "paper"
-                except Exception:
-                    player_gesture = "paper"
-                start_triggered = True
-                counting_down = True
-                countdown_start = pygame.time.get_ticks()
-                start_buffer.clear()
-                # Clear final gesture buffer to prepare for next collection
-                final_gesture_buffer.clear()
-                break
-
+    if latest is None:
+        # Nothing captured yet; keep the window responsive
+        clock.tick(RENDER_FPS)
+        continue
+
+    timer.start("classify")
+    # Every inference since the last frame is used (not just the newest), so the number of vote samples
+    # doesn't depend on the render rate. Frames the scheduler skipped still arrive but carry no landmarks.
+    for inference in new_results:
+        if inference.results is None:
+            continue
+        profile_meter.inference(inference.inference_ms)
+        # Turn every detected hand into a 21x3 array once and classify them all in one batched call
+        hand_arrays, hand_codes = results_to_arrays(inference.results)
+        overlay_hands = (hand_arrays, hand_codes, inference.frame.timestamp)
+        hand_gestures = []
+        hand_confidences = None  # rule-based decisions count fully
+        if len(hand_arrays):
+            hand_gesture_codes = classify_batch(hand_arrays, hand_codes, config["classifier"]["thresh_y"],
+                                                config["classifier"]["thresh_thumb_x"])
+            if gesture_model is not None:
+                hand_gesture_codes, hand_confidences = gesture_model.fill_uncertain(
+                    hand_arrays, hand_codes, hand_gesture_codes, args.model_confidence)
+            hand_gestures = [gesture_name(c) for c in hand_gesture_codes]
+        if args.dump_landmarks and len(hand_arrays):
+            dumped_landmarks.append(hand_arrays)
+            dumped_handedness.append(hand_codes)
+
+        # =======================
+        # Player gesture recognition: start trigger and reveal vote
+        # Only fresh results are fed to the session so one inference is never counted twice
+        # =======================
+        inference_phase = session.phase
+        # Landmarks keep each hand on its own track (box overlap + centroid), whatever order MediaPipe lists them in
+        session.on_inference(hand_gestures, pygame.time.get_ticks(), hand_confidences, landmarks=hand_arrays)
+        scheduler.set_focus(session.focus_position())
+        if trace_writer:
+            trace_writer.write(inference.frame.index, inference_phase, hand_arrays, hand_codes, hand_gestures,
+                               session.start_buffer, session.final_gesture_buffer)
+    timer.stop("classify")
+
+    timer.start("render")
+    text_cache.begin_frame()
     # =======================
     # Draw scrolling background (wraps toward bottom-right)
-    # Use offsets and wrap at tile boundaries to avoid heavy allocations
+    # One blit of the pre-composited background; a full display update is only needed when it moved
     # =======================
-    tile_w = background_image.get_width()
-    tile_h = background_image.get_height()
-    # Update offsets (keep within [0, tile_w) / [0, tile_h) range)
-    bg_offset_x = (bg_offset_x + bg_speed_x) % tile_w
-    bg_offset_y = (bg_offset_y + bg_speed_y) % tile_h
-
-    # Compute starting draw point (start from negative offset to cover the whole window)
-    start_x = -int(bg_offset_x)
-    while start_x < WINDOW_WIDTH:
-        start_y = -int(bg_offset_y)
-        while start_y < WINDOW_HEIGHT:
-            screen.blit(background_image, (start_x, start_y))
-            start_y += tile_h
-        start_x += tile_w
+    timer.start("background")
+    background_moved = background.update(background_clock.advance(pygame.time.get_ticks()))
+    background.draw(screen)
+    timer.stop("background")
 
     # If counting down: show only the countdown
-    if counting_down:
-        font_count = pygame.font.Font(None, 160)
-        elapsed = (pygame.time.get_ticks() - countdown_start) // 1000
-        remaining = max(0, countdown - elapsed)
-        text_str = str(remaining)
+    if session.counting_down:
+        text_str = str(session.countdown_remaining(pygame.time.get_ticks()))
     # Pink theme: foreground is lightpink, outline is darker pink
         fg = (255, 182, 193)  # lightpink
         outline = (219, 112, 147)  # palevioletred
-        text_surf = font_count.render(text_str, True, fg)
-        pos = (WINDOW_WIDTH // 2 - text_surf.get_width() // 2,
-               WINDOW_HEIGHT // 2 - text_surf.get_height() // 2)
-        draw_text_with_outline(screen, text_str, font_count, pos, fg, outline, outline_width=3)
+        timer.start("text")
+        dirty.add(text_cache.draw_centered(screen, text_str, layout.font(160), layout.center, fg, outline, width=3))
+        timer.pause("text")
     # Skip to screen refresh
     else:
     # =======================
     # Draw camera preview (with landmarks)
     # Camera preview is hidden during countdown (controlled by counting_down)
     # =======================
-        if not counting_down:
-            if SHOW_LANDMARKS and 'results' in locals() and results and results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    try:
-                        mp_drawing.draw_landmarks(frame,
-                                                  hand_landmarks,
-                                                  mp_hands.HAND_CONNECTIONS,
-                                                  mp_styles.get_default_hand_landmarks_style(),
-                                                  mp_styles.get_default_hand_connections_style())
-                    except Exception:
-                        mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-
-            # Convert the BGR frame (with drawings) to RGB for pygame display
-            display_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_surface = pygame.surfarray.make_surface(display_rgb.swapaxes(0,1))
-            cam_aspect = frame.shape[1] / frame.shape[0]
-            if cam_width / cam_height > cam_aspect:
-                new_height = cam_height
-                new_width = int(cam_height * cam_aspect)
-            else:
-                new_width = cam_width
-                new_height = int(cam_width / cam_aspect)
-            frame_surface = pygame.transform.scale(frame_surface, (new_width, new_height))
+        if not session.counting_down:
+            timer.start("preview")
+            # Downscale the RGB frame MediaPipe already used into the preallocated preview buffer
+            # (only when a new frame arrived); the preview surface shares that buffer's memory
+            if camera_preview.update(latest.frame.rgb, latest.frame.index):
+                if SHOW_LANDMARKS:
+                    # Vector overlay at preview resolution, drawn once per new frame; the inference frame stays untouched
+                    hands = overlay_hands
+                    if hands is None or latest.frame.timestamp - hands[2] > OVERLAY_MAX_AGE_S:
+                        hands = (np.zeros((0, 21, 3), dtype=np.float32), np.zeros(0, dtype=np.int8), None)
+                    hand_overlay.draw(camera_preview.surface, hands[0], hands[1], session.start_buffer,
+                                      config["classifier"]["thresh_y"], config["classifier"]["thresh_thumb_x"])
+            frame_surface = camera_preview.surface
+            new_width, new_height = camera_preview.get_size()
             # Compute camera display position and draw a white border around it
-            cam_x = WINDOW_WIDTH - new_width - 10
-            cam_y = WINDOW_HEIGHT - new_height - 10
-            border_thickness = 4  # white border thickness (pixels)
+            cam_x = WINDOW_WIDTH - new_width - layout.px(10)
+            cam_y = WINDOW_HEIGHT - new_height - layout.px(10)
+            border_thickness = max(1, layout.px(4))  # white border thickness (pixels)
             # Draw border (outline only, not filled)
-            pygame.draw.rect(screen, (255, 255, 255), (cam_x - border_thickness, cam_y - border_thickness,
+            dirty.add(pygame.draw.rect(screen, (255, 255, 255), (cam_x - border_thickness, cam_y - border_thickness,
                                new_width + border_thickness * 2, new_height + border_thickness * 2),
-                     border_thickness)
+                     border_thickness))
             screen.blit(frame_surface, (cam_x, cam_y))
+            timer.stop("preview")
 
     # If the round hasn't been triggered yet, show a hint on how to start
-    if not start_triggered and not counting_down and not show_result:
-        hint_font = pygame.font.Font(None, 36)
+    timer.start("text")
+    if not session.start_triggered and not session.counting_down and not session.show_result:
         hint_text = "Show hand to start"
-        draw_text_with_outline(screen, hint_text, hint_font, (10, 10), (255, 182, 193), (219, 112, 147), outline_width=2)
-
-    # During revealing, collect several frames into final_gesture_buffer for a majority-vote decision
-    if revealing and results and results.multi_hand_landmarks:
-        try:
-            handedness_list_collect = results.multi_handedness if results.multi_handedness else [None] * len(results.multi_hand_landmarks)
-            # Only take the first detected hand as the player's gesture sample
-            hand_landmarks_c = results.multi_hand_landmarks[0]
-            hand_handedness_c = handedness_list_collect[0] if handedness_list_collect else None
-            hand_label_c = None
-            try:
-                hand_label_c = hand_handedness_c.classification[0].label
-            except Exception:
-                hand_label_c = None
-            detected_c = recognize_hand_gesture(hand_landmarks_c, hand_label_c)
-            final_gesture_buffer.append(detected_c)
-        except Exception:
-            # Ignore any errors that may occur during collection
-            pass
+        dirty.add(text_cache.draw(screen, hint_text, layout.font(36), (layout.px(10), layout.px(10)), (255, 182, 193), (219, 112, 147), width=2))
 
     # Display the currently detected player gesture (for debugging/feedback)
-    if player_gesture and not counting_down and not show_result:
-        dbg_font = pygame.font.Font(None, 36)
-        dbg_text = f"Detected: {player_gesture}"
+    if session.player_gesture and not session.counting_down and not session.show_result:
+        dbg_text = f"Detected: {session.player_gesture}"
         # Show debug text with pink outline
-        draw_text_with_outline(screen, dbg_text, dbg_font, (10, WINDOW_HEIGHT - 48), (255, 182, 193), (219, 112, 147), outline_width=2)
+        dirty.add(text_cache.draw(screen, dbg_text, layout.font(36), (layout.px(10), WINDOW_HEIGHT - layout.px(48)), (255, 182, 193), (219, 112, 147), width=2))
+    timer.pause("text")
 
     # =======================
-    # Countdown handling (timing logic calculated before drawing)
+    # Countdown, cat paw reveal animation and result timing
     # =======================
-    if counting_down:
-        elapsed = (pygame.time.get_ticks() - countdown_start) // 1000
-        remaining = countdown - elapsed
-        if remaining <= 0:
-            # Countdown finished; start cat paw reveal animation
-            counting_down = False
-            cat_gesture = random.choice(["rock","paper","scissors"])
-            current_hand = cat_gesture
-            revealing = True
-            # (Removed) cat punch sound — now played once at startup
-
-    # =======================
-    # Cat paw reveal animation (runs while revealing)
-    # =======================
-    if revealing:
-        # Try to move toward target position (no-op if already there)
-        if cat_hand_y < cat_target_y:
-            cat_hand_y += cat_speed
-
-        # If reaches or passes target, finalize reveal and decide result
-        if cat_hand_y >= cat_target_y:
-            cat_hand_y = cat_target_y
-            revealing = False
-            # After reveal, determine player's final gesture (use final_gesture_buffer majority first, fall back to single-frame or triggered player_gesture)
-            final_player_gesture = player_gesture
-            # Choose the most frequent non-None value from buffer
-            try:
-                counts = {}
-                for g in final_gesture_buffer:
-                    if g:
-                        counts[g] = counts.get(g, 0) + 1
-                if counts:
-                    # Select the gesture with the highest count
-                    final_player_gesture = max(counts.items(), key=lambda x: x[1])[0]
-                else:
-                    # If buffer has no valid detections, attempt a quick detection on current frame as fallback
-                    try:
-                        final_results = hands.process(frame_rgb)
-                        if final_results and final_results.multi_hand_landmarks:
-                            handedness_list_final = final_results.multi_handedness if final_results.multi_handedness else [None] * len(final_results.multi_hand_landmarks)
-                            hand_landmarks_f = final_results.multi_hand_landmarks[0]
-                            hand_handedness_f = handedness_list_final[0] if handedness_list_final else None
-                            hand_label_f = None
-                            try:
-                                hand_label_f = hand_handedness_f.classification[0].label
-                            except Exception:
-                                hand_label_f = None
-                            detected = recognize_hand_gesture(hand_landmarks_f, hand_label_f)
-                            if detected:
-                                final_player_gesture = detected
-                    except Exception:
-                        pass
-            except Exception:
-                # On extreme error, fall back to known player_gesture
-                final_player_gesture = player_gesture
-            # Clear buffer for next round
-            final_gesture_buffer.clear()
-            player_gesture = final_player_gesture
-            # Show result after reveal
-            show_result = True
-            result_text = determine_result(final_player_gesture, cat_gesture)
-            result_timer = pygame.time.get_ticks()
-            # Play win/lose/draw sounds if loaded
-            try:
-                if result_text == "You Win!" and win_sound:
-                    win_sound.play()
-                elif result_text == "You Lose!" and lose_sound:
-                    lose_sound.play()
-                elif result_text == "Draw" and draw_sound:
-                    draw_sound.play()
-            except Exception:
-                # Ignore playback errors to ensure the game continues
-                pass
-            # Next round requires retriggering
-            start_triggered = False
+    timer.start("update")
+    finished_result = session.update(pygame.time.get_ticks())
+    timer.stop("update")
+    if finished_result:
+        # Play win/lose/draw sounds if loaded (playback errors are ignored so the game continues)
+        result_sound = {"You Win!": "win", "You Lose!": "lose", "Draw": "draw"}.get(finished_result)
+        if result_sound:
+            sounds.play(result_sound)
+        clip_tag = result_sound or "no-move"
+        if stats_recorder:
+            stats_recorder.record(args.station, session.engine.player_gesture, session.cat_gesture,
+                                  finished_result, session.engine.reveal_ms)
 
     # =======================
     # Draw cat paw (not shown during countdown)
     # =======================
-    if not counting_down:
-        screen.blit(cat_hands[current_hand], (cat_hand_x, cat_hand_y))
+    if not session.counting_down:
+        dirty.add(screen.blit(cat_hands[session.current_hand], (cat_hand_x, session.cat_hand_y)))
 
     # =======================
     # Display result
     # =======================
-    if show_result:
+    if session.show_result:
+        result_text = session.result_text
     # Pink theme: main color and outline use different shades to stand out
         if result_text == "You Win!":
             fg = (255, 105, 180)  # hotpink
             outline_col = (199, 21, 133)  # medium violet red
-            size = 160
+            size = layout.font(160)
         elif result_text == "You Lose!":
             fg = (255, 140, 171)  # lighter pink
             outline_col = (219, 112, 147)
-            size = 130
+            size = layout.font(130)
         else:
             fg = (255, 182, 193)  # lightpink
             outline_col = (219, 112, 147)
-            size = 110
-        font_res = pygame.font.Font(None, size)
+            size = layout.font(110)
         # Center position
-        tmp = font_res.render(result_text, True, fg)
-        pos = (WINDOW_WIDTH//2 - tmp.get_width()//2, WINDOW_HEIGHT//2 - tmp.get_height()//2)
-        draw_text_with_outline(screen, result_text, font_res, pos, fg, outline_col, outline_width=4)
-        if pygame.time.get_ticks() - result_timer > 5000:  # show for 5 seconds
-            show_result = False
-            reset_round()
-
-    # Refresh screen
-    pygame.display.flip()
-    clock.tick(30)
+        timer.start("text")
+        dirty.add(text_cache.draw_centered(screen, result_text, size, layout.center, fg, outline_col, width=4))
+        timer.pause("text")
+    # The text sections above add up to one "text" sample per frame
+    timer.flush("text")
+
+    # Profiling overlay (F3)
+    if profile_overlay.visible:
+        dirty.add(profile_overlay.draw(screen, (layout.px(10), layout.px(50)), clock.get_fps(), (
+            "inference cpu %.0f%%  dropped %d" % (scheduler.cpu_percent(), pipeline.stats()["frames_dropped"]),
+            "text cache hits/frame %d (saved %.2f ms)" % (text_cache.frame_hits, text_cache.frame_saved_ms),
+            profile_meter.line())))
+
+    # Refresh screen: everything if the background scrolled (or on the first frame), otherwise just the dirty rects
+    timer.start("present")
+    dirty.present(full=background_moved or frames_rendered == 0)
+    timer.stop("present")
+    if round_recorder:
+        # One clip per round: from the first countdown frame until the result screen is gone
+        now = pygame.time.get_ticks()
+        if session.counting_down and not round_recorder.recording:
+            round_recorder.start_clip(now)
+            clip_tag = None
+        elif session.phase == "idle" and round_recorder.recording:
+            round_recorder.end_clip(clip_tag)
+        round_recorder.capture(screen, now, latest.frame.rgb if args.record_camera else None)
+    if frames_rendered == 0:
+        startup.mark("first_frame")
+    timer.stop("render")
+    timer.stop("frame")
+    frames_rendered += 1
+    profile_meter.frame()
+    if metrics_exporter:
+        metrics_exporter.maybe_export(timer, frames_rendered, metrics_extra())
+    if args.max_frames and frames_rendered >= args.max_frames:
+        running = False
+    # Headless benchmark runs uncapped
+    if not args.headless:
+        clock.tick(RENDER_FPS)
 
 # Release resources
+pipeline.stop()
+scheduler.close()
+if trace_writer:
+    trace_writer.close()
+    print(f"Recorded {trace_writer.records_written} inferences to {args.record_trace}")
+if stats_recorder:
+    stats_recorder.close()
+    print("Round stats:", stats_recorder.stats())
+if round_recorder:
+    round_recorder.close()
+    print(f"Round clips in {args.record_rounds}:", round_recorder.stats())
+print("Pipeline stats:", pipeline.stats())
+if hasattr(cap, "stats"):
+    print("Camera:", cap.stats())
+print("Inference scheduler stats:", scheduler.stats())
+print("Text cache stats:", text_cache.stats())
+if hand_overlay.frames:
+    print("Debug overlay stats:", hand_overlay.stats())
+print("Profile:", profile_meter.summary())
+print("Display update stats:", dirty.stats())
+print(startup.format_report())
+print("Asset load:", assets.timings)
+if args.dump_landmarks and dumped_landmarks:
+    save_corpus(args.dump_landmarks, np.concatenate(dumped_landmarks), np.concatenate(dumped_handedness))
+    print(f"Saved {sum(len(a) for a in dumped_landmarks)} hands to {args.dump_landmarks}")
+if args.headless:
+    print(timer.format_report(frames_rendered, time.perf_counter() - bench_start, BENCH_STAGES))
 cap.release()
 pygame.quit()
 sys.exit()
\ No newline at end of file
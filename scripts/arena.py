@@ -0,0 +1,310 @@
+"""Run several Paw-Punch stations from one machine with a shared pool of MediaPipe workers.
+
+Each station has its own frame source (camera index, video file or frame
+directory), read and downscaled on the station's own capture thread, and its
+own GameSession. The main loop only dispatches: frames from all stations go to
+one ProcessPoolExecutor whose worker processes each own a single MediaPipe
+Hands graph. Because any worker may get any station's frame, the graphs run
+with static_image_mode=True (no cross-frame tracking). Every station has at
+most one frame in flight, which keeps its frames in order and means more
+stations than workers keeps every core busy. Cameras keep only their newest
+frame while one is in flight; file sources wait, so every frame is inferred.
+
+A worker that dies breaks the executor: the arena starts a new one (up to
+max_restarts times) and resubmits the frames that were in flight. A frame whose
+result doesn't come back within task_timeout (a hung worker) takes its station
+out of the run with an error instead of hanging the arena.
+
+Usage:
+    python scripts/arena.py --sources a.mp4 b.mp4 frames_dir/ --workers 4
+"""
+import argparse
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import cv2
+
+from capture_pipeline import LatestQueue
+from frame_sources import CameraSource, open_source
+from game_session import GameSession
+from gesture_classifier import classify_batch, gesture_name, results_to_arrays
+from stats_store import StatsRecorder
+
+# Paw animation for headless stations: 150 px at 5 px per fixed 60 Hz step (frame_clock.py), so the paw
+# reaches its target in 30 steps (0.5 s) however often the station gets an inference
+ARENA_PAW = {"cat_start_y": -50, "cat_target_y": 100, "cat_speed": 5}
+
+_worker_hands = None
+
+
+def _init_worker(max_num_hands, min_detection_confidence):
+    global _worker_hands
+    import mediapipe as mp
+    _worker_hands = mp.solutions.hands.Hands(static_image_mode=True,
+                                             max_num_hands=max_num_hands,
+                                             min_detection_confidence=min_detection_confidence)
+
+
+def _infer(frame_rgb):
+    """Worker side: landmarks (N, 21, 3), handedness (N,) and inference time for one frame."""
+    t0 = time.perf_counter()
+    results = _worker_hands.process(frame_rgb)
+    landmarks, handedness = results_to_arrays(results)
+    return landmarks, handedness, (time.perf_counter() - t0) * 1000.0
+
+
+class StationCapture(threading.Thread):
+    """Reads one station's source into a latest-wins queue and tells the arena when a frame is ready.
+
+    Live cameras are read as fast as they deliver (frames the arena had no time for are dropped);
+    other sources read their next frame only once the previous one was taken.
+    """
+
+    def __init__(self, station, events):
+        super().__init__(name="arena-capture-%d" % station.station_id, daemon=True)
+        self.station = station
+        self.events = events
+        self.frames = LatestQueue(maxsize=1)
+        self.live = isinstance(station.cap, CameraSource)
+        self._taken = threading.Semaphore(1)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                if not self.live and not self._taken.acquire(timeout=0.1):
+                    continue
+                frame = self.station.next_frame()
+                if frame is None:
+                    break
+                self.frames.put(frame)
+                self.events.put(("frame", self.station, None))
+        finally:
+            self.frames.close()
+            self.events.put(("frame", self.station, None))
+
+    def take(self):
+        """The newest frame not yet taken, or None."""
+        frame = self.frames.get_nowait()
+        if frame is not None and not self.live:
+            self._taken.release()
+        return frame
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class Station:
+    """One arena station: a frame source plus its GameSession."""
+
+    def __init__(self, station_id, source, search_width=320, loop=False, seed=None):
+        self.station_id = station_id
+        self.source = source
+        self.search_width = search_width
+        self.loop = loop
+        self.cap = open_source(source)
+        self.session = GameSession(station_id=station_id, rng=random.Random(seed), **ARENA_PAW)
+        self.capture = None
+        self.frames = 0
+        self.inference_ms = 0.0
+        self.results = []
+        self.done = not self.cap.isOpened()
+
+    def next_frame(self):
+        """Mirrored, downscaled RGB frame ready for a worker, or None when the source has ended."""
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.release()
+            self.cap = open_source(self.source)
+            ret, frame = self.cap.read()
+        if not ret:
+            return None
+        frame = cv2.flip(frame, 1)
+        h, w = frame.shape[:2]
+        if self.search_width and w > self.search_width:
+            frame = cv2.resize(frame, (self.search_width, int(round(h * self.search_width / w))),
+                               interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def start_capture(self, events):
+        self.capture = StationCapture(self, events)
+        self.capture.start()
+
+    def close(self):
+        if self.capture is not None:
+            self.capture.stop()
+            self.capture.join(timeout=1.0)
+        self.cap.release()
+
+
+class Arena:
+    """N stations sharing a process pool of MediaPipe workers."""
+
+    def __init__(self, sources, workers=None, search_width=320, loop=False, max_num_hands=2,
+                 min_detection_confidence=0.5, stats=None, task_timeout=10.0, max_restarts=3):
+        self.workers = workers or os.cpu_count() or 1
+        self.stations = [Station(i, src, search_width, loop, seed=i) for i, src in enumerate(sources)]
+        self.max_num_hands = max_num_hands
+        self.min_detection_confidence = min_detection_confidence
+        # Optional stats_store.StatsRecorder; every finished round is recorded with its station id
+        self.stats = stats
+        # Seconds a frame may be in flight before its station is given up on
+        self.task_timeout = task_timeout
+        # How often the worker pool is replaced after a worker died before the run is given up
+        self.max_restarts = max_restarts
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                   initargs=(self.max_num_hands, self.min_detection_confidence))
+
+    def run(self, max_frames=0, duration=0.0):
+        """Play until every source ends (or max_frames per station / duration seconds). Returns a report dict."""
+        events = queue.Queue()  # ("frame", station, None) from capture threads, ("result", station, future)
+        errors = []
+        restarts = 0
+        sent = {}  # station -> (time its frame in flight was submitted, the frame, the executor running it)
+        executor = self._new_executor()
+        t0 = time.perf_counter()
+
+        def submit(station, frame):
+            try:
+                future = executor.submit(_infer, frame)
+            except BrokenProcessPool as e:
+                # The pool broke before its failed results came in: handled with them below
+                future = Future()
+                future.set_exception(e)
+            sent[station] = (time.perf_counter(), frame, executor)
+            future.add_done_callback(lambda f, st=station: events.put(("result", st, f)))
+
+        def finish(station):
+            station.done = True
+            if station.capture is not None:
+                station.capture.stop()
+
+        def dispatch(station):
+            """Send the station's newest frame to a worker if it has none in flight."""
+            if station.done or station in sent:
+                return
+            if (max_frames and station.frames >= max_frames) or (duration and time.perf_counter() - t0 >= duration):
+                finish(station)
+                return
+            frame = station.capture.take()
+            if frame is not None:
+                submit(station, frame)
+            elif station.capture.frames.closed:
+                station.done = True  # source ended
+
+        for station in self.stations:
+            if not station.done:
+                station.start_capture(events)
+        try:
+            while any(not st.done for st in self.stations):
+                try:
+                    kind, station, future = events.get(timeout=min(1.0, self.task_timeout))
+                except queue.Empty:
+                    now = time.perf_counter()
+                    for st, (since, _, _) in list(sent.items()):
+                        if now - since > self.task_timeout:
+                            errors.append("station %d: no inference result for %.0f s (worker hung?)" % (
+                                st.station_id, now - since))
+                            finish(st)
+                            del sent[st]
+                    for st in self.stations:
+                        dispatch(st)  # e.g. --duration ran out while nothing arrived
+                    continue
+                if kind == "frame":
+                    dispatch(station)
+                    continue
+                if station not in sent:
+                    continue  # result of a frame the station was already given up on
+                _, frame, pool = sent.pop(station)
+                try:
+                    landmarks, handedness, inference_ms = future.result()
+                except BrokenProcessPool as e:
+                    # A worker died: every frame in flight in that pool fails, the first one replaces the pool
+                    if pool is executor:
+                        if restarts >= self.max_restarts:
+                            errors.append("worker pool broken (%s), giving up after %d restarts" % (e, restarts))
+                            sent.clear()
+                            for st in self.stations:
+                                finish(st)
+                            continue
+                        errors.append("worker pool broken (%s), restarting it" % e)
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        executor = self._new_executor()
+                        restarts += 1
+                    submit(station, frame)
+                    continue
+                except Exception as e:  # an exception raised by MediaPipe inside the worker
+                    errors.append("station %d: %r" % (station.station_id, e))
+                    finish(station)
+                    continue
+                now_ms = int((time.perf_counter() - t0) * 1000)
+                gestures = [gesture_name(c) for c in classify_batch(landmarks, handedness)] if len(landmarks) else []
+                station.session.on_inference(gestures, now_ms, landmarks=landmarks)
+                finished = station.session.update(now_ms)
+                if finished:
+                    station.results.append(finished)
+                    if self.stats:
+                        session = station.session
+                        self.stats.record(station.station_id, session.engine.player_gesture, session.cat_gesture,
+                                          finished, session.engine.reveal_ms)
+                station.frames += 1
+                station.inference_ms += inference_ms
+                dispatch(station)
+            wall = time.perf_counter() - t0
+        finally:
+            # A hung worker is not waited for (the executor can't terminate it)
+            executor.shutdown(wait=not sent, cancel_futures=True)
+            for station in self.stations:
+                station.close()
+
+        total_frames = sum(st.frames for st in self.stations)
+        return {
+            "stations": len(self.stations),
+            "workers": self.workers,
+            "frames": total_frames,
+            "seconds": wall,
+            "fps": total_frames / wall if wall > 0 else 0.0,
+            "mean_inference_ms": sum(st.inference_ms for st in self.stations) / total_frames if total_frames else 0.0,
+            "restarts": restarts,
+            "per_station": [{"station": st.station_id, "source": st.source, "frames": st.frames,
+                             "dropped": st.capture.frames.dropped if st.capture else 0,
+                             "rounds": len(st.results), "results": st.results} for st in self.stations],
+            "errors": errors,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several headless Paw-Punch stations with shared MediaPipe workers")
+    parser.add_argument("--sources", nargs="+", required=True,
+                        help="one frame source per station: camera index, video file or frame directory")
+    parser.add_argument("--workers", type=int, default=0, help="MediaPipe worker processes (default: CPU count)")
+    parser.add_argument("--max-frames", type=int, default=0, help="frames per station (0 = until the source ends)")
+    parser.add_argument("--duration", type=float, default=0.0, help="stop after this many seconds (0 = no limit)")
+    parser.add_argument("--loop", action="store_true", help="restart file sources when they end")
+    parser.add_argument("--stats-db", metavar="PATH", help="record every finished round in this stats database")
+    args = parser.parse_args()
+
+    stats = StatsRecorder(args.stats_db) if args.stats_db else None
+    report = Arena(args.sources, workers=args.workers or None, loop=args.loop, stats=stats).run(
+        args.max_frames, args.duration)
+    if stats:
+        stats.close()
+    print("%d stations, %d workers: %d frames in %.2fs (%.1f frames/sec, %.2f ms/inference, %d restarts)" % (
+        report["stations"], report["workers"], report["frames"], report["seconds"], report["fps"],
+        report["mean_inference_ms"], report["restarts"]))
+    for st in report["per_station"]:
+        print("  station %d (%s): %d frames (%d dropped), %d rounds %s" % (
+            st["station"], st["source"], st["frames"], st["dropped"], st["rounds"], st["results"]))
+    for err in report["errors"]:
+        print("  error:", err)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Asset loading for Paw-Punch: paw atlas with an on-disk cache, background tile, sounds.
+
+The three cat paws are cut from "Cat Hands.png", flipped and resampled once,
+straight to their final size for the window (instead of three lossy rescales
+in a row), and packed side by side into one atlas surface; the paws handed to
+the game are subsurfaces of it. The atlas is saved under the cache directory,
+keyed by the SHA-1 of the source image, the window size and CACHE_VERSION, so
+later starts load one small PNG and convert it.
+
+SoundBank loads sound effects on a background thread (or lazily on first
+play) so the window can open before the audio files are decoded.
+"""
+import hashlib
+import os
+import threading
+import time
+
+import pygame
+
+CACHE_VERSION = 1
+PAW_ORDER = ("paper", "rock", "scissors")  # left to right in Cat Hands.png
+BASE_WINDOW_HEIGHT = 480  # paw sizes were tuned for the 800x480 window
+BACKGROUND_TILE = (100, 100)
+
+
+def file_digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def paw_size(sheet_size, window_size):
+    """Final paw size: the old ÷2, ×2, ×1.5 sequence (integer steps included), scaled with the window height."""
+    single_w, h = sheet_size[0] // 3, sheet_size[1]
+    w, h = (single_w // 2) * 2, (h // 2) * 2
+    w, h = int(w * 1.5), int(h * 1.5)
+    f = window_size[1] / float(BASE_WINDOW_HEIGHT)
+    return max(1, int(w * f)), max(1, int(h * f))
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "paw-punch")
+
+
+class AssetManager:
+    """Loads display-format surfaces; call after pygame.display.set_mode()."""
+
+    def __init__(self, assets_dir, cache_dir=None):
+        self.assets_dir = assets_dir
+        self.cache_dir = cache_dir if cache_dir is not None else default_cache_dir()
+        self.atlas = None
+        self.timings = {"atlas_cache_hit": False, "atlas_ms": 0.0, "background_ms": 0.0}
+
+    def _path(self, name):
+        path = os.path.join(self.assets_dir, name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        return path
+
+    def load_paws(self, window_size):
+        """{"paper"|"rock"|"scissors": surface} at the final size for window_size, flipped to point down."""
+        t0 = time.perf_counter()
+        source = self._path("Cat Hands.png")
+        key = "paws-%s-%dx%d-v%d.png" % (file_digest(source)[:16], window_size[0], window_size[1], CACHE_VERSION)
+        cached = os.path.join(self.cache_dir, key) if self.cache_dir else None
+        atlas = None
+        if cached and os.path.exists(cached):
+            try:
+                atlas = pygame.image.load(cached)
+                self.timings["atlas_cache_hit"] = True
+            except pygame.error:
+                atlas = None
+        if atlas is None:
+            atlas = self._build_atlas(pygame.image.load(source), window_size)
+            if cached:
+                try:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    tmp = cached + ".tmp.png"
+                    pygame.image.save(atlas, tmp)
+                    os.replace(tmp, cached)
+                except (OSError, pygame.error):
+                    pass  # read-only home etc.: just rebuild next time
+        self.atlas = atlas.convert_alpha()
+        w = self.atlas.get_width() // len(PAW_ORDER)
+        h = self.atlas.get_height()
+        self.timings["atlas_ms"] = (time.perf_counter() - t0) * 1000.0
+        return {name: self.atlas.subsurface((i * w, 0, w, h)) for i, name in enumerate(PAW_ORDER)}
+
+    @staticmethod
+    def _build_atlas(sheet, window_size):
+        sheet = sheet.convert_alpha() if pygame.display.get_surface() else sheet
+        single_w, sheet_h = sheet.get_width() // 3, sheet.get_height()
+        w, h = paw_size(sheet.get_size(), window_size)
+        atlas = pygame.Surface((w * len(PAW_ORDER), h), pygame.SRCALPHA)
+        for i in range(len(PAW_ORDER)):
+            paw = pygame.transform.flip(sheet.subsurface((i * single_w, 0, single_w, sheet_h)), False, True)
+            atlas.blit(pygame.transform.smoothscale(paw, (w, h)), (i * w, 0))
+        return atlas
+
+    def load_background_tile(self, size=BACKGROUND_TILE):
+        t0 = time.perf_counter()
+        tile = pygame.transform.scale(pygame.image.load(self._path("Background.png")), size).convert()
+        self.timings["background_ms"] = (time.perf_counter() - t0) * 1000.0
+        return tile
+
+
+class SoundBank:
+    """Named sound effects, decoded on a background thread or on first play; missing files stay silent."""
+
+    def __init__(self, sounds_dir, effects, music=None, music_volume=0.12):
+        self.sounds_dir = sounds_dir
+        self.effects = dict(effects)  # name -> (file name, volume)
+        self.music = music
+        self.music_volume = music_volume
+        self._sounds = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.music_playing = False
+        self.load_ms = 0.0
+
+    def _load(self, name):
+        with self._lock:
+            if name in self._sounds:
+                return self._sounds[name]
+            sound = None
+            filename, volume = self.effects[name]
+            path = os.path.join(self.sounds_dir, filename)
+            if pygame.mixer.get_init() and os.path.exists(path):
+                try:
+                    sound = pygame.mixer.Sound(path)
+                    sound.set_volume(volume)
+                except Exception:
+                    sound = None
+            self._sounds[name] = sound
+            return sound
+
+    def start(self, play_first=None):
+        """Decode every effect on a background thread, then play `play_first` and start the music."""
+        def load_all():
+            t0 = time.perf_counter()
+            for name in self.effects:
+                self._load(name)
+            self.load_ms = (time.perf_counter() - t0) * 1000.0
+            if play_first:
+                self.play(play_first)
+            self._start_music()
+
+        self._thread = threading.Thread(target=load_all, name="sound-loader", daemon=True)
+        self._thread.start()
+
+    def _start_music(self):
+        if not self.music or not pygame.mixer.get_init():
+            return
+        path = os.path.join(self.sounds_dir, self.music)
+        if not os.path.exists(path):
+            return
+        try:
+            # Use pygame's music module for streaming longer music files
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(self.music_volume)
+            pygame.mixer.music.play(-1)  # loop indefinitely
+            self.music_playing = True
+        except Exception:
+            self.music_playing = False
+
+    def play(self, name):
+        sound = self._sounds.get(name)
+        if name not in self._sounds:
+            if self._thread is not None and self._thread.is_alive():
+                return  # still decoding in the background; never block the render loop on it
+            sound = self._load(name)
+        if sound:
+            try:
+                sound.play()
+            except Exception:
+                pass
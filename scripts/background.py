@@ -0,0 +1,67 @@
+"""Scrolling background and dirty-rect screen updates for Paw-Punch.
+
+The background tile is composited once into a surface one tile larger than the
+window in each direction, so drawing the scrolled background is a single blit
+of a window-sized sub-rect instead of ~50 tile blits per frame.
+"""
+import pygame
+
+
+class ScrollingBackground:
+    """Tiled background that scrolls toward the bottom-right and wraps at tile boundaries."""
+
+    def __init__(self, tile, size, speed=(0.0, 0.0)):
+        self.tile_w, self.tile_h = tile.get_size()
+        self.width, self.height = size
+        self.speed_x, self.speed_y = speed
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.surface = pygame.Surface((self.width + self.tile_w, self.height + self.tile_h)).convert()
+        for x in range(0, self.surface.get_width(), self.tile_w):
+            for y in range(0, self.surface.get_height(), self.tile_h):
+                self.surface.blit(tile, (x, y))
+
+    def update(self, steps=1):
+        """Advance the scroll by `steps` fixed animation steps; returns True if the visible pixels moved."""
+        before = (int(self.offset_x), int(self.offset_y))
+        # Keep offsets within [0, tile_w) / [0, tile_h)
+        self.offset_x = (self.offset_x + self.speed_x * steps) % self.tile_w
+        self.offset_y = (self.offset_y + self.speed_y * steps) % self.tile_h
+        return (int(self.offset_x), int(self.offset_y)) != before
+
+    def draw(self, screen):
+        area = pygame.Rect(int(self.offset_x), int(self.offset_y), self.width, self.height)
+        return screen.blit(self.surface, (0, 0), area)
+
+
+class DirtyRegions:
+    """Collects the rects drawn this frame and pushes only those (plus last frame's) to the display.
+
+    Anything drawn last frame must be refreshed too, otherwise it would stay
+    visible after it disappears. Call present(full=True) when the whole screen
+    changed (e.g. the background scrolled) to fall back to pygame.display.flip().
+    """
+
+    def __init__(self):
+        self._current = []
+        self._previous = []
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def add(self, rect):
+        if rect:
+            self._current.append(pygame.Rect(rect))
+        return rect
+
+    def present(self, full=False):
+        if full:
+            pygame.display.flip()
+            self.full_updates += 1
+        else:
+            pygame.display.update(self._current + self._previous)
+            self.partial_updates += 1
+        self._previous = self._current
+        self._current = []
+
+    def stats(self):
+        return {"full_updates": self.full_updates, "partial_updates": self.partial_updates}
@@ -0,0 +1,33 @@
+"""Sweep the number of arena stations and report total throughput.
+
+Every station replays the same source; the worker pool size stays fixed so the
+sweep shows how throughput grows until all cores are busy.
+
+Usage:
+    python scripts/bench_arena.py --source recordings/session.mp4 --sessions 1,2,4,8 --frames 150
+"""
+import argparse
+import os
+
+from arena import Arena
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arena throughput vs. session count")
+    parser.add_argument("--source", required=True, help="video file or frame directory replayed by every station")
+    parser.add_argument("--sessions", default="1,2,4,8", help="comma-separated station counts to try")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--frames", type=int, default=150, help="frames per station")
+    args = parser.parse_args()
+
+    print("%8s %8s %8s %10s %12s %14s" % ("sessions", "workers", "frames", "seconds", "frames/sec", "per-session"))
+    for n in (int(v) for v in args.sessions.split(",")):
+        report = Arena([args.source] * n, workers=args.workers, loop=True).run(max_frames=args.frames)
+        print("%8d %8d %8d %10.2f %12.1f %14.1f" % (n, report["workers"], report["frames"], report["seconds"],
+                                                   report["fps"], report["fps"] / n))
+        for err in report["errors"]:
+            print("  error:", err)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Capture cost per configuration: decode, mirror + RGB convert and per-frame allocations.
+
+Usage:
+    python scripts/bench_capture.py [--sizes 640x480 1280x720 1920x1080] [--frames 300]
+    python scripts/bench_capture.py --camera 0 --formats MJPG YUYV --sizes 640x480 1280x720
+
+Without --camera every size is measured on two sources: synthetic frames (no
+decoding, like a raw YUYV stream) and an MJPEG file written from them first
+(the JPEG decode an MJPG camera costs). With --camera each size x format is
+requested from the device (the size and format it actually delivers are shown).
+
+Each configuration runs the old capture path (cap.read() + cv2.flip +
+cv2.cvtColor, three new arrays per frame) and the FrameRing path used by
+capture_pipeline (decode into a preallocated slot, mirror in place, convert
+into the slot's RGB buffer). "alloc KB/frame" is the most memory NumPy/OpenCV
+allocated during one frame (tracemalloc peak above the steady state).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+
+from capture_pipeline import FrameRing
+from frame_sources import CAMERA_FORMATS, CameraSource, SyntheticSource
+
+
+def measure(name, cap, frames, use_ring, warmup=10):
+    ring = FrameRing(slots=8)
+    read_s = convert_s = 0.0
+    peaks = []
+    tracemalloc.start()
+    for i in range(warmup + frames):
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        slot = ring.acquire()
+        ret, frame = cap.read(ring.read_buffer(slot)) if use_ring else cap.read()
+        t1 = time.perf_counter()
+        if not ret:
+            break
+        if use_ring:
+            ring.mirror_convert(frame, slot)
+        else:
+            # The old capture thread: a mirrored copy, then an RGB copy of it
+            frame = cv2.flip(frame, 1)
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        t2 = time.perf_counter()
+        if i >= warmup:
+            read_s += t1 - t0
+            convert_s += t2 - t1
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        ring.release(slot)
+        frame = rgb = None
+    tracemalloc.stop()
+    n = max(len(peaks), 1)
+    print("  %-18s read %7.3f ms  flip+rgb %6.3f ms  total %7.3f ms  alloc %8.1f KB/frame  buffers allocated %d" % (
+        name, read_s / n * 1000, convert_s / n * 1000, (read_s + convert_s) / n * 1000, sum(peaks) / n / 1024,
+        ring.allocations * 2 if use_ring else (warmup + len(peaks)) * 3))
+
+
+def write_mjpeg(path, width, height, frames):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (width, height))
+    if not writer.isOpened():
+        return False
+    source = SyntheticSource(width, height, frames=frames)
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        writer.write(frame)
+    writer.release()
+    return True
+
+
+def parse_size(text):
+    w, _, h = text.lower().partition("x")
+    return int(w), int(h)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=[(640, 480), (1280, 720), (1920, 1080)])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--camera", type=int, help="benchmark this camera index instead of synthetic / file sources")
+    parser.add_argument("--formats", nargs="+", default=list(CAMERA_FORMATS), choices=CAMERA_FORMATS)
+    parser.add_argument("--fps", type=float, help="frame rate to request from the camera")
+    parser.add_argument("--buffer-size", type=int, help="driver queue length to request from the camera")
+    args = parser.parse_args()
+
+    for width, height in args.sizes:
+        if args.camera is not None:
+            for fourcc in args.formats:
+                for use_ring in (False, True):
+                    cap = CameraSource(args.camera, width, height, args.fps, fourcc, args.buffer_size,
+                                       reconnect=False)
+                    if not cap.isOpened():
+                        print(f"camera {args.camera} could not be opened")
+                        return 1
+                    if not use_ring:
+                        actual = cap.stats()
+                        print("%dx%d %s -> camera delivers %dx%d %s @ %.0f fps (%s)" % (
+                            width, height, fourcc, actual["width"], actual["height"], actual["fourcc"],
+                            actual["fps"], actual["backend"]))
+                    measure("ring" if use_ring else "old", cap, args.frames, use_ring)
+                    cap.release()
+            continue
+
+        print("%dx%d" % (width, height))
+        for use_ring in (False, True):
+            measure("synthetic %s" % ("ring" if use_ring else "old"), SyntheticSource(width, height),
+                    args.frames, use_ring)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.avi")
+            if not write_mjpeg(path, width, height, args.frames + 10):
+                print("  (no MJPEG encoder available; skipping the decode measurement)")
+                continue
+            for use_ring in (False, True):
+                cap = cv2.VideoCapture(path)
+                measure("MJPEG file %s" % ("ring" if use_ring else "old"), cap, args.frames, use_ring)
+                cap.release()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
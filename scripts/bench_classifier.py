@@ -0,0 +1,110 @@
+"""Check and time the vectorized gesture classifier against the original rule function.
+
+Usage:
+    python scripts/bench_classifier.py                      # random corpus
+    python scripts/bench_classifier.py --corpus hands.npz   # corpus recorded with Paw-Punch.py --dump-landmarks
+
+Times the reference, what the game calls per inference (results_to_arrays +
+classify_batch on a frame's one or two hands, the plain-Python path) and the
+vectorized NumPy path on larger batches.
+Exits with status 1 if classify_batch disagrees with the reference on any hand.
+"""
+import argparse
+import gc
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from gesture_classifier import (FINGER_PIPS, FINGER_TIPS, THUMB_IP, THUMB_TIP, classify_batch, gesture_name,
+                                load_corpus, recognize_hand_gesture_reference, results_to_arrays)
+
+HAND_LABELS = {1: 'Right', -1: 'Left', 0: None}
+
+
+def random_corpus(n, seed=0):
+    """Random hands whose finger tip/PIP gaps straddle the thresholds so every rule branch is exercised."""
+    rng = np.random.default_rng(seed)
+    landmarks = rng.uniform(0.2, 0.8, size=(n, 21, 3)).astype(np.float32)
+    gaps = rng.choice([-0.08, -0.02, 0.03, 0.05, 0.1], size=(n, 4)) + rng.normal(0, 0.01, size=(n, 4))
+    landmarks[:, FINGER_TIPS, 1] = landmarks[:, FINGER_PIPS, 1] - gaps
+    landmarks[:, THUMB_TIP, 0] = landmarks[:, THUMB_IP, 0] + rng.normal(0, 0.05, size=n)
+    handedness = rng.choice([1, -1, 0], size=n).astype(np.int8)
+    return landmarks, handedness
+
+
+def as_landmark_lists(landmarks):
+    """Wrap arrays in objects shaped like MediaPipe's NormalizedLandmarkList (.landmark[i].x/.y/.z)."""
+    return [SimpleNamespace(landmark=[SimpleNamespace(x=float(p[0]), y=float(p[1]), z=float(p[2])) for p in hand])
+            for hand in landmarks]
+
+
+def frame_results(hands, labels):
+    """A hands.process()-shaped result holding the given hands."""
+    return SimpleNamespace(multi_hand_landmarks=hands, multi_handedness=[
+        SimpleNamespace(classification=[SimpleNamespace(label=label)]) if label else None for label in labels])
+
+
+def time_per_hand(fn, n, repeat):
+    best = float("inf")
+    # As timeit does: a collection in the middle of one path's loop would be charged to that path
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+    finally:
+        gc.enable()
+    return best / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help=".npz with landmarks (N,21,3) and handedness (N,)")
+    parser.add_argument("-n", type=int, default=20000, help="random corpus size when --corpus is not given")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.corpus:
+        landmarks, handedness = load_corpus(args.corpus)
+    else:
+        landmarks, handedness = random_corpus(args.n)
+    n = len(landmarks)
+    hands = as_landmark_lists(landmarks)
+    labels = [HAND_LABELS[int(h)] for h in handedness]
+
+    expected = [recognize_hand_gesture_reference(h, l) for h, l in zip(hands, labels)]
+    got = [gesture_name(c) for c in classify_batch(landmarks, handedness)]
+    mismatches = sum(1 for a, b in zip(expected, got) if a != b)
+    # What the game runs per inference: the frame's one or two hands -> results_to_arrays -> classify_batch
+    frames = {size: [frame_results(hands[i:i + size], labels[i:i + size]) for i in range(0, n - size + 1, size)]
+              for size in (1, 2)}
+    for size, results in frames.items():
+        live = [gesture_name(c) for r in results for c in classify_batch(*results_to_arrays(r))]
+        mismatches += sum(1 for a, b in zip(expected, live) if a != b)
+    counts = {g: expected.count(g) for g in ("rock", "paper", "scissors", None)}
+    print("Corpus: %d hands %s" % (n, counts))
+    print("Mismatches vs reference: %d" % mismatches)
+
+    t_ref = time_per_hand(lambda: [recognize_hand_gesture_reference(h, l) for h, l in zip(hands, labels)], n, args.repeat)
+    t_batch = time_per_hand(lambda: classify_batch(landmarks, handedness), n, args.repeat)
+    print("reference (per hand, attribute access): %8.3f us/hand" % t_ref)
+    for size, results in frames.items():
+        arrays = [results_to_arrays(r) for r in results]
+        t_classify = time_per_hand(lambda: [classify_batch(lm, hd) for lm, hd in arrays], len(arrays) * size,
+                                   args.repeat)
+        t_frame = time_per_hand(lambda: [classify_batch(*results_to_arrays(r)) for r in results],
+                                len(results) * size, args.repeat)
+        print("game, %d hand(s) per frame: classify_batch %8.3f us/hand  (%.1fx vs reference), "
+              "with results_to_arrays %8.3f us/hand" % (size, t_classify, t_ref / t_classify, t_frame))
+    groups = [(landmarks[i:i + 8], handedness[i:i + 8]) for i in range(0, n - 7, 8)]
+    t_8 = time_per_hand(lambda: [classify_batch(lm, hd) for lm, hd in groups], len(groups) * 8, args.repeat)
+    print("classify_batch, 8 hands per call:       %8.3f us/hand  (%.1fx vs reference)" % (t_8, t_ref / t_8))
+    print("vectorized batch (arrays):              %8.3f us/hand  (%.0fx vs reference)" % (t_batch, t_ref / t_batch))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
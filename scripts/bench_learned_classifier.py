@@ -0,0 +1,59 @@
+"""Compare the learned gesture classifier with the rule-based one: accuracy and us/hand.
+
+Usage:
+    python scripts/bench_learned_classifier.py --model gesture_model.npz rock=rock.npz paper=paper.npz ...
+    python scripts/bench_learned_classifier.py --model gesture_model.npz labelled.npz --min-confidence 0.8
+
+For each confidence threshold the learned model's coverage (share of hands it
+commits to) and accuracy on those hands are printed, plus the accuracy of
+"rules, with the model filling in where the rules return None" (the game's
+--model mode).
+"""
+import argparse
+import sys
+
+from bench_classifier import time_per_hand
+from gesture_classifier import NO_GESTURE, classify_batch
+from learned_classifier import GestureModel, load_labelled
+
+
+def report(name, codes, labels):
+    covered = codes != NO_GESTURE
+    acc = (codes[covered] == labels[covered]).mean() if covered.any() else 0.0
+    print("  %-34s coverage %5.1f%%  accuracy on covered %.3f  overall %.3f"
+          % (name, covered.mean() * 100.0, acc, (codes == labels).mean()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("data", nargs="+", help="LABEL=PATH or PATH (npz with labels)")
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--min-confidence", type=float, nargs="+", default=[0.0, 0.5, 0.7, 0.9])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    model = GestureModel.load(args.model)
+    landmarks, handedness, labels = load_labelled(args.data)
+    n = len(labels)
+    print("Corpus: %d labelled hands" % n)
+
+    rules = classify_batch(landmarks, handedness)
+    report("rule-based", rules, labels)
+    for threshold in args.min_confidence:
+        codes, _ = model.predict(landmarks, handedness, threshold)
+        report("learned, confidence >= %.2f" % threshold, codes, labels)
+        report("rules + learned >= %.2f" % threshold,
+               model.fill_uncertain(landmarks, handedness, rules, threshold)[0], labels)
+
+    t_rules = time_per_hand(lambda: classify_batch(landmarks, handedness), n, args.repeat)
+    t_model = time_per_hand(lambda: model.predict_proba(landmarks, handedness), n, args.repeat)
+    t_single = time_per_hand(lambda: [model.predict_proba(landmarks[i:i + 1], handedness[i:i + 1])
+                                      for i in range(min(n, 2000))], min(n, 2000), args.repeat)
+    print("rule-based batch:           %8.3f us/hand" % t_rules)
+    print("learned batch:              %8.3f us/hand" % t_model)
+    print("learned, one call per hand: %8.3f us/hand" % t_single)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""Load test for net_server.py: hundreds of simulated players on localhost.
+
+Usage:
+    python scripts/bench_net.py [--clients 200] [--procs 4] [--duration 20] [--sample-hz 15] [--jitter-ms 80]
+
+Starts a NetServer in its own process and `procs` client processes, each
+running clients/procs simulated players on one event loop. A simulated player
+behaves like check_timing.py's: holds up a rock to start a round, switches to a
+random gesture when (by its synced clock) the reveal begins, lowers the hand
+while the result is shown. Every sample is delayed by a random 0..jitter_ms
+before it is sent, so samples arrive late and out of order.
+
+Reports rounds/sec, the share of rounds where the server's verdict matches the
+gesture the player showed, late samples, PING round trips and how long after
+the server decided a round its RESULT reached the player (p50 / p99 / max).
+The default of 200 players is what one server process is sized for; raise
+--clients to find where it saturates (slow ticks and late samples go up,
+verdict accuracy goes down).
+"""
+import argparse
+import asyncio
+import multiprocessing
+import random
+import sys
+import time
+
+from net_client import NetClient
+from net_server import NetServer
+
+GESTURES = ("rock", "paper", "scissors")
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100.0 * len(values)))]
+
+
+async def simulated_player(host, port, duration, sample_hz, jitter_ms, seed, out):
+    rng = random.Random(seed)
+    client = NetClient()
+    await client.connect(host, port)
+    shown = {}  # round number -> gesture shown during its reveal
+    interval = 1.0 / sample_hz
+    end = time.perf_counter() + duration
+    next_sample = time.perf_counter() + rng.uniform(0, interval)  # spread clients over the sample period
+    last_ping = 0.0
+    loop = asyncio.get_running_loop()
+    positions = [(0.5, 0.5)]
+
+    while time.perf_counter() < end:
+        now = time.perf_counter()
+        rounds = len(client.results)
+        # The player goes by the countdown, not the PHASE packet, as run_camera_client's scheduler does
+        phase = client.current_phase(now)
+        if phase == "result":
+            gestures = []
+        elif phase == "reveal":
+            gestures = [shown.setdefault(rounds, rng.choice(GESTURES))]
+        else:
+            gestures = ["rock"]
+        # call_later rather than a task per sample keeps thousands of simulated players cheap
+        loop.call_later(rng.uniform(0.0, jitter_ms / 1000.0), client.send_sample, now, gestures, None, positions)
+        if now - last_ping > 0.5:
+            client.ping()
+            last_ping = now
+        next_sample += interval
+        await asyncio.sleep(max(0.0, next_sample - time.perf_counter()))
+    await asyncio.sleep(jitter_ms / 1000.0)
+    await client.close()
+    correct = sum(1 for i, r in enumerate(client.results) if r[0] is not None and r[0] == shown.get(i))
+    out["rounds"] += len(client.results)
+    out["correct"] += correct
+    out["rtts"].extend(client.rtts)
+    out["result_delay"].extend(r[5] - r[4] for r in client.results)
+
+
+def client_process(host, port, n, duration, sample_hz, jitter_ms, seed, queue):
+    async def run():
+        out = {"rounds": 0, "correct": 0, "rtts": [], "result_delay": []}
+        await asyncio.gather(*(simulated_player(host, port, duration, sample_hz, jitter_ms, seed + i, out)
+                               for i in range(n)))
+        return out
+    queue.put(asyncio.run(run()))
+
+
+def server_process(port, playout_ms, tick_hz, ready, stop, queue):
+    server = NetServer(playout_ms, tick_hz, result_ms=1000, seed=0)
+
+    async def run():
+        ready_event = asyncio.Event()
+        task = asyncio.create_task(server.serve("127.0.0.1", port, ready_event))
+        await ready_event.wait()
+        ready.set()
+        while not stop.is_set():
+            await asyncio.sleep(0.1)
+        task.cancel()
+    try:
+        asyncio.run(run())
+    except asyncio.CancelledError:
+        pass
+    queue.put(server.stats())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--procs", type=int, default=4, help="client processes")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds each client plays")
+    parser.add_argument("--sample-hz", type=float, default=15.0, help="samples per second per client")
+    parser.add_argument("--jitter-ms", type=float, default=80.0, help="random extra delay per sample")
+    parser.add_argument("--playout-ms", type=int, default=150, help="server playout delay")
+    parser.add_argument("--tick-hz", type=float, default=30.0)
+    parser.add_argument("--port", type=int, default=7797)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    ready, stop = ctx.Event(), ctx.Event()
+    server = ctx.Process(target=server_process,
+                         args=(args.port, args.playout_ms, args.tick_hz, ready, stop, results))
+    server.start()
+    if not ready.wait(30):
+        print("server did not start")
+        return 1
+    per_proc = [args.clients // args.procs + (i < args.clients % args.procs) for i in range(args.procs)]
+    t0 = time.perf_counter()
+    clients = [ctx.Process(target=client_process, args=("127.0.0.1", args.port, n, args.duration, args.sample_hz,
+                                                         args.jitter_ms, 100000 * i, results))
+               for i, n in enumerate(per_proc) if n]
+    for p in clients:
+        p.start()
+    outs = [results.get() for _ in clients]
+    wall = time.perf_counter() - t0
+    for p in clients:
+        p.join()
+    stop.set()
+    server_stats = results.get()
+    server.join()
+
+    rounds = sum(o["rounds"] for o in outs)
+    correct = sum(o["correct"] for o in outs)
+    rtts = [x for o in outs for x in o["rtts"]]
+    delays = [x for o in outs for x in o["result_delay"]]
+    print("%d clients x %.0fs, %.0f samples/s each, jitter 0-%.0f ms, playout %d ms" % (
+        args.clients, args.duration, args.sample_hz, args.jitter_ms, args.playout_ms))
+    print("rounds: %d (%.1f rounds/s), verdict matches shown gesture: %.1f%%" % (
+        rounds, rounds / wall, 100.0 * correct / max(rounds, 1)))
+    print("samples: %d, late (dropped): %d (%.2f%%)" % (
+        server_stats["samples"], server_stats["late_samples"],
+        100.0 * server_stats["late_samples"] / max(server_stats["samples"], 1)))
+    print("server tick: mean %.2f ms, max %.2f ms, over the %.1f ms period: %d of %d" % (
+        server_stats["mean_tick_ms"], server_stats["max_tick_ms"], 1000.0 / args.tick_hz, server_stats["slow_ticks"],
+        server_stats["ticks"]))
+    print("ping rtt ms:     p50 %7.2f  p99 %7.2f  max %7.2f" % (
+        percentile(rtts, 50), percentile(rtts, 99), max(rtts, default=0.0)))
+    print("result delay ms: p50 %7.2f  p99 %7.2f  max %7.2f  (includes the %d ms playout delay)" % (
+        percentile(delays, 50), percentile(delays, 99), max(delays, default=0.0), args.playout_ms))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
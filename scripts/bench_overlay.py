@@ -0,0 +1,104 @@
+"""Cost of the landmark debug overlay: full-frame OpenCV drawing vs the pygame overlay on the preview.
+
+Usage:
+    python scripts/bench_overlay.py [--frames 300] [--resolution 1280x720] [--preview 200x120] [--hands 2]
+
+"old path" is what SHOW_LANDMARKS used to cost: landmarks and connections drawn
+with OpenCV on the full-resolution frame (what mp_drawing.draw_landmarks does),
+then the full frame converted to RGB, turned into a surface and scaled down.
+"preview" is CameraPreview alone; "preview + overlay" adds HandOverlay drawing
+onto the preview surface, so their difference is the overlay's own cost.
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import cv2
+import numpy as np
+import pygame
+
+from debug_overlay import HAND_CHAINS, HandOverlay
+from gesture_classifier import HAND_LEFT, HAND_RIGHT
+from preview import CameraPreview, fit_size
+
+# An open hand (paper) in normalized image coordinates, wrist at the bottom
+PAPER = np.array([
+    (0.50, 0.80), (0.44, 0.75), (0.40, 0.69), (0.37, 0.64), (0.34, 0.60),
+    (0.45, 0.60), (0.44, 0.51), (0.44, 0.45), (0.44, 0.40),
+    (0.50, 0.59), (0.50, 0.49), (0.50, 0.42), (0.50, 0.37),
+    (0.55, 0.60), (0.56, 0.51), (0.56, 0.45), (0.56, 0.40),
+    (0.60, 0.63), (0.62, 0.56), (0.63, 0.51), (0.64, 0.47)], dtype=np.float32)
+
+
+def make_hands(n):
+    landmarks = np.zeros((n, 21, 3), dtype=np.float32)
+    for i in range(n):
+        landmarks[i, :, :2] = PAPER + ((i % 2) * 0.3 - 0.15, 0.0)
+    handedness = np.array([HAND_RIGHT if i % 2 else HAND_LEFT for i in range(n)], dtype=np.int8)
+    return landmarks, handedness
+
+
+def old_path(frame_bgr, landmarks, size):
+    frame = frame_bgr.copy()  # the old code drew on the inference frame itself; copy so every run starts clean
+    h, w = frame.shape[:2]
+    for hand in (landmarks[:, :, :2] * (w, h)).astype(np.int32).tolist():
+        for chain in HAND_CHAINS:
+            for a, b in zip(chain, chain[1:]):
+                cv2.line(frame, hand[a], hand[b], (224, 224, 224), 2)
+        for point in hand:
+            cv2.circle(frame, point, 4, (48, 48, 255), -1)
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return pygame.transform.scale(pygame.surfarray.make_surface(rgb.swapaxes(0, 1)), size)
+
+
+def measure(name, step, frames, warmup):
+    for i in range(warmup):
+        step(i)
+    t0 = time.perf_counter()
+    for i in range(warmup, warmup + frames):
+        step(i)
+    ms = (time.perf_counter() - t0) / frames * 1000.0
+    print("%-18s %8.3f ms/frame" % (name, ms))
+    return ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--resolution", default="1280x720")
+    parser.add_argument("--preview", default="200x120")
+    parser.add_argument("--hands", type=int, default=2)
+    args = parser.parse_args()
+
+    src_w, src_h = (int(v) for v in args.resolution.lower().split("x"))
+    max_w, max_h = (int(v) for v in args.preview.lower().split("x"))
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    rng = np.random.default_rng(0)
+    frames_bgr = [rng.integers(0, 256, (src_h, src_w, 3), dtype=np.uint8) for _ in range(4)]
+    frames_rgb = [cv2.cvtColor(f, cv2.COLOR_BGR2RGB) for f in frames_bgr]
+    landmarks, handedness = make_hands(args.hands)
+    start_buffer = ["rock", "rock", None]
+    size = fit_size(src_w, src_h, max_w, max_h)
+    print("Source %dx%d -> preview %dx%d, %d hands, %d frames" % (src_w, src_h, size[0], size[1], args.hands,
+                                                                  args.frames))
+
+    measure("old path", lambda i: old_path(frames_bgr[i % 4], landmarks, size), args.frames, args.warmup)
+    preview = CameraPreview((max_w, max_h))
+    base = measure("preview", lambda i: preview.update(frames_rgb[i % 4], i), args.frames, args.warmup)
+    overlay = HandOverlay()
+
+    def with_overlay(i):
+        preview.update(frames_rgb[i % 4], i)
+        overlay.draw(preview.surface, landmarks, handedness, start_buffer)
+    total = measure("preview + overlay", with_overlay, args.frames, args.warmup)
+    print("overlay alone: %.3f ms/frame (%s)" % (total - base, overlay.stats()))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Measure per-frame allocations of the camera preview path with tracemalloc.
+
+Compares the old path (cvtColor + surfarray.make_surface + transform.scale on the
+full frame) against CameraPreview. Only allocations made through Python/NumPy are
+visible to tracemalloc; SDL surface memory is reported separately as surfaces created.
+
+Usage:
+    python scripts/bench_preview.py --frames 300 --resolution 1280x720
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import cv2
+import numpy as np
+import pygame
+
+from preview import CameraPreview, fit_size
+
+
+def old_preview(frame_bgr, size):
+    display_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+    frame_surface = pygame.surfarray.make_surface(display_rgb.swapaxes(0, 1))
+    return pygame.transform.scale(frame_surface, size)
+
+
+def measure(name, step, frames, warmup, surfaces_per_frame):
+    for i in range(warmup):
+        step(i)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    t0 = time.perf_counter()
+    for i in range(warmup, warmup + frames):
+        step(i)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = [s for s in after.compare_to(before, "lineno") if s.count_diff > 0 or s.size_diff > 0]
+    retained = sum(s.size_diff for s in stats)
+    print("%-14s %8.3f ms/frame  peak traced %8.1f KB  retained %6.1f KB  surfaces/frame %d" % (
+        name, elapsed / frames * 1000.0, peak / 1024.0, retained / 1024.0, surfaces_per_frame))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Camera preview allocation benchmark")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--resolution", default="1280x720")
+    parser.add_argument("--preview", default="200x120")
+    args = parser.parse_args()
+
+    src_w, src_h = (int(v) for v in args.resolution.lower().split("x"))
+    max_w, max_h = (int(v) for v in args.preview.lower().split("x"))
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    rng = np.random.default_rng(0)
+    frames_bgr = [rng.integers(0, 256, (src_h, src_w, 3), dtype=np.uint8) for _ in range(4)]
+    frames_rgb = [cv2.cvtColor(f, cv2.COLOR_BGR2RGB) for f in frames_bgr]
+    size = fit_size(src_w, src_h, max_w, max_h)
+    print("Source %dx%d -> preview %dx%d, %d frames" % (src_w, src_h, size[0], size[1], args.frames))
+
+    measure("old path", lambda i: old_preview(frames_bgr[i % 4], size), args.frames, args.warmup, 2)
+
+    preview = CameraPreview((max_w, max_h))
+    measure("CameraPreview", lambda i: preview.update(frames_rgb[i % 4], i), args.frames, args.warmup, 0)
+    print("CameraPreview buffer allocations: %d (expected 1)" % preview.allocations)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
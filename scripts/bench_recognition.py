@@ -0,0 +1,274 @@
+"""Accuracy / latency regression suite for gesture recognition, the start trigger and the reveal vote.
+
+Usage:
+    python scripts/bench_recognition.py                     # compare with the stored baseline
+    python scripts/bench_recognition.py --update-baseline   # accept the current numbers as the new baseline
+
+Every number comes from synthetic hands (synthetic_hands.py) with a fixed seed,
+so accuracy figures are exactly reproducible; only the timings vary by machine.
+
+- classifier: confusion matrix and None rate of classify_batch on clean hands,
+  on varied hands (roll / yaw / pitch / size / left and right / unknown
+  handedness / noise), on occluded hands, and on in-between poses (blends of
+  two gestures: either gesture or None is fine, the third one is an error)
+- rounds: GameSession rounds played with per-frame jittered hands and missed
+  detections: inferences until the start trigger fires and until the reveal
+  vote decides, and how often the decided gesture and the round result
+  (determine_result against the cat) match what the player showed
+- speed: classify_batch us/hand on a large batch, and us per game frame
+  (classify one hand + GameSession.on_inference)
+
+Exits with status 1 and lists every regression when accuracy drops, the None
+or error rate rises, decisions need more frames, or a frame gets slower than
+the baseline allows.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from game_session import GameSession
+from gesture_classifier import GESTURES, NO_GESTURE, classify_batch, gesture_name
+from round_engine import determine_result
+from synthetic_hands import generate, in_between, jitter, render, sample_params
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recognition_baseline.json")
+LABELS = GESTURES + ("None",)
+
+# Pose sets: generate() keyword arguments
+CLEAN = {"noise": 0.0, "roll_deg": (0.0, 0.0), "yaw_deg": (0.0, 0.0), "pitch_deg": (0.0, 0.0),
+         "scale": (0.22, 0.26), "unknown_handedness": 0.0}
+SETS = {"clean": CLEAN, "varied": {}, "occluded": {"occlusion": 0.5}}
+
+# Allowed drift before a check fails (accuracy and rates are absolute fractions)
+TOLERANCE = {"rate": 0.005, "frames": 0.25, "speed": 1.5}
+
+
+def confusion(expected, got):
+    """3 x 4 counts: rows = true gesture, columns = rock / paper / scissors / None."""
+    matrix = np.zeros((len(GESTURES), len(LABELS)), dtype=np.int64)
+    np.add.at(matrix, (expected, np.where(got == NO_GESTURE, len(GESTURES), got)), 1)
+    return matrix
+
+
+def classifier_suite(n, seed):
+    rng = np.random.default_rng(seed)
+    out = {}
+    for name, kwargs in SETS.items():
+        landmarks, handedness, labels = generate(n, rng, **kwargs)
+        got = classify_batch(landmarks, handedness)
+        out[name] = {"accuracy": float((got == labels).mean()), "none_rate": float((got == NO_GESTURE).mean()),
+                     "confusion": confusion(labels, got).tolist()}
+    params, a, b = in_between(n, rng)
+    got = classify_batch(render(params, rng), params["handedness"])
+    out["in_between"] = {"none_rate": float((got == NO_GESTURE).mean()),
+                         "error_rate": float(((got != a) & (got != b) & (got != NO_GESTURE)).mean())}
+    return out
+
+
+def play_round(session, rng, now, infer_ms, miss_rate, occlusion, max_frames=90):
+    """One round with one player; returns (now, start frames, decision frames, gesture ok, result ok)."""
+    def frame(params):
+        # One inference: the player's hand (or a missed detection)
+        if rng.random() < miss_rate:
+            return [], None
+        params = jitter(params, rng)
+        landmarks = render(params, rng, occlusion=occlusion)
+        gestures = [gesture_name(c) for c in classify_batch(landmarks, params["handedness"])]
+        return gestures, landmarks[:, 0, :2]
+
+    # Start: an open hand, as the HUD asks for
+    hand = sample_params(1, rng, [GESTURES.index("paper")])
+    start_frames = 0
+    while session.engine.phase == "idle" and start_frames < max_frames:
+        gestures, positions = frame(hand)
+        session.on_inference(gestures, now, None, positions)
+        session.update(now)
+        start_frames += 1
+        now += infer_ms
+    if session.engine.phase == "idle":
+        return now, None, None, False, False
+    # Countdown: the scheduler runs no inference; the player makes their move
+    move = int(rng.integers(0, len(GESTURES)))
+    hand = sample_params(1, rng, [move])
+    while not session.revealing:
+        session.update(now)
+        now += infer_ms
+    decision_frames = None
+    finished = None
+    frames = 0
+    while finished is None:
+        gestures, positions = frame(hand)
+        session.on_inference(gestures, now, None, positions)
+        frames += 1
+        if decision_frames is None and session.reveal_decision is not None:
+            decision_frames = frames
+        finished = session.update(now)
+        now += infer_ms
+    player = session.engine.player_gesture
+    expected = determine_result(GESTURES[move], session.engine.cat_gesture)
+    # Result shown, hand lowered until the next round can start
+    while session.engine.phase != "idle":
+        session.on_inference([], now)
+        session.update(now)
+        now += infer_ms
+    for _ in range(5):
+        session.on_inference([], now)
+        now += infer_ms
+    return now, start_frames, decision_frames or frames, player == GESTURES[move], finished == expected
+
+
+def rounds_suite(rounds, seed, infer_hz, miss_rate, occlusion):
+    rng = np.random.default_rng(seed)
+    session = GameSession(cat_start_y=-50, cat_target_y=100, cat_speed=2.5, result_ms=1000,
+                          rng=random.Random(seed))
+    now, infer_ms = 0, int(round(1000.0 / infer_hz))
+    start, decision, gesture_ok, result_ok, no_start = [], [], 0, 0, 0
+    for _ in range(rounds):
+        now, s, d, g, r = play_round(session, rng, now, infer_ms, miss_rate, occlusion)
+        if s is None:
+            no_start += 1
+            continue
+        start.append(s)
+        decision.append(d)
+        gesture_ok += g
+        result_ok += r
+    played = max(len(start), 1)
+    return {"rounds": rounds, "no_start_rate": no_start / rounds,
+            "start_frames_mean": float(np.mean(start)) if start else 0.0,
+            "start_frames_p90": float(np.percentile(start, 90)) if start else 0.0,
+            "decision_frames_mean": float(np.mean(decision)) if decision else 0.0,
+            "decision_frames_p90": float(np.percentile(decision, 90)) if decision else 0.0,
+            "gesture_accuracy": gesture_ok / played, "result_accuracy": result_ok / played}
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def speed_suite(seed, repeat):
+    rng = np.random.default_rng(seed)
+    landmarks, handedness, _ = generate(20000, rng)
+    batch_us = best_of(lambda: classify_batch(landmarks, handedness), repeat) / len(landmarks) * 1e6
+
+    frames = [(landmarks[i:i + 1], handedness[i:i + 1]) for i in range(2000)]
+    session = GameSession()
+
+    def game_frames():
+        for i, (lm, hand) in enumerate(frames):
+            gestures = [gesture_name(c) for c in classify_batch(lm, hand)]
+            session.on_inference(gestures, i * 33, None, lm[:, 0, :2])
+    frame_us = best_of(game_frames, repeat) / len(frames) * 1e6
+    return {"classify_batch_us_per_hand": batch_us, "frame_us": frame_us}
+
+
+def format_report(report):
+    lines = []
+    for name, result in report["classifier"].items():
+        if "confusion" in result:
+            lines.append("%-10s accuracy %6.2f%%  None %5.2f%%" % (name, result["accuracy"] * 100,
+                                                                  result["none_rate"] * 100))
+            lines.append("           %10s" % "" + "".join("%10s" % label for label in LABELS))
+            for label, row in zip(GESTURES, result["confusion"]):
+                lines.append("           %10s" % label + "".join("%10d" % v for v in row))
+        else:
+            lines.append("%-10s None %5.2f%%  third gesture %5.2f%%" % (name, result["none_rate"] * 100,
+                                                                        result["error_rate"] * 100))
+    r = report["rounds"]
+    lines.append("rounds     %d played: start after %.1f frames (p90 %.0f), reveal decided after %.1f (p90 %.0f), "
+                 "gesture %.1f%%, result %.1f%%, no start %.1f%%" % (
+                     r["rounds"], r["start_frames_mean"], r["start_frames_p90"], r["decision_frames_mean"],
+                     r["decision_frames_p90"], r["gesture_accuracy"] * 100, r["result_accuracy"] * 100,
+                     r["no_start_rate"] * 100))
+    s = report["speed"]
+    lines.append("speed      classify_batch %.3f us/hand, game frame %.1f us" % (
+        s["classify_batch_us_per_hand"], s["frame_us"]))
+    return "\n".join(lines)
+
+
+def compare(report, baseline):
+    """Human-readable regressions of report against baseline (empty when none)."""
+    problems = []
+
+    def check(name, value, base, higher_is_worse, tolerance):
+        worse = value - base if higher_is_worse else base - value
+        if worse > tolerance:
+            problems.append("%s: %.4g (baseline %.4g)" % (name, value, base))
+
+    for name, result in baseline["classifier"].items():
+        got = report["classifier"][name]
+        if "accuracy" in result:
+            check(f"{name} accuracy", got["accuracy"], result["accuracy"], False, TOLERANCE["rate"])
+        check(f"{name} None rate", got["none_rate"], result["none_rate"], True, TOLERANCE["rate"])
+        if "error_rate" in result:
+            check(f"{name} third-gesture rate", got["error_rate"], result["error_rate"], True, TOLERANCE["rate"])
+    got, base = report["rounds"], baseline["rounds"]
+    for key in ("gesture_accuracy", "result_accuracy"):
+        check(f"rounds {key}", got[key], base[key], False, TOLERANCE["rate"])
+    check("rounds no-start rate", got["no_start_rate"], base["no_start_rate"], True, TOLERANCE["rate"])
+    for key in ("start_frames_mean", "decision_frames_mean"):
+        check(f"rounds {key}", got[key], base[key], True, TOLERANCE["frames"])
+    for key, value in report["speed"].items():
+        # Timings vary by machine; only a clear slowdown counts
+        check(f"speed {key}", value, baseline["speed"][key] * TOLERANCE["speed"], True, 0.0)
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=20000, help="hands per classifier set")
+    parser.add_argument("--rounds", type=int, default=300, help="GameSession rounds to play")
+    parser.add_argument("--infer-hz", type=float, default=30.0, help="inference rate during the simulated rounds")
+    parser.add_argument("--miss-rate", type=float, default=0.1, help="share of inferences that find no hand")
+    parser.add_argument("--occlusion", type=float, default=0.1, help="share of round frames with a hidden finger")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats (best is kept)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--no-speed-check", action="store_true", help="report timings but don't fail on them")
+    args = parser.parse_args()
+
+    report = {"settings": {"n": args.n, "rounds": args.rounds, "infer_hz": args.infer_hz,
+                           "miss_rate": args.miss_rate, "occlusion": args.occlusion, "seed": args.seed},
+              "classifier": classifier_suite(args.n, args.seed),
+              "rounds": rounds_suite(args.rounds, args.seed, args.infer_hz, args.miss_rate, args.occlusion),
+              "speed": speed_suite(args.seed, args.repeat)}
+    print(format_report(report))
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 1
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline["settings"] != report["settings"]:
+        print("Settings differ from the baseline's %s; accuracy numbers are not comparable" % baseline["settings"])
+        return 1
+    if args.no_speed_check:
+        report["speed"] = {key: 0.0 for key in report["speed"]}
+    problems = compare(report, baseline)
+    if problems:
+        print("REGRESSION against %s:" % args.baseline)
+        for problem in problems:
+            print("  " + problem)
+        return 1
+    print("No regressions against %s" % args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
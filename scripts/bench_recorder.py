@@ -0,0 +1,119 @@
+"""Round clip recording: render-thread cost, encoder throughput and dropped frames.
+
+Usage:
+    python scripts/bench_recorder.py [--resolution 1280x720] [--fps 30] [--rounds 3] [--slots 2 8] [--uncapped]
+
+A render loop paced to --fps (a moving rectangle on a window-sized surface)
+plays rounds of countdown + reveal + result in real time while RoundRecorder
+writes one clip per round into a temporary directory.
+
+- old path: what recording inside the loop would cost without the recorder:
+  the screen copied out with surfarray, converted and written with
+  cv2.VideoWriter before the next frame (ms per recorded frame)
+- capture ms: render-thread time of RoundRecorder.capture() per queued frame
+- encode fps: frames the background thread converts and encodes per second of its own time
+- dropped: clip frames skipped because every ring buffer was still waiting for the
+  encoder (--uncapped renders as fast as possible, competing with it for the CPU)
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import cv2
+import numpy as np
+import pygame
+
+from round_recorder import RoundRecorder
+
+ROUND_MS = (3000, 600, 1500)  # countdown, reveal, result
+
+
+def old_path(screen, writer, scale):
+    rgb = pygame.surfarray.array3d(screen).swapaxes(0, 1)
+    bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+    h, w = bgr.shape[:2]
+    writer.write(cv2.resize(bgr, (int(w * scale) // 2 * 2, int(h * scale) // 2 * 2), interpolation=cv2.INTER_AREA))
+
+
+def draw(screen, i):
+    screen.fill((40, 20, 60))
+    w, h = screen.get_size()
+    pygame.draw.rect(screen, (255, 182, 193), ((i * 7) % w, h // 3, w // 8, h // 4))
+
+
+def run_rounds(screen, recorder, rounds, fps, camera, uncapped):
+    frame_s = 1.0 / fps
+    start = time.perf_counter()
+    i = 0
+    for _ in range(rounds):
+        now = (time.perf_counter() - start) * 1000.0
+        recorder.start_clip(now)
+        end = now + sum(ROUND_MS)
+        while now < end:
+            draw(screen, i)
+            recorder.capture(screen, now, camera)
+            i += 1
+            if not uncapped:
+                # Pace like clock.tick(): sleep out the rest of the frame
+                delay = start + i * frame_s - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            now = (time.perf_counter() - start) * 1000.0
+        recorder.end_clip("win")
+    return i / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", default="1280x720")
+    parser.add_argument("--fps", type=float, default=30.0, help="render rate of the simulated loop")
+    parser.add_argument("--clip-fps", type=float, default=15.0)
+    parser.add_argument("--scale", type=float, default=0.5)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--slots", type=int, nargs="+", default=[2, 8])
+    parser.add_argument("--camera", action="store_true", help="also record a 1280x720 camera frame per clip frame")
+    parser.add_argument("--uncapped", action="store_true", help="render as fast as possible")
+    args = parser.parse_args()
+
+    w, h = (int(v) for v in args.resolution.lower().split("x"))
+    pygame.init()
+    screen = pygame.display.set_mode((w, h))
+    camera = np.random.default_rng(0).integers(0, 256, (720, 1280, 3), dtype=np.uint8) if args.camera else None
+    print("%dx%d window, render %.0f fps%s, clips %.0f fps at scale %.2f, %d rounds of %.1f s" % (
+        w, h, args.fps, " (uncapped)" if args.uncapped else "", args.clip_fps, args.scale, args.rounds,
+        sum(ROUND_MS) / 1000.0))
+
+    with tempfile.TemporaryDirectory() as directory:
+        writer = cv2.VideoWriter(os.path.join(directory, "old.mp4"), cv2.VideoWriter_fourcc(*"mp4v"), args.clip_fps,
+                                 (int(w * args.scale) // 2 * 2, int(h * args.scale) // 2 * 2))
+        n = 30
+        t0 = time.perf_counter()
+        for i in range(n):
+            draw(screen, i)
+            old_path(screen, writer, args.scale)
+        old_ms = (time.perf_counter() - t0) / n * 1000.0
+        writer.release()
+        print("old path: %.2f ms per recorded frame on the render thread" % old_ms)
+
+        print("%6s %11s %8s %12s %12s %12s %9s %10s %6s" % ("slots", "render fps", "frames", "capture ms",
+                                                             "encode ms", "encode fps", "dropped", "drop rate",
+                                                             "clips"))
+        for slots in args.slots:
+            recorder = RoundRecorder(os.path.join(directory, "slots%d" % slots), args.clip_fps, args.scale,
+                                     camera=args.camera, slots=slots)
+            render_fps = run_rounds(screen, recorder, args.rounds, args.fps, camera, args.uncapped)
+            recorder.close()
+            s = recorder.stats()
+            print("%6d %11.1f %8d %12.3f %12.3f %12.1f %9d %9.1f%% %6d" % (
+                slots, render_fps, s["frames"], s["capture_ms"], s["encode_ms"], s["encode_fps"], s["dropped"],
+                s["drop_rate"] * 100, s["clips"]))
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
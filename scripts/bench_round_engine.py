@@ -0,0 +1,53 @@
+"""Rounds per second: RoundEngine one round at a time vs the vectorized batch simulator.
+
+Usage:
+    python scripts/bench_round_engine.py [--strategy markov] [--rounds 20000] [--games 100000]
+
+The scalar loop drives RoundEngine through start / tick / finish like the game
+does (with simulated timestamps); the batch simulator plays `games` games in
+lock-step, one NumPy step per round.
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from round_engine import GESTURES, STRATEGIES, RoundEngine, simulate
+
+
+def scalar_rounds(strategy, rounds, seed=0):
+    engine = RoundEngine(strategy, countdown=0, result_ms=0, rng=np.random.default_rng(seed))
+    pick = random.Random(seed).choice
+    now = 0
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        engine.start(now)
+        engine.tick(now)            # countdown of 0 s: straight to the reveal
+        engine.finish(pick(GESTURES), now)
+        now += 1
+        engine.tick(now)            # result -> idle
+    return rounds / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strategy", default="markov", choices=list(STRATEGIES))
+    parser.add_argument("--rounds", type=int, default=20000, help="rounds for the scalar loop")
+    parser.add_argument("--games", type=int, default=100000, help="parallel games for the batch simulator")
+    parser.add_argument("--batch-rounds", type=int, default=100)
+    args = parser.parse_args()
+
+    scalar = scalar_rounds(args.strategy, args.rounds)
+    t0 = time.perf_counter()
+    result = simulate(args.strategy, "uniform", args.games, args.batch_rounds)
+    batch = result["rounds"] / (time.perf_counter() - t0)
+    print("strategy %s" % args.strategy)
+    print("RoundEngine, one round at a time: %12.0f rounds/s" % scalar)
+    print("batch simulator (%d games):   %12.0f rounds/s  (%.0fx)" % (args.games, batch, batch / scalar))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
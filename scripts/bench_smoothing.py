@@ -0,0 +1,151 @@
+"""Decision latency vs accuracy of the reveal vote, measured on recorded traces.
+
+Usage:
+    python scripts/bench_smoothing.py venue.trace [more.trace ...]
+    python scripts/bench_smoothing.py rock=rock.trace paper=paper.trace --model gesture_model.npz
+
+Every run of consecutive "reveal" records in the traces is one player decision.
+Its reference answer is the LABEL when the trace is given as LABEL=PATH,
+otherwise the majority gesture over the whole reveal. For each strategy the
+table shows how many inferences it needed before deciding and how often the
+decision matches the reference:
+
+- "full reveal": the old behavior, majority of the last 5 frames when the paw arrives
+- "first k": majority of the first k frames
+- "smoothed": GestureVote with the given half-life / share / min-weight settings
+"""
+import argparse
+import itertools
+import sys
+from collections import Counter
+
+import numpy as np
+
+from game_session import PHASES
+from gesture_classifier import GESTURE_CODES, classify_batch, gesture_name
+from gesture_smoothing import GestureVote
+from trace_log import TraceReader
+
+
+def reveal_segments(chunks):
+    """[(gestures, confidences)] per run of reveal records, first (player) hand only.
+
+    chunks yields (records, codes, confidences) for consecutive parts of a trace; a reveal
+    may continue from one chunk into the next.
+    """
+    segments = []
+    current = None
+    reveal_code = PHASES.index("reveal")
+    for records, codes, confidences in chunks:
+        for phase, n, code, conf in zip(records["phase"], records["n_hands"], codes, confidences):
+            if phase == reveal_code:
+                if current is None:
+                    current = ([], [])
+                current[0].append(gesture_name(code) if n else None)
+                current[1].append(float(conf))
+            elif current is not None:
+                segments.append(current)
+                current = None
+    if current is not None:
+        segments.append(current)
+    return segments
+
+
+def majority(gestures):
+    counts = Counter(g for g in gestures if g)
+    return counts.most_common(1)[0][0] if counts else None
+
+
+def classified_chunks(path, model, min_confidence, gaps):
+    """(records, first-hand codes, confidences) per chunk of a trace, straight from the memory map;
+    appends the ms between consecutive reveal inferences to gaps."""
+    last_t, last_reveal = None, False
+    for records in TraceReader(path).chunks():
+        landmarks = records["landmarks"][:, 0]
+        handedness = records["handedness"][:, 0]
+        codes = classify_batch(landmarks, handedness) if model is not None else records["gesture"][:, 0]
+        confidences = np.ones(len(records), dtype=np.float32)
+        if model is not None:
+            codes, confidences = model.fill_uncertain(landmarks, handedness, codes, min_confidence)
+        reveal = records["phase"] == PHASES.index("reveal")
+        t = records["t"]
+        gaps.extend(np.diff(t)[reveal[1:] & reveal[:-1]] * 1000.0)
+        if last_reveal and reveal[0]:
+            gaps.append((t[0] - last_t) * 1000.0)
+        last_t, last_reveal = t[-1], reveal[-1]
+        yield records, codes, confidences
+
+
+def load_segments(specs, model=None, min_confidence=0.7):
+    """(segments, reference gestures, median ms between reveal inferences)."""
+    segments, references, gaps = [], [], []
+    for spec in specs:
+        label, path = None, spec
+        if "=" in spec and spec.split("=", 1)[0] in GESTURE_CODES:
+            label, path = spec.split("=", 1)
+        for gestures, conf in reveal_segments(classified_chunks(path, model, min_confidence, gaps)):
+            reference = label or majority(gestures)
+            if reference:
+                segments.append((gestures, conf))
+                references.append(reference)
+    return segments, references, float(np.median(gaps)) if gaps else 0.0
+
+
+def evaluate(decide, segments, references):
+    """decide(gestures, confidences) -> (gesture, frames used); returns (mean frames, accuracy)."""
+    frames, correct = [], 0
+    for (gestures, conf), reference in zip(segments, references):
+        gesture, used = decide(gestures, conf)
+        frames.append(used)
+        correct += gesture == reference
+    return float(np.mean(frames)), correct / len(segments)
+
+
+def smoothed(half_life, share, min_weight):
+    def decide(gestures, conf):
+        vote = GestureVote(half_life)
+        for i, (g, c) in enumerate(zip(gestures, conf)):
+            vote.add(g, c if g else 0.0)
+            decision = vote.decided(share, min_weight)
+            if decision:
+                return decision, i + 1
+        return vote.leader()[0], len(gestures)
+    return decide
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("traces", nargs="+", help="PATH or LABEL=PATH (every reveal in it shows LABEL)")
+    parser.add_argument("--model", help="learned model for confidences (rules + model, as Paw-Punch.py --model)")
+    parser.add_argument("--model-confidence", type=float, default=0.7)
+    parser.add_argument("--half-life", type=float, nargs="+", default=[1.0, 2.0, 4.0])
+    parser.add_argument("--share", type=float, nargs="+", default=[0.6, 0.75, 0.9])
+    parser.add_argument("--min-weight", type=float, nargs="+", default=[1.0, 1.5, 2.5])
+    args = parser.parse_args()
+
+    model = None
+    if args.model:
+        from learned_classifier import GestureModel
+        model = GestureModel.load(args.model)
+    segments, references, gap_ms = load_segments(args.traces, model, args.model_confidence)
+    if not segments:
+        print("No reveal phases with a detected gesture in these traces")
+        return 1
+    print("%d reveals, median %.1f ms between reveal inferences" % (len(segments), gap_ms))
+    print("%-40s %8s %8s %9s" % ("strategy", "frames", "ms", "accuracy"))
+
+    def row(name, decide):
+        frames, accuracy = evaluate(decide, segments, references)
+        print("%-40s %8.2f %8.1f %9.3f" % (name, frames, frames * gap_ms, accuracy))
+
+    row("full reveal (last 5)", lambda g, c: (majority(g[-5:]), len(g)))
+    for k in (1, 2, 3, 5):
+        row("first %d" % k, lambda g, c, k=k: (majority(g[:k]), min(k, len(g))))
+    for half_life, share, min_weight in itertools.product(args.half_life, args.share, args.min_weight):
+        row("smoothed half-life %.1f share %.2f weight %.1f" % (half_life, share, min_weight),
+            smoothed(half_life, share, min_weight))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Time-to-first-frame benchmark: launches Paw-Punch.py headless for one frame, repeatedly.
+
+Usage:
+    python scripts/bench_startup.py --source recording.mp4
+    python scripts/bench_startup.py --source 0 --runs 10
+
+The first run uses an empty asset cache (cold), the rest reuse it (warm). For
+every run the startup milestones printed by Paw-Punch.py (imports, window,
+assets, camera, mediapipe, first_frame; ms since launch) are collected and
+their medians reported, plus the wall time of the whole process.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Paw-Punch.py")
+MARK_RE = re.compile(r"([a-z_]+) ([0-9.]+)")
+
+
+def run_once(source, cache_dir):
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, SCRIPT, "--headless", "--max-frames", "1", "--source", source,
+                           "--asset-cache", cache_dir], capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - t0) * 1000.0
+    marks = {}
+    for line in proc.stdout.splitlines():
+        if line.startswith("Startup (ms since launch):"):
+            marks = {name: float(ms) for name, ms in MARK_RE.findall(line.split(":", 1)[1])}
+    if proc.returncode != 0 or "first_frame" not in marks:
+        raise RuntimeError("Paw-Punch.py failed (exit %d):\n%s%s" % (proc.returncode, proc.stdout, proc.stderr))
+    marks["process_wall"] = wall_ms
+    return marks
+
+
+def print_table(title, runs):
+    print(title)
+    for name in runs[0]:
+        values = [r[name] for r in runs if name in r]
+        print("  %-14s median %8.1f ms   min %8.1f   max %8.1f" % (name, statistics.median(values),
+                                                                   min(values), max(values)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", required=True, help="camera index, video file or frame directory")
+    parser.add_argument("--runs", type=int, default=5, help="warm runs after the cold one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="pawpunch-cache-") as cache_dir:
+        print_table("Cold asset cache (1 run):", [run_once(args.source, cache_dir)])
+        print_table("Warm asset cache (%d runs):" % args.runs, [run_once(args.source, cache_dir)
+                                                                for _ in range(args.runs)])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Stats store benchmark: record() cost on the render thread, write throughput and 24 h query time.
+
+Usage:
+    python scripts/bench_stats.py [--rounds 2000000] [--stations 8] [--days 30] [--db /tmp/bench-stats.db]
+
+Fills a fresh database with synthetic rounds spread over the last `days` days
+through StatsRecorder (as the game would, only much faster), then times the
+"last 24 h per station" summary from the rollups against a raw scan of the
+rounds table and checks that both agree.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+from round_engine import CAT_WINS, DRAW, NO_MOVE, PLAYER_WINS, outcome
+from stats_store import StatsRecorder, connect, query_summary, query_summary_raw
+
+
+def synthetic_rows(n, stations, days, seed=0):
+    rng = random.Random(seed)
+    now = time.time()
+    span = days * 86400.0
+    codes = (DRAW, PLAYER_WINS, CAT_WINS)
+    for i in range(n):
+        t = now - span + span * i / n  # rounds arrive in time order, like a real venue
+        player = rng.choice((0, 0, 1, 1, 2, -1))
+        cat = rng.randrange(3)
+        result = NO_MOVE if player < 0 else codes[int(outcome(player, cat))]
+        yield (t, rng.randrange(stations), player, cat, result, rng.randint(400, 2000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2000000)
+    parser.add_argument("--stations", type=int, default=8)
+    parser.add_argument("--days", type=float, default=30.0)
+    parser.add_argument("--db", default="/tmp/bench-stats.db")
+    parser.add_argument("--repeat", type=int, default=5, help="query repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+
+    rows = list(synthetic_rows(args.rounds, args.stations, args.days))
+    recorder = StatsRecorder(args.db, flush_s=0.05, batch_size=5000)
+    t0 = time.perf_counter()
+    recorder.record_rows(rows)
+    enqueue_s = time.perf_counter() - t0
+    recorder.close()
+    write_s = time.perf_counter() - t0
+    print("%d rounds: enqueue %.2f us/round on the caller, written in %.2fs (%.0f rounds/s, %d batches)" % (
+        args.rounds, enqueue_s / args.rounds * 1e6, write_s, args.rounds / write_s, recorder.batches_written))
+    print("database %.1f MB" % (sum(os.path.getsize(args.db + s) for s in ("", "-wal", "-shm")
+                                    if os.path.exists(args.db + s)) / 1e6))
+
+    conn = connect(args.db)
+    until = time.time()
+    since = until - 86400.0
+
+    def best(fn):
+        times = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            result = fn(conn, since, until)
+            times.append(time.perf_counter() - t)
+        return result, min(times) * 1000
+
+    rollup, rollup_ms = best(query_summary)
+    raw, raw_ms = best(query_summary_raw)
+    print("last 24 h per station: rollups %.2f ms, raw scan %.2f ms (%.0fx), %d rounds in window" % (
+        rollup_ms, raw_ms, raw_ms / rollup_ms, sum(s["rounds"] for s in rollup.values())))
+    conn.close()
+    if rollup != raw:
+        print("MISMATCH between rollup and raw totals")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Hand tracking with bystanders: id stability, player-hand accuracy and per-inference cost.
+
+Usage:
+    python scripts/bench_tracker.py [--hands 1 2 4 8 16] [--frames 3000] [--rounds 100]
+
+Every scenario has one player (a large hand near the station) and hands-1
+bystanders (smaller, further back) drifting around the frame, showing random
+gestures. MediaPipe's hand order is shuffled every inference and each hand is
+missed 10% of the time.
+
+- id switches: inferences where a hand that was matched in the previous
+  inference got a different track id (lower is better)
+- us/inference: HandSmoother.update (tracking + votes + start trigger) with
+  landmarks; "positions us" is HandTracker.update fed wrist positions only
+  (what net_server does), next to the old greedy nearest-wrist matching loop
+- rounds: full GameSession rounds; how often the decided gesture is the
+  player's, and how often "hand 0 of the result" (what the reveal used to
+  sample) would have been the player's hand
+"""
+import argparse
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+from game_session import GameSession
+from gesture_classifier import GESTURES, classify_batch, gesture_name
+from gesture_smoothing import HandSmoother
+from hand_tracker import HandTracker
+from synthetic_hands import jitter, render, sample_params
+
+PLAYER = {"scale": (0.22, 0.26), "center_x": (0.4, 0.6), "center_y": (0.65, 0.85)}
+BYSTANDER = {"scale": (0.08, 0.14), "center_x": (0.1, 0.9), "center_y": (0.3, 0.9)}
+
+
+def old_associate(tracks, positions, match_distance=0.2):
+    """The previous HandSmoother matching: greedy over all (hand, track) pairs by wrist distance."""
+    pairs = []
+    for i, (x, y) in enumerate(positions):
+        for tid, (tx, ty) in tracks.items():
+            d = math.hypot(x - tx, y - ty)
+            if d <= match_distance:
+                pairs.append((d, i, tid))
+    pairs.sort()
+    ids = [None] * len(positions)
+    used = set()
+    for _, i, tid in pairs:
+        if ids[i] is None and tid not in used:
+            ids[i] = tid
+            used.add(tid)
+    for i, (x, y) in enumerate(positions):
+        if ids[i] is None:
+            ids[i] = len(tracks) + i + 1000
+        tracks[ids[i]] = (x, y)
+    return ids
+
+
+class Scene:
+    """A player and bystanders, moving a little every inference; render() gives one shuffled inference."""
+
+    def __init__(self, hands, rng, player_gesture=None):
+        self.rng = rng
+        gestures = [GESTURES.index(player_gesture)] if player_gesture else None
+        self.params = [sample_params(1, rng, gestures, **PLAYER)] + \
+            [sample_params(1, rng, **BYSTANDER) for _ in range(hands - 1)]
+
+    def set_player(self, gesture):
+        p = sample_params(1, self.rng, [GESTURES.index(gesture)], **PLAYER)
+        for key in ("center_x", "center_y", "scale", "side", "handedness"):
+            p[key] = self.params[0][key]
+        self.params[0] = p
+
+    def render(self, miss_rate=0.1):
+        """(landmarks, handedness, true hand index per row) with MediaPipe-like shuffled order."""
+        self.params = [jitter(p, self.rng, move=0.01) for p in self.params]
+        seen = [i for i in range(len(self.params)) if self.rng.random() >= miss_rate]
+        self.rng.shuffle(seen)
+        if not seen:
+            return np.zeros((0, 21, 3), dtype=np.float32), np.zeros(0, dtype=np.int8), []
+        landmarks = np.concatenate([render(self.params[i], self.rng) for i in seen])
+        handedness = np.concatenate([self.params[i]["handedness"] for i in seen])
+        return landmarks, handedness, seen
+
+
+def tracking_run(hands, frames, seed):
+    rng = np.random.default_rng(seed)
+    scene = Scene(hands, rng)
+    inferences = [scene.render() for _ in range(frames)]
+    gestures = [[gesture_name(c) for c in classify_batch(lm, hd)] if len(lm) else [] for lm, hd, _ in inferences]
+
+    smoother = HandSmoother()
+    last_id = {}
+    switches = matched = 0
+    t0 = time.perf_counter()
+    ids_per_frame = [smoother.update(g, landmarks=lm) for g, (lm, _, _) in zip(gestures, inferences)]
+    new_us = (time.perf_counter() - t0) / frames * 1e6
+    for ids, (_, _, truth) in zip(ids_per_frame, inferences):
+        for tid, hand in zip(ids, truth):
+            if hand in last_id:
+                matched += 1
+                switches += last_id[hand] != tid
+            last_id[hand] = tid
+
+    tracks = {}
+    positions = [lm[:, 0, :2].tolist() for lm, _, _ in inferences]
+    t0 = time.perf_counter()
+    for p in positions:
+        old_associate(tracks, p)
+    old_us = (time.perf_counter() - t0) / frames * 1e6
+    tracker = HandTracker()
+    t0 = time.perf_counter()
+    for p in positions:
+        tracker.update(positions=p)
+    positions_us = (time.perf_counter() - t0) / frames * 1e6
+    return switches / max(matched, 1), new_us, positions_us, old_us
+
+
+def rounds_run(hands, rounds, seed, infer_ms=33):
+    rng = np.random.default_rng(seed)
+    session = GameSession(cat_start_y=-50, cat_target_y=100, cat_speed=2.5, result_ms=500, rng=random.Random(seed))
+    now = 0
+    correct = hand0_player = reveal_frames = played = 0
+    for _ in range(rounds):
+        move = GESTURES[int(rng.integers(0, 3))]
+        scene = Scene(hands, rng, "paper")
+
+        def step(reveal=False):
+            nonlocal now, hand0_player, reveal_frames
+            lm, hd, truth = scene.render()
+            g = [gesture_name(c) for c in classify_batch(lm, hd)] if len(lm) else []
+            session.on_inference(g, now, landmarks=lm)
+            if reveal and truth:
+                reveal_frames += 1
+                hand0_player += truth[0] == 0
+            finished = session.update(now)
+            now += infer_ms
+            return finished
+
+        for _ in range(90):
+            step()
+            if session.engine.phase != "idle":
+                break
+        if session.engine.phase == "idle":
+            continue
+        while not session.revealing:
+            session.update(now)
+            now += infer_ms
+        scene.set_player(move)
+        finished = None
+        while finished is None:
+            finished = step(reveal=True)
+        played += 1
+        correct += session.engine.player_gesture == move
+        while session.engine.phase != "idle":
+            session.update(now)
+            now += infer_ms
+        session.smoother.clear()
+    return correct / max(played, 1), hand0_player / max(reveal_frames, 1), played
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("%5s %12s %14s %14s %14s %11s %15s %7s" % ("hands", "id switches", "us/inference", "positions us",
+                                                     "old match us", "player ok", "hand 0 = player", "rounds"))
+    for hands in args.hands:
+        switch_rate, new_us, positions_us, old_us = tracking_run(hands, args.frames, args.seed)
+        accuracy, hand0, played = rounds_run(hands, args.rounds, args.seed)
+        print("%5d %11.2f%% %14.1f %14.1f %14.1f %10.1f%% %14.1f%% %7d" % (
+            hands, switch_rate * 100, new_us, positions_us, old_us, accuracy * 100, hand0 * 100, played))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+"""Threaded capture -> inference pipeline for Paw-Punch.
+
+The camera thread and the MediaPipe worker hand data to each other (and to the
+pygame renderer) through LatestQueue, a small bounded queue where new items
+replace old ones instead of blocking. A slow `hands.process` call therefore
+never holds up the render loop; the renderer just sees fewer new results.
+"""
+import threading
+import time
+from collections import deque, namedtuple
+
+import cv2
+import numpy as np
+
+# One mirrored camera frame, in both the BGR layout OpenCV returns and the RGB layout MediaPipe wants
+# (slot is its FrameRing slot; the consumer hands it back with release() once the arrays aren't read any more)
+CapturedFrame = namedtuple("CapturedFrame", "index timestamp bgr rgb slot")
+# MediaPipe output for one CapturedFrame (results is None when the scheduler skipped inference)
+InferenceResult = namedtuple("InferenceResult", "frame results inference_ms")
+
+
+class LatestQueue:
+    """Bounded latest-wins queue shared between threads.
+
+    put() never blocks: when the queue is full the oldest item is discarded.
+    Consumers always receive the newest item; anything older that was still
+    waiting is discarded too. Both cases are counted in `dropped`.
+    `last_age` / `max_age` are how long (seconds) consumed items sat in the queue.
+    on_drop(item), if given, is called for every discarded item (e.g. to release its buffers).
+    """
+
+    def __init__(self, maxsize=1, on_drop=None):
+        self._items = deque()
+        self._on_drop = on_drop
+        self._maxsize = max(1, int(maxsize))
+        self._cond = threading.Condition()
+        self._closed = False
+        self.put_count = 0
+        self.get_count = 0
+        self.dropped = 0
+        self.last_age = 0.0
+        self.max_age = 0.0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) >= self._maxsize:
+                self._drop(self._items.popleft()[1])
+            self._items.append((time.perf_counter(), item))
+            self.put_count += 1
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Wait for an item and return the newest one (None on timeout or after close())."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self._closed, timeout)
+            return self._take_latest()
+
+    def get_nowait(self):
+        """Return the newest item, or None if nothing new arrived since the last get."""
+        with self._cond:
+            return self._take_latest()
+
+    def get_all_nowait(self):
+        """Return every waiting item, oldest first (empty list if nothing new arrived)."""
+        with self._cond:
+            now = time.perf_counter()
+            items = [item for _, item in self._items]
+            if items:
+                self.last_age = now - self._items[-1][0]
+                self.max_age = max(self.max_age, now - self._items[0][0])
+                self.get_count += len(items)
+                self._items.clear()
+            return items
+
+    def _take_latest(self):
+        if not self._items:
+            return None
+        ts, item = self._items.pop()
+        # Anything older than the newest item is stale and will never be used
+        while self._items:
+            self._drop(self._items.popleft()[1])
+        self.get_count += 1
+        self.last_age = time.perf_counter() - ts
+        self.max_age = max(self.max_age, self.last_age)
+        return item
+
+    def _drop(self, item):
+        self.dropped += 1
+        if self._on_drop is not None:
+            self._on_drop(item)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        with self._cond:
+            return self._closed and not self._items
+
+    def stats(self):
+        with self._cond:
+            return {
+                "put": self.put_count,
+                "get": self.get_count,
+                "dropped": self.dropped,
+                "last_age_ms": self.last_age * 1000.0,
+                "max_age_ms": self.max_age * 1000.0,
+            }
+
+
+class FrameRing:
+    """Preallocated (bgr, rgb) buffer pairs that captured frames are decoded, mirrored and converted into.
+
+    A slot is only reused after it was explicitly handed back: acquire() takes a free slot,
+    the consumer calls release(slot) once nothing reads the frame's arrays any more (queues
+    release the frames they drop). When every slot is still held, the frame gets freshly
+    allocated arrays instead (counted in `fallbacks`), so a slow consumer costs allocations,
+    never overwritten frames. acquire() and release() may be called from different threads.
+    """
+
+    def __init__(self, slots=8):
+        self._slots = [None] * slots
+        self._free = deque(range(slots))  # append / popleft are atomic: no lock needed
+        self._held = bytearray(slots)
+        self.allocations = 0
+        self.fallbacks = 0
+
+    def acquire(self):
+        """A free slot for the next frame, or -1 when every slot is held (the frame gets new arrays)."""
+        try:
+            slot = self._free.popleft()
+        except IndexError:
+            self.fallbacks += 1
+            return -1
+        self._held[slot] = 1
+        return slot
+
+    def release(self, slot):
+        """Hand a slot back; releasing -1 (a fallback frame) or an already free slot does nothing."""
+        if slot >= 0 and self._held[slot]:
+            self._held[slot] = 0
+            self._free.append(slot)
+
+    def read_buffer(self, slot):
+        """BGR buffer the frame for slot should be read into (None until the frame size is known)."""
+        pair = self._slots[slot] if slot >= 0 else None
+        return pair[0] if pair is not None else None
+
+    def mirror_convert(self, frame, slot):
+        """Mirror frame into slot (in place if it was read there), convert to RGB; returns (bgr, rgb)."""
+        pair = self._slots[slot] if slot >= 0 else None
+        if pair is None or pair[0].shape != frame.shape:
+            pair = (np.empty_like(frame), np.empty_like(frame))
+            self.allocations += 1
+            if slot >= 0:
+                self._slots[slot] = pair
+        bgr, rgb = pair
+        cv2.flip(frame, 1, dst=bgr)
+        cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=rgb)
+        return bgr, rgb
+
+
+class CaptureThread(threading.Thread):
+    """Reads the camera as fast as it delivers, mirrors and converts each frame once."""
+
+    def __init__(self, cap, out_queue, timer=None, ring_slots=8):
+        super().__init__(name="paw-capture", daemon=True)
+        self.cap = cap
+        self.out_queue = out_queue
+        self.timer = timer
+        self.ring = FrameRing(ring_slots)
+        self.failed = False
+        self._stop_event = threading.Event()
+
+    def run(self):
+        index = 0
+        try:
+            while not self._stop_event.is_set():
+                t0 = time.perf_counter()
+                # Decoded straight into a ring slot and mirrored in place: no new arrays per frame
+                slot = self.ring.acquire()
+                ret, frame = self.cap.read(self.ring.read_buffer(slot))
+                t1 = time.perf_counter()
+                if not ret:
+                    # Cameras reconnect inside read() (frame_sources.CameraSource); this is the end of the source
+                    self.ring.release(slot)
+                    self.failed = True
+                    break
+                frame, frame_rgb = self.ring.mirror_convert(frame, slot)
+                if self.timer is not None:
+                    self.timer.record("capture", (t1 - t0) * 1000.0)
+                    self.timer.record("flip_convert", (time.perf_counter() - t1) * 1000.0)
+                self.out_queue.put(CapturedFrame(index, time.perf_counter(), frame, frame_rgb, slot))
+                index += 1
+        finally:
+            self.out_queue.close()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class InferenceWorker(threading.Thread):
+    """Runs MediaPipe Hands on the newest captured frame, skipping any it could not keep up with.
+
+    `scheduler` is an InferenceScheduler; frames it decides to skip are still passed
+    on (with results=None) so the preview keeps updating.
+    """
+
+    def __init__(self, scheduler, in_queue, out_queue, timer=None):
+        super().__init__(name="paw-inference", daemon=True)
+        self.scheduler = scheduler
+        self.timer = timer
+        self.in_queue = in_queue
+        self.out_queue = out_queue
+        self.processed = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                captured = self.in_queue.get(timeout=0.1)
+                if captured is None:
+                    if self.in_queue.closed:
+                        break
+                    continue
+                t0 = time.perf_counter()
+                results = self.scheduler.process(captured.rgb)
+                inference_ms = (time.perf_counter() - t0) * 1000.0
+                if results is not None:
+                    self.processed += 1
+                    if self.timer is not None:
+                        self.timer.record("hands_process", inference_ms)
+                self.out_queue.put(InferenceResult(captured, results, inference_ms))
+        finally:
+            self.out_queue.close()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class CapturePipeline:
+    """Capture thread + inference worker feeding a latest-wins result queue for the renderer.
+
+    The renderer calls poll() once per frame: it returns the newest InferenceResult
+    produced since the previous poll, or None if inference has not finished a new one.
+    poll_all() returns every result since the previous poll instead (up to result_backlog),
+    so the game logic sees each inference even when rendering falls behind.
+    Frames dropped by either queue go back to the capture ring; the renderer must release()
+    every result it polled once it no longer reads the frame's arrays.
+    """
+
+    def __init__(self, cap, scheduler, timer=None, result_backlog=4):
+        self.frame_queue = LatestQueue(maxsize=1, on_drop=self._release_frame)
+        # A few results of headroom so a slow render frame still hands every inference to the game
+        self.result_queue = LatestQueue(maxsize=result_backlog, on_drop=self.release)
+        # Enough ring slots for the frame queue, the worker, the result backlog, the frame being drawn and the
+        # one being captured; if the renderer holds more, capture allocates instead of overwriting them
+        self.capture_thread = CaptureThread(cap, self.frame_queue, timer, ring_slots=result_backlog + 4)
+        self.inference_worker = InferenceWorker(scheduler, self.frame_queue, self.result_queue, timer)
+
+    def start(self):
+        self.capture_thread.start()
+        self.inference_worker.start()
+
+    def poll(self):
+        return self.result_queue.get_nowait()
+
+    def poll_all(self):
+        """Every result that arrived since the last poll, oldest first."""
+        return self.result_queue.get_all_nowait()
+
+    def _release_frame(self, captured):
+        self.capture_thread.ring.release(captured.slot)
+
+    def release(self, result):
+        """The renderer is done with result's frame: its buffers can take a new capture."""
+        self.capture_thread.ring.release(result.frame.slot)
+
+    @property
+    def finished(self):
+        """True once the camera has stopped and every result has been consumed."""
+        return self.result_queue.closed
+
+    def stop(self):
+        self.capture_thread.stop()
+        self.inference_worker.stop()
+        self.capture_thread.join(timeout=1.0)
+        self.inference_worker.join(timeout=1.0)
+
+    def stats(self):
+        return {
+            "captured": self.frame_queue.put_count,
+            "inferred": self.inference_worker.processed,
+            "frames_dropped": self.frame_queue.dropped,
+            "results_dropped": self.result_queue.dropped,
+            "frame_age_ms": self.frame_queue.last_age * 1000.0,
+            "result_age_ms": self.result_queue.last_age * 1000.0,
+            "max_result_age_ms": self.result_queue.max_age * 1000.0,
+            "frame_buffers": self.capture_thread.ring.allocations,
+            "frame_fallbacks": self.capture_thread.ring.fallbacks,
+        }
+
+
+class SynchronousPipeline:
+    """CapturePipeline stand-in that captures and runs inference inline on the caller's thread.
+
+    Used by the headless benchmark: every frame of the source is processed (nothing
+    is dropped) and each stage is timed with the given StageTimer.
+    """
+
+    def __init__(self, cap, scheduler, timer):
+        self.cap = cap
+        self.scheduler = scheduler
+        self.timer = timer
+        self.captured = 0
+        self.inferred = 0
+        self._finished = False
+        self.ring = FrameRing(slots=2)
+
+    def start(self):
+        pass
+
+    def poll(self):
+        if self._finished:
+            return None
+        timer = self.timer
+        timer.start("capture")
+        slot = self.ring.acquire()
+        ret, frame = self.cap.read(self.ring.read_buffer(slot))
+        timer.stop("capture")
+        if not ret:
+            self.ring.release(slot)
+            self._finished = True
+            return None
+        timer.start("flip_convert")
+        frame, frame_rgb = self.ring.mirror_convert(frame, slot)
+        timer.stop("flip_convert")
+        captured = CapturedFrame(self.captured, time.perf_counter(), frame, frame_rgb, slot)
+        self.captured += 1
+        t0 = time.perf_counter()
+        results = self.scheduler.process(frame_rgb)
+        inference_ms = (time.perf_counter() - t0) * 1000.0
+        if results is not None:
+            # Frames the scheduler skipped are not counted as inference samples
+            timer.record("hands_process", inference_ms)
+            self.inferred += 1
+        return InferenceResult(captured, results, inference_ms)
+
+    def poll_all(self):
+        result = self.poll()
+        return [result] if result is not None else []
+
+    def release(self, result):
+        self.ring.release(result.frame.slot)
+
+    @property
+    def finished(self):
+        return self._finished
+
+    def stop(self):
+        pass
+
+    def stats(self):
+        return {"captured": self.captured, "inferred": self.inferred, "frames_dropped": 0, "results_dropped": 0,
+                "frame_buffers": self.ring.allocations, "frame_fallbacks": self.ring.fallbacks}
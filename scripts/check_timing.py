@@ -0,0 +1,124 @@
+"""Headless check that round timing doesn't depend on the render frame rate.
+
+Usage:
+    python scripts/check_timing.py [--rounds 20] [--infer-hz 30]
+
+Simulates the game loop without a window or camera: inference results arrive
+at a steady camera rate, while the render loop runs at 60 fps, 30 fps, 20 fps,
+with random jitter, or with periodic stalls (a loaded machine). Each rendered
+frame hands every inference that arrived since the previous frame to a
+GameSession (as Paw-Punch.py does with poll_all()) and calls update().
+
+For every load profile the mean countdown and reveal durations, the number of
+reveal vote samples and the background scroll distance are compared with the
+60 fps run; the reveal is also shown as it was with per-frame paw speeds.
+Exits with status 1 if a profile drifts by more than one frame interval.
+"""
+import argparse
+import math
+import random
+import sys
+
+from frame_clock import STEP_MS, FixedTimestep
+from game_session import GameSession
+
+PAW = {"cat_start_y": -50, "cat_target_y": 100, "cat_speed": 2.5}
+BG_SPEED = 0.25  # pixels per step, as in Paw-Punch.py
+
+
+# Render frame interval (ms) as a function of (rng, frame number)
+PROFILES = {
+    "60 fps": lambda rng, i: 1000.0 / 60.0,
+    "30 fps": lambda rng, i: 1000.0 / 30.0,
+    "20 fps": lambda rng, i: 50.0,
+    "jitter 5-60 ms": lambda rng, i: rng.uniform(5.0, 60.0),
+    "stalls (every 10th frame 120 ms)": lambda rng, i: 120.0 if i % 10 == 9 else 1000.0 / 60.0,
+}
+
+
+def simulate(interval, rounds, infer_hz, seed=0):
+    rng = random.Random(seed)
+    session = GameSession(rng=random.Random(seed), result_ms=1500, **PAW)
+    background_clock = FixedTimestep()
+    infer_ms = 1000.0 / infer_hz
+    now = 0.0
+    next_inference = 0.0
+    max_interval = 0.0
+    countdowns, reveals, samples = [], [], []
+    countdown_start = reveal_start = None
+    reveal_samples = 0
+    bg_distance = 0.0
+    frames = 0
+    while len(reveals) < rounds:
+        if now > rounds * 60000.0:
+            raise RuntimeError("rounds stopped starting")
+        step = interval(rng, frames)
+        frames += 1
+        max_interval = max(max_interval, step)
+        now += step
+        now_ms = int(now)
+        while next_inference <= now:
+            # The player holds up a rock: it starts the round and is shown during the reveal.
+            # While the result is shown the hand is lowered, which re-arms the start trigger.
+            if session.revealing:
+                reveal_samples += 1
+            hands = [] if session.show_result else ["rock"]
+            session.on_inference(hands, now_ms, positions=[(0.5, 0.5)] * len(hands))
+            next_inference += infer_ms
+        was_counting = session.counting_down
+        if countdown_start is None and was_counting:
+            countdown_start = session.countdown_start
+        finished = session.update(now_ms)
+        if was_counting and session.revealing:
+            countdowns.append(now_ms - countdown_start)
+            reveal_start = now_ms
+            reveal_samples = 0
+        if finished:
+            reveals.append(now_ms - reveal_start)
+            samples.append(reveal_samples)
+            countdown_start = None
+        bg_distance += BG_SPEED * background_clock.advance(now_ms)
+
+    def mean(xs):
+        return sum(xs) / len(xs)
+
+    return {"countdown_ms": mean(countdowns), "reveal_ms": mean(reveals), "samples": mean(samples),
+            "bg_px_per_s": bg_distance / (now / 1000.0), "max_interval": max_interval,
+            "mean_interval": now / frames}
+
+
+def legacy_reveal_ms(mean_interval_ms):
+    """Reveal duration when the paw moved cat_speed pixels per rendered frame."""
+    frames = math.ceil((PAW["cat_target_y"] - PAW["cat_start_y"]) / PAW["cat_speed"])
+    return frames * mean_interval_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--infer-hz", type=float, default=30.0)
+    args = parser.parse_args()
+
+    base = None
+    failed = False
+    print("%-34s %10s %10s %8s %10s %14s" % ("render load", "countdown", "reveal", "samples", "bg px/s",
+                                             "old reveal"))
+    for name, interval in PROFILES.items():
+        r = simulate(interval, args.rounds, args.infer_hz)
+        base = base or r
+        # Update only runs once per rendered frame, so durations may differ by up to one frame
+        tolerance = r["max_interval"] + STEP_MS
+        sample_tolerance = math.ceil(r["max_interval"] * args.infer_hz / 1000.0) + 1
+        ok = abs(r["countdown_ms"] - base["countdown_ms"]) <= tolerance and \
+            abs(r["reveal_ms"] - base["reveal_ms"]) <= tolerance and \
+            abs(r["samples"] - base["samples"]) <= sample_tolerance and \
+            abs(r["bg_px_per_s"] - base["bg_px_per_s"]) <= 0.05 * base["bg_px_per_s"]
+        failed |= not ok
+        print("%-34s %8.0fms %8.0fms %8.1f %10.2f %12.0fms  %s" % (
+            name, r["countdown_ms"], r["reveal_ms"], r["samples"], r["bg_px_per_s"],
+            legacy_reveal_ms(r["mean_interval"]), "ok" if ok else "DRIFT"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
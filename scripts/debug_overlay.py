@@ -0,0 +1,100 @@
+"""Debug overlay for the camera preview: hand skeletons, finger states and the start buffer.
+
+Everything is drawn with pygame vector primitives straight onto the small
+preview surface (CameraPreview), after the frame has been downscaled. The
+inference frame is never written to and nothing is drawn at camera resolution,
+so the cost depends on the preview size and the number of hands only.
+
+Per hand: the 21 landmarks and their connections, fingertips green (open) or
+red (closed) by the same finger_states() rules the classifier uses, and a row
+of T I M R P labels in the same colors. Along the bottom: the start trigger's
+current buffer (R / P / S, "-" for no gesture). Label surfaces are rendered
+once per (text, color) and reused.
+"""
+import time
+
+import numpy as np
+import pygame
+
+from gesture_classifier import FINGER_TIPS, THRESH_THUMB_X, THRESH_Y, THUMB_TIP, finger_states
+
+# Landmark chains that make up MediaPipe's HAND_CONNECTIONS (kept here so this module doesn't need mediapipe)
+HAND_CHAINS = ((0, 1, 2, 3, 4), (0, 5, 6, 7, 8), (9, 10, 11, 12), (13, 14, 15, 16), (0, 17, 18, 19, 20),
+               (5, 9, 13, 17))
+TIPS = (THUMB_TIP,) + tuple(int(i) for i in FINGER_TIPS)  # in finger_states() column order
+FINGER_LABELS = "TIMRP"
+GESTURE_LETTERS = {"rock": "R", "paper": "P", "scissors": "S"}
+
+# The preview buffer is RGB, so these are plain RGB colors (mp_drawing's BGR styles came out swapped)
+CONNECTION_COLOR = (255, 255, 255)
+JOINT_COLOR = (255, 182, 193)
+OPEN_COLOR = (80, 220, 100)
+CLOSED_COLOR = (235, 70, 70)
+BUFFER_COLOR = (255, 255, 255)
+
+
+class HandOverlay:
+    """Draws hands + finger states + start buffer onto a preview-sized surface; labels are cached."""
+
+    def __init__(self):
+        self._font = None
+        self._font_size = None
+        self._labels = {}  # (text, color) -> surface, for the current font size
+        self.frames = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+
+    def _label(self, text, color):
+        surf = self._labels.get((text, color))
+        if surf is None:
+            surf = self._font.render(text, True, color)
+            self._labels[(text, color)] = surf
+        return surf
+
+    def _fit_font(self, height):
+        size = max(10, height // 9)
+        if size != self._font_size:
+            # Preview size changed (window size or runtime profile): styles are rebuilt once
+            self._font = pygame.font.Font(None, size)
+            self._font_size = size
+            self._labels.clear()
+
+    def draw(self, surface, landmarks, handedness, start_buffer=(), thresh_y=THRESH_Y,
+             thresh_thumb_x=THRESH_THUMB_X):
+        """landmarks: (N, 21, 3) normalized; handedness: (N,) codes; start_buffer: recent gesture names."""
+        t0 = time.perf_counter()
+        w, h = surface.get_size()
+        self._fit_font(h)
+        line_w = max(1, w // 160)
+        radius = max(1, w // 100)
+        tip_radius = radius + 1
+        label_w = self._font_size * 2 // 3
+
+        if len(landmarks):
+            states = finger_states(landmarks, handedness, thresh_y, thresh_thumb_x).tolist()
+            # One conversion to integer preview pixels for every hand
+            points = (np.asarray(landmarks)[:, :, :2] * (w, h)).astype(np.int32).tolist()
+            for row, (hand, fingers) in enumerate(zip(points, states)):
+                for chain in HAND_CHAINS:
+                    pygame.draw.lines(surface, CONNECTION_COLOR, False, [hand[i] for i in chain], line_w)
+                for point in hand:
+                    pygame.draw.circle(surface, JOINT_COLOR, point, radius)
+                for tip, is_open in zip(TIPS, fingers):
+                    pygame.draw.circle(surface, OPEN_COLOR if is_open else CLOSED_COLOR, hand[tip], tip_radius)
+                # One row of finger labels per hand, top-left
+                y = 2 + row * self._font_size
+                for i, (letter, is_open) in enumerate(zip(FINGER_LABELS, fingers)):
+                    surface.blit(self._label(letter, OPEN_COLOR if is_open else CLOSED_COLOR), (2 + i * label_w, y))
+
+        if start_buffer:
+            y = h - self._font_size
+            for i, gesture in enumerate(start_buffer):
+                surface.blit(self._label(GESTURE_LETTERS.get(gesture, "-"), BUFFER_COLOR), (2 + i * label_w, y))
+
+        self.last_ms = (time.perf_counter() - t0) * 1000.0
+        self.total_ms += self.last_ms
+        self.frames += 1
+
+    def stats(self):
+        return {"frames": self.frames, "mean_ms": self.total_ms / self.frames if self.frames else 0.0,
+                "cached_labels": len(self._labels)}
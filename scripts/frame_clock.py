@@ -0,0 +1,47 @@
+"""Fixed-timestep animation clock.
+
+Animations (the cat paw reveal, the background scroll) advance in whole steps
+of STEP_MS (60 Hz) however often the caller renders. A slow frame runs several
+steps, a fast frame may run none, so an animation takes the same wall time at
+20 fps and at 144 fps. Speeds are in pixels per step.
+
+The original game moved things once per rendered frame at clock.tick(30): paw
+5 px and background 0.5 / 0.25 px per frame. At the 60 Hz step those speeds
+are halved (paw 2.5, background 0.25 / 0.125 px per step), so motion is as
+fast as it was at 30 fps.
+"""
+STEP_MS = 1000.0 / 60.0
+
+
+class FixedTimestep:
+    """Accumulates elapsed milliseconds and hands them out as whole fixed steps."""
+
+    def __init__(self, step_ms=STEP_MS, max_steps=30):
+        self.step_ms = step_ms
+        # Cap per call so a long stall (debugger, suspended laptop) doesn't fast-forward whole animations
+        self.max_steps = max_steps
+        self.last_ms = None
+        self.accumulator = 0.0
+
+    def reset(self, now_ms):
+        self.last_ms = now_ms
+        self.accumulator = 0.0
+
+    def advance(self, now_ms):
+        """Number of fixed steps to run for the time elapsed since the previous call."""
+        if self.last_ms is None:
+            self.reset(now_ms)
+            return 0
+        self.accumulator += max(0.0, now_ms - self.last_ms)
+        self.last_ms = now_ms
+        steps = int(self.accumulator // self.step_ms)
+        self.accumulator -= steps * self.step_ms
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction of a step accumulated but not yet run (for interpolating between steps)."""
+        return self.accumulator / self.step_ms
@@ -0,0 +1,193 @@
+"""Frame sources for Paw-Punch: a live camera, a recorded video file, a directory of frames or synthetic frames.
+
+Every source follows the small part of the cv2.VideoCapture API the game uses
+(isOpened / read / release), so the rest of the code does not care where frames come from.
+read() takes an optional `image` buffer like cv2.VideoCapture.read: sources that can
+decode into it do, so the capture thread can reuse preallocated buffers (see
+capture_pipeline.FrameRing).
+"""
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+# Pixel formats a USB camera commonly offers: MJPG streams high resolutions at full frame rate
+# (decoded on the CPU), YUYV is uncompressed and limited by USB bandwidth
+CAMERA_FORMATS = ("MJPG", "YUYV")
+
+
+class FrameDirectorySource:
+    """cv2.VideoCapture look-alike that returns the images in a directory in file-name order."""
+
+    def __init__(self, path):
+        self.path = path
+        self.paths = sorted(os.path.join(path, name) for name in os.listdir(path)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        self._pos = 0
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    def read(self, image=None):
+        if self._pos >= len(self.paths):
+            return False, None
+        frame = cv2.imread(self.paths[self._pos])
+        self._pos += 1
+        if frame is None:
+            return False, None
+        return True, frame
+
+    def release(self):
+        self._pos = len(self.paths)
+
+
+class SyntheticSource:
+    """Generated frames (gradient background with a moving disc) for tests and capture benchmarks.
+
+    fps paces read() like a camera would (0 = as fast as possible); frames = 0 never ends.
+    """
+
+    def __init__(self, width=640, height=480, fps=0.0, frames=0):
+        self.width, self.height = width, height
+        self.fps = fps
+        self.frames = frames
+        self._index = 0
+        self._released = False
+        self._next_time = None
+        x = np.linspace(0, 255, width, dtype=np.float32)
+        y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+        self._background = np.dstack([np.broadcast_to(x, (height, width)), np.broadcast_to(y, (height, width)),
+                                      np.full((height, width), 96.0, np.float32)]).astype(np.uint8)
+
+    def isOpened(self):
+        return not self._released
+
+    def read(self, image=None):
+        if self._released or (self.frames and self._index >= self.frames):
+            return False, None
+        if self.fps:
+            now = time.perf_counter()
+            self._next_time = max(self._next_time or now, now - 1.0 / self.fps)
+            if self._next_time > now:
+                time.sleep(self._next_time - now)
+            self._next_time += 1.0 / self.fps
+        if image is None or image.shape != self._background.shape:
+            image = np.empty_like(self._background)
+        np.copyto(image, self._background)
+        t = self._index / 30.0
+        center = (int(self.width * (0.5 + 0.35 * np.cos(t))), int(self.height * (0.5 + 0.35 * np.sin(1.3 * t))))
+        cv2.circle(image, center, max(8, self.height // 10), (40, 200, 255), -1)
+        self._index += 1
+        return True, image
+
+    def release(self):
+        self._released = True
+
+
+class CameraSource:
+    """A camera device opened with explicit resolution / FPS / pixel format / buffer settings.
+
+    Settings left as None keep the driver default. When the camera stops delivering
+    frames (unplugged, driver hiccup) read() reopens it, waiting backoff_s, then twice
+    as long up to max_backoff_s between attempts, instead of ending the game;
+    release() from another thread cancels the wait.
+    """
+
+    def __init__(self, index, width=None, height=None, fps=None, fourcc=None, buffer_size=None,
+                 reconnect=True, backoff_s=0.5, max_backoff_s=8.0, api=cv2.CAP_ANY):
+        self.index = index
+        self.width, self.height, self.fps = width, height, fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+        self.reconnect = reconnect
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.api = api
+        self.reconnects = 0
+        self.failed_reads = 0
+        self.actual = {}
+        self._released = threading.Event()
+        self.cap = None
+        self._open()
+
+    def _open(self):
+        if self.cap is not None:
+            self.cap.release()
+        cap = cv2.VideoCapture(self.index, self.api)
+        # The pixel format goes first: some V4L2 drivers only offer large sizes for MJPG
+        if self.fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        if self.width and self.height:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            cap.set(cv2.CAP_PROP_FPS, self.fps)
+        if self.buffer_size is not None:
+            # A short driver queue means read() returns a recent frame, not one from seconds ago
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        self.cap = cap
+        if cap.isOpened():
+            code = int(cap.get(cv2.CAP_PROP_FOURCC))
+            self.actual = {"width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                           "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                           "fps": cap.get(cv2.CAP_PROP_FPS),
+                           "fourcc": "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\0"),
+                           "backend": cap.getBackendName()}
+        return cap.isOpened()
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self, image=None):
+        ret, frame = self.cap.read(image)
+        if ret or not self.reconnect:
+            return ret, frame
+        self.failed_reads += 1
+        delay = self.backoff_s
+        while not self._released.is_set():
+            if self._open():
+                ret, frame = self.cap.read(image)
+                if ret:
+                    self.reconnects += 1
+                    return ret, frame
+            # Cancelled early by release()
+            if self._released.wait(delay):
+                break
+            delay = min(delay * 2, self.max_backoff_s)
+        return False, None
+
+    def release(self):
+        self._released.set()
+        self.cap.release()
+
+    def stats(self):
+        return dict(self.actual, reconnects=self.reconnects, failed_reads=self.failed_reads)
+
+
+def parse_synthetic(spec):
+    """"synthetic", "synthetic:1280x720" or "synthetic:1280x720@30" -> SyntheticSource kwargs."""
+    _, _, params = spec.partition(":")
+    size, _, fps = params.partition("@")
+    kwargs = {"fps": float(fps)} if fps else {}
+    if size:
+        w, _, h = size.lower().partition("x")
+        kwargs.update(width=int(w), height=int(h))
+    return kwargs
+
+
+def open_source(spec, width=None, height=None, fps=None, fourcc=None, buffer_size=None, reconnect=True):
+    """Open a camera index (e.g. "0"), "synthetic[:WxH[@FPS]]", a video file, or a directory of frames.
+
+    The resolution / fps / fourcc / buffer_size settings apply to cameras only.
+    """
+    spec = str(spec)
+    if spec.isdigit():
+        return CameraSource(int(spec), width, height, fps, fourcc, buffer_size, reconnect=reconnect)
+    if spec == "synthetic" or spec.startswith("synthetic:"):
+        return SyntheticSource(**parse_synthetic(spec))
+    if os.path.isdir(spec):
+        return FrameDirectorySource(spec)
+    return cv2.VideoCapture(spec)
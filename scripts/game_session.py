@@ -0,0 +1,268 @@
+"""Per-station Paw-Punch game state.
+
+GameSession holds everything one station needs to play rounds: the start
+trigger, countdown, cat paw reveal, the reveal vote and the result.
+It has no pygame or camera dependencies, so several sessions can run side by
+side in one process (see arena.py); the window in Paw-Punch.py drives one.
+The phases themselves and the cat's move come from round_engine.RoundEngine;
+GameSession adds gesture input and the paw animation on top.
+
+Times are integer milliseconds supplied by the caller (pygame.time.get_ticks()
+in the game, a monotonic clock in the arena).
+"""
+import random
+from collections import deque
+
+import numpy as np
+
+from frame_clock import FixedTimestep
+from gesture_smoothing import GestureVote, HandSmoother
+from round_engine import GESTURES, PHASES, RoundEngine, determine_result  # noqa: F401 (re-exported)
+
+# At the reveal, hands with a palm this much smaller than the player's at the start are someone else's
+PLAYER_SIZE_SHARE = 0.7
+
+
+class GameSession:
+    """One station's round state machine.
+
+    Per frame the caller does:
+        if a new inference result arrived: session.on_inference(gestures_per_hand, now_ms)
+        finished = session.update(now_ms)   # result text when a round just ended, else None
+    and draws from the public attributes (counting_down, revealing, show_result,
+    current_hand, cat_hand_y, player_gesture, result_text ...).
+    """
+
+    def __init__(self, station_id=0, cat_start_y=-50, cat_target_y=0, cat_speed=2.5,
+                 countdown=3, result_ms=5000, start_frames=3, reveal_frames=5, rng=None,
+                 smoother=None, reveal_half_life=2.0, reveal_share=0.75, reveal_min_weight=1.5,
+                 reveal_speedup=3.0, strategy="uniform"):
+        self.station_id = station_id
+        self.rng = rng or random.Random()
+        # Phases, timing and the cat's move (strategy: "uniform", "frequency", "markov" or a strategy object)
+        self.engine = RoundEngine(strategy, countdown=countdown, result_ms=result_ms,
+                                  rng=np.random.default_rng(self.rng.getrandbits(64)))
+        # Cat paw animation geometry (pixels; speed is per fixed 60 Hz step, see frame_clock.py)
+        self.cat_start_y = cat_start_y
+        self.cat_target_y = cat_target_y
+        self.cat_speed = cat_speed
+        self.countdown = countdown
+        self.result_ms = result_ms
+
+        self.current_hand = "paper"  # cat paw currently displayed
+        self.player_gesture = None
+        self.cat_hand_y = cat_start_y
+        # Paw motion advances in fixed time steps, so the reveal lasts equally long at any frame rate
+        self.paw_clock = FixedTimestep()
+
+        # Whether the player has triggered the round (previously fist/rock, now paper allowed)
+        self.start_triggered = False
+        # Per-hand tracks with smoothed votes; the start trigger fires per hand (see gesture_smoothing.py)
+        self.smoother = smoother or HandSmoother(start_min_frames=start_frames)
+        # Track id of the hand that started the round; its gestures decide the reveal
+        self.player_track = None
+        self.player_position = None  # where that hand was last seen (to pick it up again if its track drops)
+        self.player_size = 0.0  # its palm size at the start
+        self.player_found = False  # confirmed (or picked again) at the first reveal inference that shows it
+        # Reveal vote: once it is decided the paw finishes its reveal reveal_speedup times faster
+        self.reveal_vote = GestureVote(reveal_half_life)
+        self.reveal_share = reveal_share
+        self.reveal_min_weight = reveal_min_weight
+        self.reveal_speedup = reveal_speedup
+        self.reveal_decision = None
+        # Recent raw gestures (start: the hand closest to starting, reveal: player's hand), for traces and debugging
+        self.start_buffer = deque(maxlen=start_frames)
+        self.final_gesture_buffer = deque(maxlen=reveal_frames)
+        # Gestures of the most recent inference, every hand in MediaPipe's order
+        self.last_gestures = []
+
+    # Phase flags, derived from the round engine
+    @property
+    def phase(self):
+        return self.engine.phase
+
+    @property
+    def counting_down(self):
+        return self.engine.phase == "countdown"
+
+    @property
+    def revealing(self):
+        # cat paw is extending animation
+        return self.engine.phase == "reveal"
+
+    @property
+    def show_result(self):
+        return self.engine.phase == "result"
+
+    @property
+    def countdown_start(self):
+        return self.engine.phase_start if self.counting_down else 0
+
+    @property
+    def cat_gesture(self):
+        return self.engine.cat_gesture
+
+    @property
+    def result_text(self):
+        return self.engine.result_text
+
+    @property
+    def rounds_played(self):
+        return len(self.engine.history)
+
+    def configure(self, start_frames=None, reveal_frames=None, reveal_half_life=None, reveal_share=None,
+                  reveal_min_weight=None, cat_speed=None):
+        """Change tuning while running (runtime_config hot reload); None leaves a setting as it is."""
+        if start_frames is not None:
+            self.smoother.start_min_frames = start_frames
+            self.start_buffer = deque(self.start_buffer, maxlen=start_frames)
+        if reveal_frames is not None:
+            self.final_gesture_buffer = deque(self.final_gesture_buffer, maxlen=reveal_frames)
+        if reveal_half_life is not None:
+            self.reveal_vote.set_half_life(reveal_half_life)
+        if reveal_share is not None:
+            self.reveal_share = reveal_share
+        if reveal_min_weight is not None:
+            self.reveal_min_weight = reveal_min_weight
+        if cat_speed is not None:
+            self.cat_speed = cat_speed
+
+    def countdown_remaining(self, now_ms):
+        return self.engine.countdown_remaining(now_ms)
+
+    def on_inference(self, hand_gestures, now_ms, confidences=None, positions=None, landmarks=None):
+        """Feed the gestures ('rock'/'paper'/'scissors'/None per detected hand) of one fresh inference.
+
+        confidences (per hand, default 1.0) weight the votes; landmarks ((N, 21, 3) per hand) or
+        positions (normalized wrist x, y per hand) keep each hand on its own track between inferences.
+        """
+        self.last_gestures = list(hand_gestures)
+        # Only an idle station can be started (a trigger during the reveal used to restart the countdown)
+        can_start = self.engine.phase == "idle"
+        track_ids = self.smoother.update(hand_gestures, confidences, positions, allow_start=can_start,
+                                         landmarks=landmarks)
+        if not hand_gestures:
+            return
+        if can_start:
+            # The hand closest to starting a round, not whichever one MediaPipe listed first
+            self.start_buffer.append(hand_gestures[track_ids.index(self.smoother.start_candidate(track_ids))])
+            started = self.smoother.take_start()
+            if started is not None and self.engine.start(now_ms):
+                # The triggering hand's smoothed vote is the player's gesture until the reveal decides
+                self.player_gesture = self.smoother.leader(started)[0] or "paper"
+                self.player_track = started
+                self.player_position = self.smoother.position(started)
+                self.player_size = self.smoother.size(started)
+                self.player_found = False
+                self.start_triggered = True
+                self.start_buffer.clear()
+                # Clear the reveal vote to prepare for the next collection
+                self.final_gesture_buffer.clear()
+                self.reveal_vote.clear()
+                self.reveal_decision = None
+        # During revealing, vote over the player's hand only; a frame without it counts as no decision
+        elif self.revealing:
+            if not self.player_found:
+                if self.player_track in track_ids:
+                    # The track that started the round survived the countdown: it is the player's hand
+                    self.player_found = True
+                else:
+                    # Its track expired (no inference during the countdown): pick the player's hand again by
+                    # the rule that picked it at the start (nearest the station), among hands about as near
+                    near = [t for t in track_ids if self.smoother.size(t) >= self.player_size * PLAYER_SIZE_SHARE]
+                    if near:
+                        self.player_track = self.smoother.primary(near)
+                        self.player_found = True
+            elif self.player_track not in track_ids:
+                self._reacquire_player(track_ids)
+            if self.player_track in track_ids:
+                i = track_ids.index(self.player_track)
+                gesture = hand_gestures[i]
+                confidence = 1.0 if confidences is None else confidences[i]
+                self.player_position = self.smoother.position(self.player_track)
+            else:
+                gesture, confidence = None, 0.0
+            self.reveal_vote.add(gesture, confidence)
+            self.final_gesture_buffer.append(gesture)
+            if self.reveal_decision is None:
+                self.reveal_decision = self.reveal_vote.decided(self.reveal_share, self.reveal_min_weight)
+
+    def focus_position(self):
+        """Where the hand that matters is (normalized x, y), for the inference crop; None = no preference.
+
+        Idle: the hand that would start a round. Countdown / reveal: the player's hand where it was
+        last seen. Result: nothing reads landmarks.
+        """
+        if self.engine.phase == "idle":
+            tracker = self.smoother.tracker
+            primary = self.smoother.primary([tracker.ids[s] for s in tracker.active_slots()])
+            return None if primary is None else self.smoother.position(primary)
+        if self.counting_down or self.revealing:
+            return self.player_position
+        return None
+
+    def _reacquire_player(self, track_ids):
+        """The player's hand wasn't matched during the reveal: adopt a hand that only just appeared near
+        where the player's was last seen. Hands that were already being tracked (bystanders) never are."""
+        if self.player_position is None:
+            return
+        px, py = self.player_position
+        best, best_d = None, self.smoother.tracker.match_distance * 2
+        for tid in track_ids:
+            if self.smoother.age(tid) != 1:
+                continue
+            x, y = self.smoother.position(tid)
+            d = ((x - px) ** 2 + (y - py) ** 2) ** 0.5
+            if d <= best_d:
+                best, best_d = tid, d
+        if best is not None:
+            self.player_track = best
+
+    def update(self, now_ms):
+        """Advance countdown / reveal / result timers. Returns the result text when a round ends."""
+        finished = None
+        entered = self.engine.tick(now_ms)
+        # Countdown finished: the cat has picked its move, start the paw reveal animation
+        if entered == "reveal":
+            self.current_hand = self.engine.cat_gesture
+            self.paw_clock.reset(now_ms)
+
+        # Cat paw reveal animation (runs while revealing)
+        if self.revealing:
+            for _ in range(self.paw_clock.advance(now_ms)):
+                if self.cat_hand_y >= self.cat_target_y:
+                    break
+                # Player's gesture already decided: no need to keep sampling, finish the paw quickly
+                self.cat_hand_y += self.cat_speed * (self.reveal_speedup if self.reveal_decision else 1.0)
+            # If reaches or passes target, finalize reveal and decide result
+            if self.cat_hand_y >= self.cat_target_y:
+                self.cat_hand_y = self.cat_target_y
+                finished = self._finish_round(now_ms)
+
+        # Result was shown for result_ms; the next round needs a new trigger
+        elif entered == "idle":
+            self.reset_round()
+        return finished
+
+    def _finish_round(self, now_ms):
+        # Use the reveal vote over the player's hand first, fall back to the triggered gesture
+        # (another hand's latest detection is never used: it may be a bystander's)
+        final_player_gesture = self.reveal_decision or self.reveal_vote.leader()[0] or self.player_gesture
+        # Clear the vote for next round
+        self.final_gesture_buffer.clear()
+        self.reveal_vote.clear()
+        self.reveal_decision = None
+        self.player_gesture = final_player_gesture
+        # Next round requires retriggering
+        self.start_triggered = False
+        # Show result after reveal
+        return self.engine.finish(final_player_gesture, now_ms)
+
+    def reset_round(self):
+        self.player_gesture = None
+        self.player_track = None
+        self.player_position = None
+        self.current_hand = self.rng.choice(GESTURES)
+        self.cat_hand_y = self.cat_start_y
+        # require player to trigger the next round again
+        self.start_triggered = False
@@ -0,0 +1,249 @@
+"""Vectorized rock / paper / scissors classifier over MediaPipe hand landmarks.
+
+Each hand's 21 landmarks are copied once into a (21, 3) float32 array
+(x, y, z in MediaPipe's normalized image coordinates). All finger tests then
+run as NumPy array operations, and classify_batch() handles any number of
+hands (or frames) in a single call: traces, corpora and training data. For the
+few hands of a live frame the NumPy call overhead outweighs the work, so up to
+SCALAR_MAX_HANDS hands go through the same rules in plain Python instead, on
+the dozen coordinates the rules read, unpacked straight from the array's
+memory (same results, bit for bit).
+
+The thresholds below are the ones to tweak when recognition feels unstable.
+"""
+import struct
+
+import numpy as np
+
+# Thresholds (empirical, tweakable)
+THRESH_Y = 0.04  # TIP above PIP by this amount => finger considered extended
+THRESH_THUMB_X = 0.03  # thumb x-axis difference threshold
+
+# MediaPipe HandLandmark indices (kept here so this module doesn't need mediapipe)
+NUM_LANDMARKS = 21
+WRIST = 0
+THUMB_IP, THUMB_TIP = 3, 4
+FINGER_PIPS = np.array([6, 10, 14, 18])  # index, middle, ring, pinky
+FINGER_TIPS = np.array([8, 12, 16, 20])
+
+# Integer gesture codes used by the array APIs
+GESTURES = ("rock", "paper", "scissors")
+NO_GESTURE = -1
+ROCK, PAPER, SCISSORS = 0, 1, 2
+GESTURE_CODES = {name: code for code, name in enumerate(GESTURES)}
+
+# Handedness codes: MediaPipe "Right" / "Left", or 0 when unknown
+HAND_RIGHT, HAND_LEFT, HAND_UNKNOWN = 1, -1, 0
+
+# Batches up to this size are classified with the scalar rules (faster below ~32 hands, bench_classifier.py)
+SCALAR_MAX_HANDS = 16
+
+
+def gesture_name(code):
+    """Integer code -> 'rock' / 'paper' / 'scissors' / None."""
+    code = int(code)
+    return GESTURES[code] if 0 <= code < len(GESTURES) else None
+
+
+def handedness_code(hand_label):
+    if hand_label == 'Right':
+        return HAND_RIGHT
+    if hand_label == 'Left':
+        return HAND_LEFT
+    return HAND_UNKNOWN
+
+
+def handedness_label(hand_handedness):
+    """MediaPipe handedness classification -> 'Left' / 'Right' / None."""
+    try:
+        return hand_handedness.classification[0].label
+    except Exception:
+        return None
+
+
+def landmarks_to_array(hand_landmarks):
+    """Copy one MediaPipe NormalizedLandmarkList into a (21, 3) float32 array."""
+    return np.array([(p.x, p.y, p.z) for p in hand_landmarks.landmark], dtype=np.float32)
+
+
+def results_to_arrays(results):
+    """All hands of a hands.process() result -> (landmarks (N, 21, 3) float32, handedness (N,) int8)."""
+    hand_list = results.multi_hand_landmarks if results is not None else None
+    if not hand_list:
+        return np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32), np.zeros(0, dtype=np.int8)
+    handedness_list = results.multi_handedness or [None] * len(hand_list)
+    landmarks = np.array([[(p.x, p.y, p.z) for p in hand.landmark] for hand in hand_list], dtype=np.float32)
+    handedness = np.array([handedness_code(handedness_label(h)) for h in handedness_list], dtype=np.int8)
+    return landmarks, handedness
+
+
+def finger_states(landmarks, handedness, thresh_y=THRESH_Y, thresh_thumb_x=THRESH_THUMB_X):
+    """Per-finger open flags for a batch of hands.
+
+    landmarks: (N, 21, 3) or (21, 3); handedness: (N,) codes or a scalar.
+    Returns a bool array (N, 5): thumb, index, middle, ring, pinky.
+    """
+    # float64 so the comparisons match plain Python float arithmetic exactly
+    lm = np.asarray(landmarks, dtype=np.float64).reshape(-1, NUM_LANDMARKS, 3)
+    hand = np.broadcast_to(np.asarray(handedness).reshape(-1), (lm.shape[0],))
+    states = np.empty((lm.shape[0], 5), dtype=bool)
+
+    # For the other four fingers: PIP.y - TIP.y > THRESH_Y indicates extended
+    states[:, 1:] = (lm[:, FINGER_PIPS, 1] - lm[:, FINGER_TIPS, 1]) > thresh_y
+
+    # Thumb: x-axis difference checked in the direction given by handedness;
+    # when handedness is unknown either the x or the y difference may indicate open
+    thumb_dx = lm[:, THUMB_TIP, 0] - lm[:, THUMB_IP, 0]
+    thumb_dy = lm[:, THUMB_IP, 1] - lm[:, THUMB_TIP, 1]
+    unknown_open = (np.abs(thumb_dx) > thresh_thumb_x) | (thumb_dy > thresh_y)
+    states[:, 0] = np.where(hand == HAND_RIGHT, thumb_dx > thresh_thumb_x,
+                            np.where(hand == HAND_LEFT, thumb_dx < -thresh_thumb_x, unknown_open))
+    return states
+
+
+def classify_states(states):
+    """(N, 5) finger flags -> (N,) int8 gesture codes (NO_GESTURE when uncertain)."""
+    open_count = states.sum(axis=1)
+    index, middle, ring, pinky = states[:, 1], states[:, 2], states[:, 3], states[:, 4]
+    codes = np.full(states.shape[0], NO_GESTURE, dtype=np.int8)
+    # Rock: no fingers clearly extended
+    codes[open_count == 0] = ROCK
+    # Scissors: index and middle fingers extended, others bent (thumb can be any state)
+    codes[index & middle & ~ring & ~pinky] = SCISSORS
+    # Paper: majority of fingers (>=4) extended; takes priority over the rules above
+    codes[open_count >= 4] = PAPER
+    return codes
+
+
+# The coordinates the rules read, as (landmark, axis), in the order they lie in a hand's
+# flattened (21 * dims) row: thumb IP x, y, thumb TIP x, y, then PIP y / TIP y per finger
+_RULE_POINTS = ((THUMB_IP, 0), (THUMB_IP, 1), (THUMB_TIP, 0), (THUMB_TIP, 1),
+                (6, 1), (8, 1), (10, 1), (12, 1), (14, 1), (16, 1), (18, 1), (20, 1))
+_FLOAT_TYPES = (np.dtype(np.float32), np.dtype(np.float64))
+
+
+def _rule_struct(dtype, dims, n):
+    """struct that unpacks _RULE_POINTS of n hands straight from a C-contiguous landmarks buffer."""
+    size = dtype.itemsize
+    fmt, pos = "=", 0
+    for h in range(n):
+        for p, axis in _RULE_POINTS:
+            offset = (h * NUM_LANDMARKS * dims + p * dims + axis) * size
+            fmt += "%dx%s" % (offset - pos, dtype.char) if offset > pos else dtype.char
+            pos = offset + size
+    return struct.Struct(fmt)
+
+
+# Per (dtype, coordinates per landmark, hands) of the batches classify_batch handles in plain Python
+_RULE_STRUCTS = {(dtype, dims, n): _rule_struct(dtype, dims, n)
+                 for dtype in _FLOAT_TYPES for dims in (2, 3) for n in range(1, SCALAR_MAX_HANDS + 1)}
+
+
+def _classify_values(values, hand, thresh_y, thresh_thumb_x):
+    """Scalar rules for one hand, from its _RULE_POINTS coordinates (floats) and handedness code."""
+    thumb_ip_x, thumb_ip_y, thumb_tip_x, thumb_tip_y, pip1, tip1, pip2, tip2, pip3, tip3, pip4, tip4 = values
+    index = pip1 - tip1 > thresh_y
+    middle = pip2 - tip2 > thresh_y
+    ring = pip3 - tip3 > thresh_y
+    pinky = pip4 - tip4 > thresh_y
+    thumb_dx = thumb_tip_x - thumb_ip_x
+    if hand == HAND_RIGHT:
+        thumb = thumb_dx > thresh_thumb_x
+    elif hand == HAND_LEFT:
+        thumb = thumb_dx < -thresh_thumb_x
+    else:
+        thumb = abs(thumb_dx) > thresh_thumb_x or thumb_ip_y - thumb_tip_y > thresh_y
+    open_count = thumb + index + middle + ring + pinky
+    if open_count >= 4:
+        return PAPER
+    if index and middle and not ring and not pinky:
+        return SCISSORS
+    if open_count == 0:
+        return ROCK
+    return NO_GESTURE
+
+
+def classify_batch(landmarks, handedness, thresh_y=THRESH_Y, thresh_thumb_x=THRESH_THUMB_X):
+    """Classify N hands in one call: (N, 21, 3) landmarks + (N,) handedness -> (N,) int8 codes."""
+    lm = np.asarray(landmarks)
+    if lm.size <= SCALAR_MAX_HANDS * NUM_LANDMARKS * 3:
+        # The 12 coordinates per hand the rules read, unpacked straight from the array's memory as Python
+        # floats (no NumPy temporaries), then plain Python rules
+        if lm.dtype not in _FLOAT_TYPES or not lm.flags.c_contiguous:
+            lm = np.ascontiguousarray(lm, dtype=np.float64)
+        dims = lm.shape[-1]
+        n = lm.size // (NUM_LANDMARKS * dims)
+        out = np.empty(n, dtype=np.int8)
+        if n:
+            values = _RULE_STRUCTS[lm.dtype, dims, n].unpack_from(lm)
+            if isinstance(handedness, np.ndarray) and handedness.ndim:
+                hands = handedness.tolist()
+            else:
+                hands = np.asarray(handedness).tolist() if np.ndim(handedness) else [int(handedness)] * n
+            if n == 1:
+                out[0] = _classify_values(values, hands[0], thresh_y, thresh_thumb_x)
+            else:
+                k = len(_RULE_POINTS)
+                for i in range(n):
+                    out[i] = _classify_values(values[i * k:i * k + k], hands[i], thresh_y, thresh_thumb_x)
+        return out
+    return classify_states(finger_states(lm, handedness, thresh_y, thresh_thumb_x))
+
+
+def classify_results(results):
+    """Gesture name (or None) for every hand in a hands.process() result, in MediaPipe's order."""
+    landmarks, handedness = results_to_arrays(results)
+    if not len(landmarks):
+        return []
+    return [gesture_name(c) for c in classify_batch(landmarks, handedness)]
+
+
+def recognize_hand_gesture_reference(hand_landmarks, hand_label=None):
+    """Original per-attribute rule implementation, kept to check classify_batch against."""
+    lm = hand_landmarks.landmark
+
+    # safe reader to avoid index errors
+    def y_diff(tip_idx, pip_idx):
+        try:
+            return lm[pip_idx].y - lm[tip_idx].y
+        except Exception:
+            return 0.0
+
+    index_open = y_diff(8, 6) > THRESH_Y
+    middle_open = y_diff(12, 10) > THRESH_Y
+    ring_open = y_diff(16, 14) > THRESH_Y
+    pinky_open = y_diff(20, 18) > THRESH_Y
+
+    try:
+        thumb_dx = lm[THUMB_TIP].x - lm[THUMB_IP].x
+    except Exception:
+        thumb_dx = 0.0
+
+    if hand_label == 'Right':
+        thumb_open = thumb_dx > THRESH_THUMB_X
+    elif hand_label == 'Left':
+        thumb_open = thumb_dx < -THRESH_THUMB_X
+    else:
+        thumb_open = abs(thumb_dx) > THRESH_THUMB_X or y_diff(THUMB_TIP, THUMB_IP) > THRESH_Y
+
+    fingers_open = [thumb_open, index_open, middle_open, ring_open, pinky_open]
+    open_count = sum(1 for f in fingers_open if f)
+
+    if open_count >= 4:
+        return "paper"
+    if index_open and middle_open and not ring_open and not pinky_open:
+        return "scissors"
+    if open_count == 0:
+        return "rock"
+    return None
+
+
+def save_corpus(path, landmarks, handedness):
+    """Save a landmark corpus (N, 21, 3) + (N,) handedness as .npz for bench_classifier.py."""
+    np.savez_compressed(path, landmarks=np.asarray(landmarks, dtype=np.float32),
+                        handedness=np.asarray(handedness, dtype=np.int8))
+
+
+def load_corpus(path):
+    data = np.load(path)
+    return data["landmarks"].astype(np.float32), data["handedness"].astype(np.int8)
@@ -0,0 +1,218 @@
+"""Temporal smoothing of per-inference gesture classifications.
+
+GestureVote keeps an exponentially decayed, confidence-weighted vote over
+rock / paper / scissors: each observation multiplies the three weights by a
+decay factor and adds its confidence to one of them, so updates and queries are
+O(1) and recent frames count more than old ones. A vote is "decided" once the
+leading gesture holds `min_share` of the weight and the total weight reaches
+`min_weight` -- with agreeing, confident frames that happens after two
+inferences instead of waiting out a fixed-size buffer.
+
+HandSmoother follows the hands of consecutive inferences (hand_tracker.py: a
+stable track id per hand, whatever order MediaPipe reports them in) so two
+hands never share a vote, and runs the start trigger per track with
+hysteresis: a track fires once its start score (an EMA of "open hand"
+observations) reaches `start_on`, and can only fire again after the score fell
+below `start_off` or the hand was lost and came back. Per-track votes and
+start state live in compact arrays indexed by the tracker's slots. The
+player's hand is chosen deterministically: only the primary hand can start a
+round (primary_start) -- of all live tracks, the one with the largest palm
+(nearest the station), then the one nearest the middle of the frame, then the
+oldest -- so open hands of people further back never do.
+"""
+from array import array
+
+from gesture_classifier import GESTURE_CODES, GESTURES
+from hand_tracker import HandTracker
+
+
+class GestureVote:
+    """Exponentially decayed, confidence-weighted vote over gestures (O(1) per observation)."""
+
+    __slots__ = ("decay", "weights", "total", "observations")
+
+    def __init__(self, half_life=2.0):
+        self.set_half_life(half_life)
+        self.clear()
+
+    def set_half_life(self, half_life):
+        # half_life in observations; None / 0 = no decay (plain weighted counts)
+        self.decay = 0.5 ** (1.0 / half_life) if half_life else 1.0
+
+    def clear(self):
+        self.weights = [0.0] * len(GESTURES)
+        self.total = 0.0
+        self.observations = 0
+
+    def add(self, gesture, confidence=1.0):
+        """Add one observation; None (no decision this frame) only decays the earlier votes."""
+        d = self.decay
+        w = self.weights
+        for i in range(len(w)):
+            w[i] *= d
+        self.total *= d
+        code = GESTURE_CODES.get(gesture)
+        if code is not None and confidence > 0:
+            w[code] += confidence
+            self.total += confidence
+        self.observations += 1
+
+    def leader(self):
+        """(gesture, share of the total weight), or (None, 0.0) before any vote."""
+        if self.total <= 0:
+            return None, 0.0
+        w = self.weights
+        code = max(range(len(w)), key=w.__getitem__)
+        return GESTURES[code], w[code] / self.total
+
+    def decided(self, min_share=0.75, min_weight=1.5):
+        """Leading gesture if it is clear enough to act on, else None."""
+        gesture, share = self.leader()
+        if gesture is not None and share >= min_share and self.total >= min_weight:
+            return gesture
+        return None
+
+
+class HandSmoother:
+    """Per-hand tracks with their own gesture vote and start trigger.
+
+    Hands are matched by their landmarks (box overlap + centroid) when given, else by positions
+    (normalized wrist x, y per hand); with neither, by their index in the inference result.
+    """
+
+    def __init__(self, half_life=2.0, start_alpha=0.5, start_on=0.8, start_off=0.4, start_min_frames=3,
+                 start_gestures=("paper", "rock"), match_distance=0.2, max_missed=3, min_iou=0.1, capacity=8,
+                 primary_start=True):
+        self.decay = 0.5 ** (1.0 / half_life) if half_life else 1.0
+        self.start_alpha = start_alpha
+        self.start_on = start_on
+        self.start_off = start_off
+        self.start_min_frames = start_min_frames
+        self.primary_start = primary_start
+        self._starts = frozenset(GESTURE_CODES[g] for g in start_gestures)
+        self.tracker = HandTracker(match_distance, min_iou, max_missed, capacity)
+        # Per-slot state, indexed like the tracker's arrays; reset whenever a slot opens a new track
+        self.weights = array("d")           # len(GESTURES) per slot
+        self.totals = array("d")
+        self.start_score = array("d")
+        self.start_observations = array("i")
+        self.armed = array("b")
+        self._allocate(self.tracker.capacity)
+        self._fired = None
+
+    def _allocate(self, capacity):
+        extra = capacity - len(self.totals)
+        self.weights.extend([0.0] * (extra * len(GESTURES)))
+        self.totals.extend([0.0] * extra)
+        self.start_score.extend([0.0] * extra)
+        self.start_observations.extend([0] * extra)
+        self.armed.extend([0] * extra)
+
+    def update(self, gestures, confidences=None, positions=None, allow_start=True, landmarks=None):
+        """Feed one inference (gesture name or None per hand); returns the track id of each hand.
+
+        With allow_start=False start scores still update but no trigger fires (round in progress).
+        """
+        n = len(gestures)
+        if positions is None and landmarks is None:
+            positions = [(float(i), 0.0) for i in range(n)]
+        slots, new = self.tracker.update(landmarks, positions)
+        if self.tracker.capacity > len(self.totals):
+            self._allocate(self.tracker.capacity)
+        if not n:
+            return []
+
+        k = len(GESTURES)
+        weights, totals, score, armed = self.weights, self.totals, self.start_score, self.armed
+        decay, alpha = self.decay, self.start_alpha
+        ready = []
+        for i, slot in enumerate(slots):
+            if new[i]:
+                weights[slot * k:slot * k + k] = array("d", [0.0] * k)
+                totals[slot] = score[slot] = 0.0
+                self.start_observations[slot] = 0
+                armed[slot] = True
+            code = GESTURE_CODES.get(gestures[i])
+            conf = 0.0 if code is None else 1.0 if confidences is None else float(confidences[i])
+            # Vote: decay the hand's weights, then add the confidence to its gesture
+            for j in range(slot * k, slot * k + k):
+                weights[j] *= decay
+            totals[slot] *= decay
+            if conf > 0:
+                weights[slot * k + code] += conf
+                totals[slot] += conf
+            # Start trigger: EMA of open-hand observations, fired once per arming
+            x = conf if code in self._starts else 0.0
+            score[slot] += alpha * (x - score[slot])
+            self.start_observations[slot] += 1
+            if not armed[slot] and score[slot] < self.start_off:
+                armed[slot] = True
+            if armed[slot] and self.start_observations[slot] >= self.start_min_frames and \
+                    score[slot] >= self.start_on:
+                ready.append(slot)
+        if allow_start and self._fired is None and ready:
+            if self.primary_start:
+                # Only the hand nearest the station may start; open hands further back never do
+                # (live tracks count too, so a bystander can't start while the player's hand is missed once)
+                primary = self._pick(self.tracker.active_slots())
+                ready = [slot for slot in ready if slot == primary]
+            if ready:
+                slot = self._pick(ready)
+                armed[slot] = False
+                self._fired = self.tracker.ids[slot]
+        return [self.tracker.ids[slot] for slot in slots]
+
+    def _pick(self, slots):
+        """Deterministic choice among slots: largest palm, then nearest the frame's middle, then oldest."""
+        t = self.tracker
+        return min(slots, key=lambda s: (-t.sizes[s], abs(t.cx[s] - 0.5), t.ids[s]))
+
+    def leader(self, track_id):
+        """(gesture, share) of a live track's vote, or (None, 0.0)."""
+        slot = self.tracker.slot_of(track_id)
+        if slot is None or self.totals[slot] <= 0:
+            return None, 0.0
+        k = len(GESTURES)
+        w = self.weights[slot * k:slot * k + k]
+        code = max(range(k), key=w.__getitem__)
+        return GESTURES[code], w[code] / self.totals[slot]
+
+    def position(self, track_id):
+        """Last (x, y) of a live track (centroid, or the position it was fed), or None."""
+        slot = self.tracker.slot_of(track_id)
+        return None if slot is None else (self.tracker.cx[slot], self.tracker.cy[slot])
+
+    def size(self, track_id):
+        """Palm size of a live track (0 when it was fed positions only), or None."""
+        slot = self.tracker.slot_of(track_id)
+        return None if slot is None else self.tracker.sizes[slot]
+
+    def is_live(self, track_id):
+        return self.tracker.slot_of(track_id) is not None
+
+    def age(self, track_id):
+        """Inferences a live track has been matched in (1 = it opened in the latest one), 0 if not live."""
+        slot = self.tracker.slot_of(track_id)
+        return 0 if slot is None else self.tracker.seen[slot]
+
+    def primary(self, track_ids):
+        """The player's hand by the same rule as primary_start, among the given tracks (or None)."""
+        slots = [self.tracker.slot_of(t) for t in track_ids]
+        return self.tracker.ids[self._pick(slots)] if slots else None
+
+    def start_candidate(self, track_ids):
+        """Among this inference's tracks, the one closest to starting a round (ties as in _pick)."""
+        slots = [self.tracker.slot_of(t) for t in track_ids]
+        if not slots:
+            return None
+        top = max(self.start_score[s] for s in slots)
+        return self.tracker.ids[self._pick([s for s in slots if self.start_score[s] >= top])]
+
+    def take_start(self):
+        """Track id whose start trigger fired since the last call, or None."""
+        tid, self._fired = self._fired, None
+        return tid
+
+    def clear(self):
+        self.tracker.clear()
+        self._fired = None
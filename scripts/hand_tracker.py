@@ -0,0 +1,239 @@
+"""Stable ids for the hands of consecutive inferences.
+
+MediaPipe returns hands in no particular order, so "hand 0" can be the player
+in one frame and a bystander in the next. HandTracker matches every new hand
+to a live track by bounding-box overlap (IoU) and centroid distance. Its state
+lives in compact per-slot typed arrays (array.array, one slot per track, id -1
+= free slot), so callers can keep per-hand state in arrays indexed the same
+way (see HandSmoother).
+
+Matching is greedy over the whole cost matrix, best pair first:
+cost = (1 - IoU) + distance / match_distance, and a pair is only allowed when
+the boxes overlap by at least min_iou or the centroids are within
+match_distance, and the palm sizes differ by less than max_size_ratio (a
+bystander's smaller hand passing the player's doesn't take over its track;
+the palm, unlike the box, doesn't change size with the gesture). Unmatched
+hands open new tracks; a track missing for more than max_missed inferences is
+dropped and its slot reused.
+
+A live frame holds one or two hands, and for a few hands NumPy's per-call
+overhead costs more than the matching itself: up to SCALAR_MAX_HANDS hands are
+matched with plain Python loops. Larger crowds build the cost matrix with
+NumPy over zero-copy views of the same arrays. Both paths apply the same rules
+and break ties the same way (cost, then hand index, then slot).
+
+With positions only (one (x, y) per hand, e.g. network samples) the boxes
+and sizes are zero and matching is by distance alone.
+"""
+import math
+from array import array
+
+import numpy as np
+
+from gesture_classifier import NUM_LANDMARKS, WRIST
+
+MIDDLE_MCP = 9
+SCALAR_MAX_HANDS = 4  # up to here plain Python beats NumPy (bench_tracker.py)
+
+
+def hand_boxes(landmarks):
+    """(N, 21, >=2) landmarks -> (N, 4) x0, y0, x1, y1 boxes."""
+    xy = np.asarray(landmarks)[:, :, :2]
+    return np.concatenate([xy.min(axis=1), xy.max(axis=1)], axis=1)
+
+
+def palm_sizes(landmarks):
+    """Wrist -> middle knuckle distance per hand: how near the camera it is, whatever the gesture."""
+    lm = np.asarray(landmarks)
+    return np.hypot(lm[:, MIDDLE_MCP, 0] - lm[:, WRIST, 0], lm[:, MIDDLE_MCP, 1] - lm[:, WRIST, 1])
+
+
+def iou_matrix(a, b):
+    """IoU of every box in a (N, 4) with every box in b (T, 4)."""
+    x0 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y0 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x1 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y1 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.maximum(x1 - x0, 0.0) * np.maximum(y1 - y0, 0.0)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def hand_geometry(landmarks):
+    """Per hand: box (x0, y0, x1, y1), centroid (x, y) and palm size, as lists of Python floats."""
+    lm = np.asarray(landmarks)
+    if len(lm) > SCALAR_MAX_HANDS:
+        boxes = hand_boxes(lm)
+        centers = lm[:, :, :2].mean(axis=1)
+        return boxes.tolist(), centers.tolist(), palm_sizes(lm).tolist()
+    boxes, centers, sizes = [], [], []
+    for hand in lm[:, :, :2].tolist():
+        xs = [p[0] for p in hand]
+        ys = [p[1] for p in hand]
+        boxes.append((min(xs), min(ys), max(xs), max(ys)))
+        centers.append((sum(xs) / NUM_LANDMARKS, sum(ys) / NUM_LANDMARKS))
+        wrist, knuckle = hand[WRIST], hand[MIDDLE_MCP]
+        sizes.append(math.hypot(knuckle[0] - wrist[0], knuckle[1] - wrist[1]))
+    return boxes, centers, sizes
+
+
+def _iou(a, b):
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    inter = w * h if w > 0 and h > 0 else 0.0
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+class HandTracker:
+    """Track id per hand across inferences; state lives in per-slot arrays of length `capacity`."""
+
+    def __init__(self, match_distance=0.2, min_iou=0.1, max_missed=3, capacity=8, max_size_ratio=1.6):
+        self.match_distance = match_distance
+        self.min_iou = min_iou
+        self.max_size_ratio = max_size_ratio
+        self.max_missed = max_missed
+        self.ids = array("q", [-1]) * capacity        # -1 = free slot
+        self.cx = array("d", [0.0]) * capacity        # centroid (or the position the hand was fed)
+        self.cy = array("d", [0.0]) * capacity
+        self.boxes = array("d", [0.0]) * (4 * capacity)  # x0, y0, x1, y1 per slot
+        self.sizes = array("d", [0.0]) * capacity     # palm size (0 without landmarks)
+        self.missed = array("i", [0]) * capacity
+        self.seen = array("i", [0]) * capacity        # inferences the track was matched in
+        self._slot_of = {}                             # track id -> slot
+        self._next_id = 0
+
+    @property
+    def capacity(self):
+        return len(self.ids)
+
+    def active_slots(self):
+        return sorted(self._slot_of.values())
+
+    def slot_of(self, track_id):
+        return self._slot_of.get(track_id)
+
+    def _grow(self, needed):
+        extra = max(needed, self.capacity)
+        self.ids.extend([-1] * extra)
+        for a in (self.cx, self.cy, self.sizes):
+            a.extend([0.0] * extra)
+        self.boxes.extend([0.0] * (4 * extra))
+        self.missed.extend([0] * extra)
+        self.seen.extend([0] * extra)
+
+    def _pairs_scalar(self, boxes, centers, sizes, live, with_boxes):
+        md, r = self.match_distance, self.max_size_ratio
+        pairs = []
+        for i, (x, y) in enumerate(centers):
+            for j, s in enumerate(live):
+                d = math.hypot(x - self.cx[s], y - self.cy[s])
+                if not with_boxes:
+                    if d <= md:
+                        pairs.append((d / md, i, j))
+                    continue
+                ratio = sizes[i] / max(self.sizes[s], 1e-6)
+                if ratio > r or ratio < 1.0 / r:
+                    continue
+                iou = _iou(boxes[i], self.boxes[4 * s:4 * s + 4])
+                if iou < self.min_iou and d > md:
+                    continue
+                pairs.append(((1.0 - iou) + d / md, i, j))
+        pairs.sort()
+        return [(i, j) for _, i, j in pairs]
+
+    def _pairs_numpy(self, boxes, centers, sizes, live, with_boxes):
+        centers = np.asarray(centers)
+        idx = np.asarray(live)
+        dist = np.hypot(centers[:, None, 0] - np.frombuffer(self.cx)[idx][None, :],
+                        centers[:, None, 1] - np.frombuffer(self.cy)[idx][None, :])
+        if with_boxes:
+            boxes = np.asarray(boxes)
+            iou = iou_matrix(boxes, np.frombuffer(self.boxes).reshape(-1, 4)[idx])
+            cost = (1.0 - iou) + dist / self.match_distance
+            cost[(iou < self.min_iou) & (dist > self.match_distance)] = np.inf
+            # A hand doesn't halve or double in size between inferences: that's a different hand nearby
+            ratio = np.asarray(sizes)[:, None] / np.maximum(np.frombuffer(self.sizes)[idx], 1e-6)[None, :]
+            cost[(ratio > self.max_size_ratio) | (ratio < 1.0 / self.max_size_ratio)] = np.inf
+        else:
+            cost = dist / self.match_distance
+            cost[dist > self.match_distance] = np.inf
+        flat = cost.ravel()
+        allowed = np.flatnonzero(np.isfinite(flat))
+        # Stable sort over the row-major index: ties go by hand index, then slot, as in _pairs_scalar
+        return [divmod(k, len(live)) for k in allowed[np.argsort(flat[allowed], kind="stable")].tolist()]
+
+    def update(self, landmarks=None, positions=None):
+        """Match one inference's hands to tracks.
+
+        Pass landmarks (N, 21, >=2) for box + centroid matching, or positions (N, 2).
+        Returns (slots, new): the slot of every hand and, per hand, whether it opened a new
+        track (its slot's per-track state must be reset by the caller).
+        """
+        with_boxes = landmarks is not None and len(landmarks) and np.shape(landmarks)[1] == NUM_LANDMARKS
+        if with_boxes:
+            boxes, centers, sizes = hand_geometry(landmarks)
+        else:
+            if positions is None:
+                positions = ()
+            elif isinstance(positions, np.ndarray):
+                positions = positions.reshape(-1, 2).tolist()
+            centers = [(float(x), float(y)) for x, y in positions]
+            boxes = [(x, y, x, y) for x, y in centers]
+            sizes = [0.0] * len(centers)
+        n = len(centers)
+        slots = [-1] * n
+        live = self.active_slots()
+
+        if n and live:
+            pairs = self._pairs_scalar if n <= SCALAR_MAX_HANDS else self._pairs_numpy
+            taken = set()
+            remaining = min(n, len(live))
+            for i, j in pairs(boxes, centers, sizes, live, with_boxes):
+                if slots[i] < 0 and j not in taken:
+                    slots[i] = live[j]
+                    taken.add(j)
+                    remaining -= 1
+                    if not remaining:
+                        break
+
+        new = [s < 0 for s in slots]
+        if -1 in slots:
+            free = [s for s in range(self.capacity) if self.ids[s] < 0]
+            if len(free) < sum(new):
+                self._grow(sum(new) - len(free))
+                free = [s for s in range(self.capacity) if self.ids[s] < 0]
+            free.reverse()
+            for i in range(n):
+                if new[i]:
+                    slot = slots[i] = free.pop()
+                    self.ids[slot] = self._next_id
+                    self._slot_of[self._next_id] = slot
+                    self._next_id += 1
+                    self.seen[slot] = 0
+
+        cx, cy, box, missed, seen = self.cx, self.cy, self.boxes, self.missed, self.seen
+        for i, slot in enumerate(slots):
+            cx[slot], cy[slot] = centers[i]
+            b = 4 * slot
+            box[b], box[b + 1], box[b + 2], box[b + 3] = boxes[i]
+            self.sizes[slot] = sizes[i]
+            missed[slot] = 0
+            seen[slot] += 1
+        # Tracks not seen this time age out after max_missed inferences
+        for slot in live:
+            if slot not in slots:
+                self.missed[slot] += 1
+                if self.missed[slot] > self.max_missed:
+                    del self._slot_of[self.ids[slot]]
+                    self.ids[slot] = -1
+        return slots, new
+
+    def clear(self):
+        for slot in self._slot_of.values():
+            self.ids[slot] = -1
+            self.missed[slot] = 0
+            self.seen[slot] = 0
+        self._slot_of.clear()
@@ -0,0 +1,253 @@
+"""Game-phase aware scheduling of MediaPipe Hands inference.
+
+Most of a Paw-Punch round doesn't need hand landmarks at all: nothing reads
+them during the countdown or while the result is shown. InferenceScheduler
+decides per captured frame whether to run MediaPipe at all (a rate per game
+phase) and what to feed it:
+
+- a crop around the last detected hand while it keeps being found,
+- otherwise a downscaled full frame (landmarks are normalized, so nothing
+  needs to be mapped back),
+- a max_num_hands=1 graph once a player is locked in for the round.
+
+A graph with static_image_mode=False tracks landmarks from one input to the
+next, which only works while its inputs share one geometry. The downscaled
+(or full) frames therefore get tracking graphs of their own, and the crops,
+which move and change size from frame to frame, get static-mode graphs.
+
+With track_hands=True (the caller follows hands by track id, as GameSession
+does with landmarks) the round keeps the max_num_hands graph: a 1-hand graph
+may return a bystander's hand and leave the player's track without
+detections. The crop then follows the hand nearest set_focus() (the player's
+track) instead of whichever hand MediaPipe listed first, and when only
+hands further than focus_distance from it were found, the next frame is a
+full search for the player's hand again. Without tracking
+(net_client.py) the locked graph and first-hand crop stay as they were.
+
+Phases: "idle" (waiting for the start gesture), "countdown", "reveal", "result".
+"""
+import time
+
+import cv2
+import numpy as np
+
+from game_session import PHASES
+
+# Inference rate per phase in Hz: None = every captured frame, 0 = never
+DEFAULT_PHASE_RATES = {"idle": 15.0, "countdown": 0, "reveal": None, "result": 0}
+# Phases where a player has triggered the round and only their hand matters
+LOCKED_PHASES = ("countdown", "reveal")
+
+
+class InferenceScheduler:
+    """Wraps MediaPipe Hands graphs; process() returns results, or None when the frame was skipped.
+
+    make_hands(max_num_hands, static_image_mode) must build a MediaPipe Hands graph. prebuild()
+    builds every graph process() can switch to (call it at startup, e.g. on an init thread); after
+    a rebuild or a max_num_hands / use_roi change they are rebuilt before the next inference, so a
+    round never waits for a graph to load. Graphs are kept, so switching between them is free.
+    With enabled=False every frame gets a full-resolution, max_num_hands search (the old behavior).
+    """
+
+    def __init__(self, make_hands, max_num_hands=2, phase_rates=None, search_width=320,
+                 use_roi=True, roi_margin=0.6, min_roi_px=96, enabled=True, track_hands=False,
+                 focus_distance=0.2):
+        self.make_hands = make_hands
+        self.max_num_hands = max_num_hands
+        self.phase_rates = dict(DEFAULT_PHASE_RATES)
+        if phase_rates:
+            self.phase_rates.update(phase_rates)
+        self.search_width = search_width
+        self.use_roi = use_roi
+        self.roi_margin = roi_margin
+        self.min_roi_px = min_roi_px
+        self.enabled = enabled
+        self.track_hands = track_hands
+        self.phase = "idle"
+        self._focus = None  # (x, y) of the tracked hand that matters, set by the render thread
+        self.focus_distance = focus_distance  # a hand further than this from the focus isn't the player's
+        self._graphs = {}
+        self._roi = None  # (x0, y0, x1, y1) normalized crop around the last detected hand
+        self._rebuild = False  # graph settings changed: close the graphs before the next inference
+        self._prebuild = False  # graphs missing for the current settings: build them before the next inference
+        self._last_run = 0.0
+        self._wall_start = time.perf_counter()
+        self.phase_stats = {p: self._new_stats() for p in PHASES}
+
+    @staticmethod
+    def _new_stats():
+        return {"frames": 0, "inferences": 0, "skipped": 0, "roi": 0, "full": 0, "lost": 0,
+                "inference_ms": 0.0, "cpu_ms": 0.0}
+
+    def set_phase(self, phase):
+        self.phase = phase
+
+    def set_focus(self, position):
+        """Normalized (x, y) of the player's tracked hand, or None: the crop follows the nearest hand."""
+        self._focus = position
+
+    def configure(self, max_num_hands=None, phase_rates=None, search_width=None, use_roi=None,
+                  rebuild_graphs=False):
+        """Change settings while running (runtime_config hot reload); None leaves a setting as it is.
+
+        rebuild_graphs=True when make_hands would now build different graphs (confidence, model
+        complexity): the old graphs are closed and all of them rebuilt by the thread that runs
+        process() before its next inference, so a graph is never closed while it is in use.
+        """
+        if max_num_hands is not None and max_num_hands != self.max_num_hands:
+            self.max_num_hands = max_num_hands
+            self._prebuild = True
+        if phase_rates:
+            self.phase_rates.update(phase_rates)
+        if search_width is not None and search_width != self.search_width:
+            self.search_width = search_width
+            # The search graphs tracked landmarks at the old input size
+            rebuild_graphs = True
+        if use_roi is not None and use_roi != self.use_roi:
+            self.use_roi = use_roi
+            self._roi = None
+            self._prebuild = True
+        if rebuild_graphs:
+            self._rebuild = True
+
+    def graph_keys(self):
+        """The (max_num_hands, static_image_mode) graphs process() can ask for with the current settings."""
+        if not self.enabled or self.track_hands:
+            sizes = (self.max_num_hands,)
+        else:
+            sizes = tuple(sorted({1, self.max_num_hands}))
+        modes = (False, True) if self.enabled and self.use_roi else (False,)
+        return tuple((size, static) for size in sizes for static in modes)
+
+    def prebuild(self):
+        """Build every graph process() may switch to, so none is built in the middle of a round."""
+        for max_num_hands, static_image_mode in self.graph_keys():
+            self.hands(max_num_hands, static_image_mode)
+
+    def hands(self, max_num_hands, static_image_mode=False):
+        key = (max_num_hands, static_image_mode)
+        graph = self._graphs.get(key)
+        if graph is None:
+            graph = self.make_hands(max_num_hands, static_image_mode)
+            self._graphs[key] = graph
+        return graph
+
+    def should_run(self, phase, now):
+        if not self.enabled:
+            return True
+        rate = self.phase_rates.get(phase)
+        if rate is None:
+            return True
+        if rate <= 0:
+            return False
+        return now - self._last_run >= 1.0 / rate
+
+    def process(self, frame_rgb):
+        """Run MediaPipe on frame_rgb if the current phase calls for it."""
+        if self._rebuild:
+            self._rebuild = False
+            self.close()
+            self._prebuild = True
+        if self._prebuild:
+            # At the reload, not at the next countdown or reveal
+            self._prebuild = False
+            self.prebuild()
+        phase = self.phase
+        stats = self.phase_stats.setdefault(phase, self._new_stats())
+        stats["frames"] += 1
+        now = time.perf_counter()
+        if not self.should_run(phase, now):
+            stats["skipped"] += 1
+            return None
+        self._last_run = now
+
+        locked = self.enabled and phase in LOCKED_PHASES and not self.track_hands
+        max_num_hands = 1 if locked else self.max_num_hands
+        t_cpu = time.thread_time()
+        results = None
+        if self.enabled and self.use_roi and self._roi is not None:
+            results = self._process_roi(self.hands(max_num_hands, True), frame_rgb, self._roi)
+            stats["roi"] += 1
+            if not results.multi_hand_landmarks:
+                # Hand left the crop: search the whole frame again right away
+                stats["lost"] += 1
+                results = None
+        if results is None:
+            results = self.hands(max_num_hands).process(self._search_input(frame_rgb))
+            stats["full"] += 1
+        self._roi = self._next_roi(results, frame_rgb.shape) if self.enabled else None
+
+        stats["inferences"] += 1
+        stats["inference_ms"] += (time.perf_counter() - now) * 1000.0
+        stats["cpu_ms"] += (time.thread_time() - t_cpu) * 1000.0
+        return results
+
+    def _search_input(self, frame_rgb):
+        h, w = frame_rgb.shape[:2]
+        if not self.enabled or not self.search_width or w <= self.search_width:
+            return frame_rgb
+        return cv2.resize(frame_rgb, (self.search_width, int(round(h * self.search_width / w))),
+                          interpolation=cv2.INTER_AREA)
+
+    @staticmethod
+    def _process_roi(graph, frame_rgb, roi):
+        h, w = frame_rgb.shape[:2]
+        x0, y0 = int(roi[0] * w), int(roi[1] * h)
+        x1, y1 = int(roi[2] * w), int(roi[3] * h)
+        results = graph.process(np.ascontiguousarray(frame_rgb[y0:y1, x0:x1]))
+        if results.multi_hand_landmarks:
+            # Landmarks come back normalized to the crop; map them to the full frame
+            cw, ch = x1 - x0, y1 - y0
+            for hand in results.multi_hand_landmarks:
+                for p in hand.landmark:
+                    p.x = (p.x * cw + x0) / w
+                    p.y = (p.y * ch + y0) / h
+        return results
+
+    def _next_roi(self, results, shape):
+        """Square crop around the focused (else the first) detected hand, or None to search the full frame."""
+        if not self.use_roi or results is None or not results.multi_hand_landmarks:
+            return None
+        h, w = shape[:2]
+        hands = results.multi_hand_landmarks
+        focus = self._focus
+        if focus is not None:
+            def distance(hand):
+                cx = sum(p.x for p in hand.landmark) / len(hand.landmark)
+                cy = sum(p.y for p in hand.landmark) / len(hand.landmark)
+                return ((cx - focus[0]) ** 2 + (cy - focus[1]) ** 2) ** 0.5
+            nearest = min(hands, key=distance)
+            if distance(nearest) > self.focus_distance:
+                # Only other people's hands in view: search the whole frame for the player's again
+                return None
+            points = nearest.landmark
+        else:
+            points = hands[0].landmark
+        xs = [p.x * w for p in points]
+        ys = [p.y * h for p in points]
+        side = max(max(xs) - min(xs), max(ys) - min(ys)) * (1.0 + 2.0 * self.roi_margin)
+        side = min(max(side, self.min_roi_px), w, h)
+        cx = (max(xs) + min(xs)) / 2.0
+        cy = (max(ys) + min(ys)) / 2.0
+        x0 = min(max(cx - side / 2.0, 0.0), w - side)
+        y0 = min(max(cy - side / 2.0, 0.0), h - side)
+        return (x0 / w, y0 / h, (x0 + side) / w, (y0 + side) / h)
+
+    def cpu_percent(self):
+        """CPU time of the inference calls (thread_time() of the thread running process()) as a percentage
+        of one core since the scheduler was created."""
+        wall = time.perf_counter() - self._wall_start
+        cpu_ms = sum(s["cpu_ms"] for s in list(self.phase_stats.values()))
+        return cpu_ms / 1000.0 / wall * 100.0 if wall > 0 else 0.0
+
+    def stats(self):
+        return {"cpu_percent": self.cpu_percent(),
+                "phases": {p: dict(s) for p, s in self.phase_stats.items() if s["frames"]}}
+
+    def close(self):
+        for graph in self._graphs.values():
+            try:
+                graph.close()
+            except Exception:
+                pass
+        self._graphs.clear()
@@ -0,0 +1,205 @@
+"""Small learned gesture classifier (pure NumPy) over normalized hand landmarks.
+
+Features are wrist-relative landmark coordinates scaled by the wrist -> middle
+finger MCP distance, with left hands mirrored onto right hands, plus the five
+fingertip distances from the wrist. The model is multinomial logistic
+regression (hidden=0) or a one-hidden-layer ReLU MLP, trained with mini-batch
+Adam. A temperature fitted on held-out data calibrates the probabilities, so
+predict() can return a confidence instead of just "uncertain".
+
+Labelled data is .npz with `landmarks` (N, 21, 3), `handedness` (N,) and
+`labels` (N,) gesture codes, or an unlabelled --dump-landmarks file / trace
+paired with a label on the command line (see train_classifier.py).
+"""
+import numpy as np
+
+from gesture_classifier import GESTURE_CODES, GESTURES, HAND_LEFT, NO_GESTURE, NUM_LANDMARKS
+
+MIDDLE_FINGER_MCP = 9
+FINGERTIPS = [4, 8, 12, 16, 20]
+
+
+def landmark_features(landmarks, handedness):
+    """(N, 21, 3) landmarks + (N,) handedness codes -> (N, 65) float32 features."""
+    lm = np.asarray(landmarks, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    rel = lm - lm[:, :1, :]
+    scale = np.maximum(np.linalg.norm(rel[:, MIDDLE_FINGER_MCP, :2], axis=1), 1e-6)
+    rel = rel / scale[:, None, None]
+    hand = np.broadcast_to(np.asarray(handedness).reshape(-1), (len(rel),))
+    rel[:, :, 0] *= np.where(hand == HAND_LEFT, -1.0, 1.0)[:, None]
+    tip_dist = np.linalg.norm(rel[:, FINGERTIPS, :2], axis=2)
+    return np.concatenate([rel[:, 1:, :].reshape(len(rel), -1), tip_dist], axis=1).astype(np.float32)
+
+
+def _softmax(logits):
+    z = logits - logits.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+class GestureModel:
+    """Logistic regression / tiny MLP with standardized inputs and temperature-calibrated outputs."""
+
+    def __init__(self, params, mean, std, temperature=1.0):
+        self.params = params  # W1, b1[, W2, b2]
+        self.mean = mean
+        self.std = std
+        self.temperature = temperature
+
+    # ---- inference ----
+    def _logits(self, x):
+        x = (x - self.mean) / self.std
+        p = self.params
+        if "W2" in p:
+            h = np.maximum(x @ p["W1"] + p["b1"], 0.0)
+            return h @ p["W2"] + p["b2"]
+        return x @ p["W1"] + p["b1"]
+
+    def predict_proba(self, landmarks, handedness):
+        """(N, 3) calibrated probabilities for rock / paper / scissors."""
+        if not len(landmarks):
+            return np.zeros((0, len(GESTURES)), dtype=np.float32)
+        return _softmax(self._logits(landmark_features(landmarks, handedness)) / self.temperature)
+
+    def predict(self, landmarks, handedness, min_confidence=0.0):
+        """(codes, confidence): codes is NO_GESTURE where confidence < min_confidence."""
+        proba = self.predict_proba(landmarks, handedness)
+        codes = proba.argmax(axis=1).astype(np.int8)
+        confidence = proba.max(axis=1)
+        codes[confidence < min_confidence] = NO_GESTURE
+        return codes, confidence
+
+    def fill_uncertain(self, landmarks, handedness, rule_codes, min_confidence=0.7):
+        """Keep rule-based codes; replace NO_GESTURE entries with confident model predictions.
+
+        Returns (codes, confidence): 1.0 for rule decisions, the model's confidence for the rest.
+        """
+        codes = np.array(rule_codes, dtype=np.int8, copy=True)
+        confidence = np.ones(len(codes), dtype=np.float32)
+        missing = codes == NO_GESTURE
+        if missing.any():
+            hand = np.broadcast_to(np.asarray(handedness).reshape(-1), (len(codes),))
+            codes[missing], confidence[missing] = self.predict(np.asarray(landmarks)[missing], hand[missing],
+                                                               min_confidence)
+        return codes, confidence
+
+    # ---- persistence ----
+    def save(self, path):
+        np.savez(path, mean=self.mean, std=self.std, temperature=np.float32(self.temperature),
+                 classes=np.array(GESTURES), **self.params)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        params = {k: data[k] for k in ("W1", "b1", "W2", "b2") if k in data}
+        return cls(params, data["mean"], data["std"], float(data["temperature"]))
+
+    # ---- training ----
+    @classmethod
+    def train(cls, landmarks, handedness, labels, hidden=0, epochs=200, lr=0.01, l2=1e-4,
+              batch_size=512, val_fraction=0.15, seed=0, log=None):
+        """Fit on labelled hands; returns (model, held-out indices used to fit the temperature)."""
+        rng = np.random.default_rng(seed)
+        x_all = landmark_features(landmarks, handedness)
+        y_all = np.asarray(labels, dtype=np.int64)
+        order = rng.permutation(len(x_all))
+        n_val = max(1, int(len(order) * val_fraction)) if len(order) > 10 else 0
+        val_idx, train_idx = order[:n_val], order[n_val:]
+        x, y = x_all[train_idx], y_all[train_idx]
+
+        mean = x.mean(axis=0)
+        std = x.std(axis=0) + 1e-6
+        xs = (x - mean) / std
+        n_in, n_out = xs.shape[1], len(GESTURES)
+        if hidden:
+            params = {"W1": rng.normal(0, np.sqrt(2.0 / n_in), (n_in, hidden)).astype(np.float32),
+                      "b1": np.zeros(hidden, dtype=np.float32),
+                      "W2": rng.normal(0, np.sqrt(1.0 / hidden), (hidden, n_out)).astype(np.float32),
+                      "b2": np.zeros(n_out, dtype=np.float32)}
+        else:
+            params = {"W1": np.zeros((n_in, n_out), dtype=np.float32), "b1": np.zeros(n_out, dtype=np.float32)}
+        model = cls(params, mean, std)
+
+        # Adam state
+        m = {k: np.zeros_like(v) for k, v in params.items()}
+        v = {k: np.zeros_like(v) for k, v in params.items()}
+        beta1, beta2, eps, step = 0.9, 0.999, 1e-8, 0
+        onehot = np.eye(n_out, dtype=np.float32)
+        for epoch in range(epochs):
+            perm = rng.permutation(len(xs))
+            for start in range(0, len(xs), batch_size):
+                idx = perm[start:start + batch_size]
+                grads = model._gradients(xs[idx], onehot[y[idx]], l2)
+                step += 1
+                for k in params:
+                    m[k] = beta1 * m[k] + (1 - beta1) * grads[k]
+                    v[k] = beta2 * v[k] + (1 - beta2) * grads[k] ** 2
+                    m_hat = m[k] / (1 - beta1 ** step)
+                    v_hat = v[k] / (1 - beta2 ** step)
+                    params[k] -= (lr * m_hat / (np.sqrt(v_hat) + eps)).astype(np.float32)
+            if log and (epoch + 1) % max(1, epochs // 10) == 0:
+                acc = (model._logits(x).argmax(axis=1) == y).mean()
+                log("epoch %d/%d  train accuracy %.3f" % (epoch + 1, epochs, acc))
+
+        if n_val:
+            model.temperature = model._fit_temperature(x_all[val_idx], y_all[val_idx])
+        return model, val_idx
+
+    def _gradients(self, xs, target, l2):
+        """Cross-entropy + L2 gradients for standardized inputs xs and one-hot targets."""
+        p = self.params
+        n = len(xs)
+        if "W2" in p:
+            pre = xs @ p["W1"] + p["b1"]
+            h = np.maximum(pre, 0.0)
+            d_logits = (_softmax(h @ p["W2"] + p["b2"]) - target) / n
+            d_h = (d_logits @ p["W2"].T) * (pre > 0)
+            return {"W2": h.T @ d_logits + l2 * p["W2"], "b2": d_logits.sum(axis=0),
+                    "W1": xs.T @ d_h + l2 * p["W1"], "b1": d_h.sum(axis=0)}
+        d_logits = (_softmax(xs @ p["W1"] + p["b1"]) - target) / n
+        return {"W1": xs.T @ d_logits + l2 * p["W1"], "b1": d_logits.sum(axis=0)}
+
+    def _fit_temperature(self, x, y):
+        """Temperature minimizing held-out negative log-likelihood (grid search)."""
+        logits = self._logits(x)
+        best_t, best_nll = 1.0, np.inf
+        for t in np.exp(np.linspace(np.log(0.25), np.log(4.0), 41)):
+            proba = _softmax(logits / t)
+            nll = -np.log(proba[np.arange(len(y)), y] + 1e-12).mean()
+            if nll < best_nll:
+                best_t, best_nll = float(t), nll
+        return best_t
+
+
+def load_labelled(specs):
+    """Load labelled hands from "PATH" (npz with labels) or "LABEL=PATH" (npz dump or trace, all one gesture)."""
+    all_lm, all_hand, all_labels = [], [], []
+    for spec in specs:
+        label = None
+        path = spec
+        if "=" in spec and spec.split("=", 1)[0] in GESTURE_CODES:
+            label, path = spec.split("=", 1)
+        if path.endswith(".npz"):
+            data = np.load(path)
+            landmarks = data["landmarks"].astype(np.float32)
+            handedness = data["handedness"].astype(np.int8)
+            labels = data["labels"].astype(np.int64) if label is None else None
+        else:
+            # Trace written with --record-trace: every recorded hand becomes a sample (copied out chunk by chunk)
+            from trace_log import MAX_HANDS, TraceReader
+            landmarks, handedness = [np.zeros((0, 21, 3), dtype=np.float32)], [np.zeros(0, dtype=np.int8)]
+            for records in TraceReader(path).chunks():
+                valid = np.arange(MAX_HANDS)[None, :] < records["n_hands"][:, None]
+                landmarks.append(records["landmarks"][valid])
+                handedness.append(records["handedness"][valid])
+            landmarks, handedness = np.concatenate(landmarks), np.concatenate(handedness)
+            labels = None
+        if labels is None:
+            if label is None:
+                raise ValueError(f"{path} has no labels; pass it as LABEL=PATH (e.g. rock={path})")
+            labels = np.full(len(landmarks), GESTURE_CODES[label], dtype=np.int64)
+        all_lm.append(landmarks)
+        all_hand.append(handedness)
+        all_labels.append(labels)
+    return np.concatenate(all_lm), np.concatenate(all_hand), np.concatenate(all_labels)
+
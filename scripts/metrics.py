@@ -0,0 +1,131 @@
+"""On-screen profiling overlay and periodic metrics export for Paw-Punch.
+
+MetricsOverlay draws rolling p50/p95/p99 per StageTimer stage in the HUD
+(toggled with F3 in the game). MetricsExporter periodically writes the same
+numbers to a local file for fleet monitoring, either appended as JSON lines or
+as a Prometheus text-format file (replaced atomically, for node_exporter's
+textfile collector).
+"""
+import json
+import os
+import time
+
+import pygame
+
+OVERLAY_BG = (0, 0, 0, 170)
+OVERLAY_FG = (255, 255, 255)
+
+
+def flatten(prefix, value, out):
+    """{"a": {"b": 1}} -> {"a_b": 1}, keeping only numbers."""
+    if isinstance(value, dict):
+        for key, sub in value.items():
+            flatten(f"{prefix}_{key}" if prefix else str(key), sub, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = value
+    return out
+
+
+class MetricsOverlay:
+    """Semi-transparent stage-timing table, re-rendered at most every `refresh_s` seconds."""
+
+    def __init__(self, timer, font_size=20, refresh_s=0.5, stage_order=()):
+        self.timer = timer
+        self.font = pygame.font.Font(None, font_size)
+        self.refresh_s = refresh_s
+        self.stage_order = stage_order
+        self.visible = False
+        self.surface = None
+        self._last_refresh = 0.0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.surface = None
+
+    def _build(self, fps, extra_lines):
+        summary = self.timer.summary()
+        names = [n for n in self.stage_order if n in summary] + sorted(n for n in summary if n not in self.stage_order)
+        lines = ["%.1f fps   (ms)     p50     p95     p99" % fps]
+        for name in names:
+            s = summary[name]
+            lines.append("%-16s %7.2f %7.2f %7.2f" % (name, s["p50"], s["p95"], s["p99"]))
+        lines.extend(extra_lines)
+        rendered = [self.font.render(line, True, OVERLAY_FG) for line in lines]
+        line_h = self.font.get_linesize()
+        width = max(r.get_width() for r in rendered) + 12
+        surf = pygame.Surface((width, line_h * len(rendered) + 8), pygame.SRCALPHA)
+        surf.fill(OVERLAY_BG)
+        for i, r in enumerate(rendered):
+            surf.blit(r, (6, 4 + i * line_h))
+        return surf
+
+    def draw(self, screen, pos, fps, extra_lines=()):
+        if not self.visible:
+            return None
+        now = time.perf_counter()
+        if self.surface is None or now - self._last_refresh >= self.refresh_s:
+            self.surface = self._build(fps, extra_lines)
+            self._last_refresh = now
+        return screen.blit(self.surface, pos)
+
+
+class MetricsExporter:
+    """Writes StageTimer percentiles plus extra gauges to `path` every `interval` seconds."""
+
+    def __init__(self, path, fmt="jsonl", interval=10.0, station="0"):
+        if fmt not in ("jsonl", "prom"):
+            raise ValueError(f"Unknown metrics format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.interval = interval
+        self.station = station
+        self._last_export = time.perf_counter()
+        self._last_frames = 0
+        self.exports = 0
+
+    def maybe_export(self, timer, frames, extra=None):
+        """Export if the interval has elapsed; `frames` is the running rendered-frame count."""
+        now = time.perf_counter()
+        elapsed = now - self._last_export
+        if elapsed < self.interval:
+            return False
+        fps = (frames - self._last_frames) / elapsed if elapsed > 0 else 0.0
+        self.export(timer.summary(), fps, extra or {})
+        self._last_export = now
+        self._last_frames = frames
+        return True
+
+    def export(self, summary, fps, extra):
+        gauges = flatten("", extra, {})
+        if self.fmt == "jsonl":
+            line = {"ts": time.time(), "station": self.station, "fps": fps, "stages": summary, "gauges": gauges}
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(line) + "\n")
+        else:
+            self._write_prometheus(summary, fps, gauges)
+        self.exports += 1
+
+    def _write_prometheus(self, summary, fps, gauges):
+        station = self.station
+        lines = ["# HELP pawpunch_fps Rendered frames per second over the last export interval",
+                 "# TYPE pawpunch_fps gauge",
+                 'pawpunch_fps{station="%s"} %.3f' % (station, fps),
+                 "# HELP pawpunch_stage_latency_ms Per-stage main loop latency (quantiles over the recent window)",
+                 "# TYPE pawpunch_stage_latency_ms summary"]
+        for stage, s in sorted(summary.items()):
+            for pct in (50, 95, 99):
+                lines.append('pawpunch_stage_latency_ms{station="%s",stage="%s",quantile="%.2f"} %.4f'
+                             % (station, stage, pct / 100.0, s["p%d" % pct]))
+            # _count / _sum are counters: totals since the start, not the size of the percentile window
+            lines.append('pawpunch_stage_latency_ms_count{station="%s",stage="%s"} %d'
+                         % (station, stage, s["total_count"]))
+            lines.append('pawpunch_stage_latency_ms_sum{station="%s",stage="%s"} %.4f'
+                         % (station, stage, s["total_ms"]))
+        for name, value in sorted(gauges.items()):
+            metric = "pawpunch_" + "".join(c if c.isalnum() else "_" for c in name)
+            lines.append("# TYPE %s gauge" % metric)
+            lines.append('%s{station="%s"} %s' % (metric, station, value))
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.path)
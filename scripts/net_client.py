@@ -0,0 +1,232 @@
+"""Thin Paw-Punch client: camera + MediaPipe + gesture rules here, the round runs on net_server.py.
+
+Usage:
+    python scripts/net_client.py --server 192.168.1.20:7777 [--source 0] [--send-landmarks]
+
+Only a SAMPLE of a few bytes per hand goes over the network per inference
+(or, with --send-landmarks, float16 landmarks for the server to classify).
+Each sample is stamped with the server-clock time its frame was captured,
+using the clock offset measured from PING / PONG round trips (the sample with
+the smallest round-trip time of the last few wins, as in NTP).
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import deque
+
+import net_protocol as proto
+from game_session import PHASES
+from gesture_classifier import classify_batch, gesture_name, results_to_arrays
+from round_engine import RESULT_TEXT
+
+NO_MOVE_TEXT = "No Move"
+
+
+def parse_address(spec, default_port=7777):
+    host, _, port = spec.rpartition(":")
+    if not host:
+        return spec, default_port
+    return host, int(port)
+
+
+class NetClient:
+    """Connection to a NetServer: clock sync, sending samples and the latest phase / result."""
+
+    def __init__(self, ping_window=8):
+        self.reader = None
+        self.writer = None
+        self.player_id = None
+        self.offset_ms = 0.0          # server clock - local perf_counter clock
+        self.rtt_ms = None            # round trip of the sample the offset comes from
+        self._pongs = deque(maxlen=ping_window)
+        self.rtts = []                # every measured round trip (ms)
+        self.phase = "idle"
+        self.phase_start_ms = 0
+        self.countdown = 3
+        self.cat_gesture = None
+        self.results = []             # (player gesture, cat gesture, result text, reveal ms, end ms, received ms)
+        self.on_phase = None
+        self.on_result = None
+        self._reader_task = None
+        self._welcome = None
+        self._first_pong = None
+
+    async def connect(self, host, port, sync_pings=5, sync_timeout=2.0):
+        """Connect, then sync the clock; waits up to sync_timeout seconds for the first PONG
+        (without one, rtt_ms stays None and the offset comes from the WELCOME message alone)."""
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        loop = asyncio.get_running_loop()
+        self._welcome = loop.create_future()
+        self._first_pong = loop.create_future()
+        self._reader_task = asyncio.create_task(self._read_loop())
+        self.writer.write(proto.encode_hello())
+        await self._welcome
+        for _ in range(sync_pings):
+            self.ping()
+            await asyncio.sleep(0.02)
+        try:
+            await asyncio.wait_for(self._first_pong, sync_timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def server_ms(self, local_time=None):
+        """Local perf_counter time (default: now) on the server clock."""
+        return (time.perf_counter() if local_time is None else local_time) * 1000.0 + self.offset_ms
+
+    def ping(self):
+        self.writer.write(proto.encode_ping(time.perf_counter()))
+
+    def send_sample(self, capture_time, gestures, confidences=None, positions=None):
+        self.writer.write(proto.encode_sample(self.server_ms(capture_time), gestures, confidences, positions))
+
+    def send_landmarks(self, capture_time, landmarks, handedness):
+        self.writer.write(proto.encode_landmarks(self.server_ms(capture_time), landmarks, handedness))
+
+    def current_phase(self, local_time=None):
+        """Phase at a local perf_counter time (default: now) as the player sees it.
+
+        The reveal starts when the countdown runs out by the synced clock; the PHASE message
+        saying so only arrives after the server's playout delay.
+        """
+        if self.phase == "countdown" and self.server_ms(local_time) >= self.phase_start_ms + self.countdown * 1000:
+            return "reveal"
+        return self.phase
+
+    def countdown_remaining(self):
+        """Countdown seconds left, from the phase start time (no network or playout delay)."""
+        return max(0, self.countdown - int(self.server_ms() - self.phase_start_ms) // 1000)
+
+    async def _read_loop(self):
+        messages = proto.MessageReader(self.reader)
+        try:
+            while True:
+                for msg_type, payload in await messages.read():
+                    self._on_message(msg_type, payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if not self._welcome.done():
+                self._welcome.set_exception(ConnectionError("server closed the connection"))
+
+    def _on_message(self, msg_type, payload):
+        fields = proto.decode(msg_type, payload)
+        if msg_type == proto.PONG:
+            sent, server_ms = fields
+            now = time.perf_counter()
+            rtt = (now - sent) * 1000.0
+            self.rtts.append(rtt)
+            self._pongs.append((rtt, server_ms - (sent + now) * 500.0))
+            self.rtt_ms, self.offset_ms = min(self._pongs)
+            if self._first_pong is not None and not self._first_pong.done():
+                self._first_pong.set_result(True)
+        elif msg_type == proto.PHASE:
+            phase, self.phase_start_ms, cat, self.countdown = fields
+            self.phase = PHASES[phase]
+            self.cat_gesture = gesture_name(cat)
+            if self.on_phase:
+                self.on_phase(self)
+        elif msg_type == proto.RESULT:
+            player, cat, outcome, reveal_ms, end_ms = fields
+            self.results.append((gesture_name(player), gesture_name(cat),
+                                 RESULT_TEXT.get(outcome, NO_MOVE_TEXT), reveal_ms, end_ms, self.server_ms()))
+            if self.on_result:
+                self.on_result(self)
+        elif msg_type == proto.WELCOME:
+            self.player_id, server_ms = fields
+            self.offset_ms = server_ms - time.perf_counter() * 1000.0
+            self._welcome.set_result(True)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+
+
+async def run_camera_client(args):
+    # MediaPipe and the capture pipeline are only needed by the real client, not by bench_net.py
+    import mediapipe as mp
+    from capture_pipeline import CapturePipeline
+    from frame_sources import open_source
+    from inference_scheduler import InferenceScheduler
+
+    def make_hands(max_num_hands, static_image_mode=False):
+        return mp.solutions.hands.Hands(static_image_mode=static_image_mode, max_num_hands=max_num_hands,
+                                        min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+    cap = open_source(args.source)
+    if not cap.isOpened():
+        print(f"Unable to open frame source: {args.source}")
+        return 1
+    scheduler = InferenceScheduler(make_hands, max_num_hands=2)
+    scheduler.prebuild()
+    pipeline = CapturePipeline(cap, scheduler)
+
+    client = NetClient()
+    host, port = parse_address(args.server)
+    await client.connect(host, port)
+    rtt = "no PONG yet" if client.rtt_ms is None else "%.1f ms" % client.rtt_ms
+    print(f"Connected to {host}:{port} as player {client.player_id} (clock offset rtt {rtt})")
+
+    def show_phase(c):
+        # The server runs a little behind (playout delay); the countdown shown comes from its start time
+        if c.phase == "reveal":
+            print(f"Cat shows {c.cat_gesture}!")
+    client.on_phase = show_phase
+    client.on_result = lambda c: print("Result: %s (you: %s, cat: %s)" % (c.results[-1][2], c.results[-1][0],
+                                                                        c.results[-1][1]))
+
+    pipeline.start()
+    last_ping = time.perf_counter()
+    last_countdown = None
+    try:
+        while not pipeline.finished:
+            # By the countdown, not the PHASE message: reveal frames must be inferred from its first one
+            scheduler.set_phase(client.current_phase())
+            for inference in pipeline.poll_all():
+                # Only landmarks are used: the frame's buffers go straight back to the capture ring
+                pipeline.release(inference)
+                if inference.results is None:
+                    continue
+                hand_arrays, hand_codes = results_to_arrays(inference.results)
+                if args.send_landmarks:
+                    client.send_landmarks(inference.frame.timestamp, hand_arrays, hand_codes)
+                else:
+                    gestures = [gesture_name(c) for c in classify_batch(hand_arrays, hand_codes)] \
+                        if len(hand_arrays) else []
+                    client.send_sample(inference.frame.timestamp, gestures, positions=hand_arrays[:, 0, :2])
+            if client.phase == "countdown" and client.countdown_remaining() != last_countdown:
+                last_countdown = client.countdown_remaining()
+                print(last_countdown or "Show your hand!")
+            elif client.phase != "countdown":
+                last_countdown = None
+            # Keep the clock offset fresh (and the connection alive)
+            if time.perf_counter() - last_ping > 1.0:
+                client.ping()
+                last_ping = time.perf_counter()
+            await asyncio.sleep(0.005)
+    finally:
+        pipeline.stop()
+        scheduler.close()
+        cap.release()
+        await client.close()
+    print(f"Played {len(client.results)} rounds")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server", required=True, help="HOST:PORT of net_server.py")
+    parser.add_argument("--source", default="0", help="camera index, video file or directory of frames")
+    parser.add_argument("--send-landmarks", action="store_true",
+                        help="send landmarks and let the server classify them (127 bytes per hand)")
+    args = parser.parse_args()
+    try:
+        return asyncio.run(run_camera_client(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""Binary wire format for networked Paw-Punch (net_server.py / net_client.py).
+
+Every message is a 3-byte header (uint16 payload length, uint8 type) followed
+by a fixed little-endian payload. Times are milliseconds on the server clock
+(uint32, ms since the server started); clients learn their offset to it from
+PING / PONG and stamp samples with the server time at which the frame was
+captured, so the server can order samples by when the hand was seen rather
+than when the packet arrived.
+
+    client -> server
+        HELLO      version
+        PING       client send time (float64 seconds, echoed back)
+        SAMPLE     capture time, then per hand: gesture code, confidence, wrist x, y   (8 + 6 bytes/hand)
+        LANDMARKS  capture time, then per hand: handedness code, 21x3 float16 landmarks (server classifies)
+    server -> client
+        WELCOME    player id, server time
+        PONG       echoed client time, server time
+        PHASE      phase code, phase start time, cat gesture code (-1 until the reveal), countdown seconds
+        RESULT     player gesture code (-1 = none), cat gesture code, outcome (round_engine codes), reveal ms,
+                   time the result was decided
+
+Gesture codes are gesture_classifier's (ROCK=0, PAPER=1, SCISSORS=2, NO_GESTURE=-1).
+"""
+import asyncio
+import struct
+
+import numpy as np
+
+from gesture_classifier import GESTURES, NO_GESTURE, NUM_LANDMARKS
+
+VERSION = 1
+HELLO, WELCOME, PING, PONG, SAMPLE, LANDMARKS, PHASE, RESULT = range(1, 9)
+MAX_HANDS = 4
+
+HEADER = struct.Struct("<HB")
+_HELLO = struct.Struct("<B")
+_WELCOME = struct.Struct("<II")
+_PING = struct.Struct("<d")
+_PONG = struct.Struct("<dI")
+_SAMPLE = struct.Struct("<IB")
+_SAMPLE_HAND = struct.Struct("<bBHH")
+_LANDMARK_HAND = np.dtype([("handedness", "i1"), ("landmarks", "<f2", (NUM_LANDMARKS, 3))])
+_PHASE = struct.Struct("<BIbB")
+_RESULT = struct.Struct("<bbBHI")
+
+
+def _frame(msg_type, payload):
+    return HEADER.pack(len(payload), msg_type) + payload
+
+
+def encode_hello():
+    return _frame(HELLO, _HELLO.pack(VERSION))
+
+
+def encode_welcome(player_id, server_ms):
+    return _frame(WELCOME, _WELCOME.pack(player_id, server_ms & 0xFFFFFFFF))
+
+
+def encode_ping(client_time):
+    return _frame(PING, _PING.pack(client_time))
+
+
+def encode_pong(client_time, server_ms):
+    return _frame(PONG, _PONG.pack(client_time, server_ms & 0xFFFFFFFF))
+
+
+def gesture_code(gesture):
+    return GESTURES.index(gesture) if gesture in GESTURES else NO_GESTURE
+
+
+def encode_sample(t_ms, gestures, confidences=None, positions=None):
+    """Gestures (names or None) of one inference, with confidences in [0, 1] and normalized wrist (x, y)."""
+    n = min(len(gestures), MAX_HANDS)
+    parts = [_SAMPLE.pack(int(t_ms) & 0xFFFFFFFF, n)]
+    for i in range(n):
+        confidence = 1.0 if confidences is None else min(max(float(confidences[i]), 0.0), 1.0)
+        x, y = (0.0, 0.0) if positions is None else (min(max(float(v), 0.0), 1.0) for v in positions[i][:2])
+        parts.append(_SAMPLE_HAND.pack(gesture_code(gestures[i]), round(confidence * 255), round(x * 65535),
+                                       round(y * 65535)))
+    return _frame(SAMPLE, b"".join(parts))
+
+
+def encode_landmarks(t_ms, landmarks, handedness):
+    """Raw (N, 21, 3) landmarks and handedness codes; 127 bytes per hand instead of MediaPipe's protobufs."""
+    n = min(len(landmarks), MAX_HANDS)
+    hands = np.zeros(n, dtype=_LANDMARK_HAND)
+    if n:
+        hands["handedness"] = handedness[:n]
+        hands["landmarks"] = landmarks[:n]
+    return _frame(LANDMARKS, _SAMPLE.pack(int(t_ms) & 0xFFFFFFFF, n) + hands.tobytes())
+
+
+def encode_phase(phase_code, start_ms, cat_code, countdown):
+    return _frame(PHASE, _PHASE.pack(phase_code, start_ms & 0xFFFFFFFF, cat_code, countdown))
+
+
+def encode_result(player_code, cat_code, outcome, reveal_ms, end_ms):
+    return _frame(RESULT, _RESULT.pack(player_code, cat_code, outcome, min(int(reveal_ms), 0xFFFF),
+                                       end_ms & 0xFFFFFFFF))
+
+
+def decode(msg_type, payload):
+    """Payload -> tuple of fields (see the module docstring). Raises ValueError on malformed input."""
+    try:
+        if msg_type == SAMPLE:
+            # Plain struct unpacking: for one or two hands it is several times faster than NumPy
+            t_ms, n = _SAMPLE.unpack_from(payload)
+            if len(payload) != _SAMPLE.size + n * _SAMPLE_HAND.size:
+                raise ValueError(f"SAMPLE with {n} hands has {len(payload)} bytes")
+            hands = list(_SAMPLE_HAND.iter_unpack(payload[_SAMPLE.size:]))
+            return (t_ms, [h[0] for h in hands], [h[1] / 255.0 for h in hands],
+                    [(h[2] / 65535.0, h[3] / 65535.0) for h in hands])
+        if msg_type == LANDMARKS:
+            t_ms, n = _SAMPLE.unpack_from(payload)
+            hands = np.frombuffer(payload, dtype=_LANDMARK_HAND, count=n, offset=_SAMPLE.size)
+            return t_ms, hands["landmarks"].astype(np.float32), hands["handedness"]
+        fmt = {HELLO: _HELLO, WELCOME: _WELCOME, PING: _PING, PONG: _PONG, PHASE: _PHASE, RESULT: _RESULT}[msg_type]
+        return fmt.unpack(payload)
+    except (KeyError, struct.error) as exc:
+        raise ValueError(f"bad message type {msg_type} ({len(payload)} bytes): {exc}") from None
+
+
+class MessageReader:
+    """Splits a byte stream into messages; one read() of the socket usually carries many samples."""
+
+    def __init__(self, reader, chunk_size=65536):
+        self.reader = reader
+        self.chunk_size = chunk_size
+        self._buffer = bytearray()
+
+    async def read(self):
+        """Every complete message received so far, as [(type, payload)] (waits for at least one).
+
+        Raises asyncio.IncompleteReadError at end of stream.
+        """
+        while True:
+            messages = self._split()
+            if messages:
+                return messages
+            data = await self.reader.read(self.chunk_size)
+            if not data:
+                raise asyncio.IncompleteReadError(bytes(self._buffer), None)
+            self._buffer += data
+
+    def _split(self):
+        buf = self._buffer
+        messages = []
+        pos = 0
+        while len(buf) - pos >= HEADER.size:
+            length, msg_type = HEADER.unpack_from(buf, pos)
+            end = pos + HEADER.size + length
+            if end > len(buf):
+                break
+            messages.append((msg_type, bytes(buf[pos + HEADER.size:end])))
+            pos = end
+        del buf[:pos]
+        return messages
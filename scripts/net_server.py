@@ -0,0 +1,262 @@
+"""Networked Paw-Punch server: remote players against the cat over TCP (asyncio).
+
+Usage:
+    python scripts/net_server.py [--host 0.0.0.0] [--port 7777] [--playout-ms 150] [--stats-db rounds.db]
+
+Clients (net_client.py) run capture, MediaPipe and the gesture rules locally
+and send one small SAMPLE per inference (see net_protocol.py). The server runs
+a GameSession per connected player: start trigger, countdown, reveal vote and
+result, with the cat's move picked here.
+
+Latency compensation: samples carry the server-clock time their frame was
+captured. Each player's session runs `playout_ms` behind the server clock and
+consumes samples in capture order through a small jitter buffer, stepping the
+session to each sample's own time first. A sample delayed or reordered by up
+to playout_ms therefore lands in the same phase (and the same reveal vote) as
+if it had arrived instantly; later ones are counted as late and dropped.
+Clients render the countdown from the phase start times in PHASE messages, so
+the playout delay doesn't show on their screen.
+
+Capacity: every session is stepped on the event loop, so one server process
+uses one core and its tick grows with the player count. bench_net.py (15
+samples/s per player, 30 Hz tick, clients on the same single core) measured
+a mean tick of 5-8 ms and under 0.5% late samples at 200 players; at 400 the
+tick averages 20 ms, overruns its 33 ms budget and over a third of the samples
+arrive late. Plan for about 200 players per server process and check
+`slow_ticks` in the stats before adding more.
+"""
+import argparse
+import asyncio
+import heapq
+import itertools
+import random
+import sys
+import time
+
+import net_protocol as proto
+from game_session import PHASES, GameSession
+from gesture_classifier import classify_batch, gesture_name
+from round_engine import NO_MOVE, RESULT_TEXT
+from stats_store import StatsRecorder
+
+# Reveal: paw moves 150 px at 2.5 px per 60 Hz step = 1 s, as in check_timing.py
+NET_PAW = {"cat_start_y": -50, "cat_target_y": 100, "cat_speed": 2.5}
+_OUTCOME_CODES = {text: code for code, text in RESULT_TEXT.items()}
+# A client that lets this much output pile up (not reading) is disconnected
+MAX_WRITE_BUFFER = 64 * 1024
+
+
+class RemotePlayer:
+    """One connection's GameSession plus the jitter buffer that feeds it in capture order."""
+
+    def __init__(self, player_id, writer, session, on_result=None):
+        self.player_id = player_id
+        self.writer = writer
+        self.session = session
+        self.on_result = on_result
+        self._pending = []            # heap of (t_ms, seq, gestures, confidences, positions)
+        self._seq = itertools.count()
+        self.session_ms = None        # time the session has been advanced to
+        self.phase = session.phase
+        self.samples = 0
+        self.late = 0
+        self.rounds = 0
+
+    def push(self, t_ms, gestures, confidences, positions, now_ms):
+        self.samples += 1
+        # A client clock running ahead can't schedule samples in the server's future
+        t_ms = min(t_ms, now_ms)
+        if self.session_ms is not None and t_ms < self.session_ms:
+            self.late += 1
+            return
+        heapq.heappush(self._pending, (t_ms, next(self._seq), gestures, confidences, positions))
+
+    def advance(self, session_ms):
+        """Replay buffered samples up to session_ms in capture order, then step the session to it."""
+        pending = self._pending
+        if not pending and self.phase == "idle":
+            # Nothing to replay and nothing time-driven until a sample starts a round
+            self.session_ms = session_ms
+            return
+        while pending and pending[0][0] <= session_ms:
+            t_ms, _, gestures, confidences, positions = heapq.heappop(pending)
+            self._step(t_ms)
+            self.session.on_inference(gestures, t_ms, confidences, positions)
+        self._step(session_ms)
+        self.session_ms = session_ms
+
+    def _step(self, t_ms):
+        session = self.session
+        finished = session.update(t_ms)
+        if session.phase != self.phase:
+            self.phase = session.phase
+            cat = proto.gesture_code(session.cat_gesture) if self.phase in ("reveal", "result") else -1
+            self.send(proto.encode_phase(PHASES.index(self.phase), session.engine.phase_start, cat,
+                                         session.countdown))
+        if finished:
+            self.rounds += 1
+            engine = session.engine
+            outcome = _OUTCOME_CODES.get(finished, NO_MOVE)
+            self.send(proto.encode_result(proto.gesture_code(engine.player_gesture),
+                                          proto.gesture_code(engine.cat_gesture), outcome, engine.reveal_ms, t_ms))
+            if self.on_result:
+                self.on_result(self, finished)
+
+    def send(self, data):
+        transport = self.writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            transport.abort()
+            return
+        self.writer.write(data)
+
+
+class NetServer:
+    """Accepts players, feeds their samples into per-player sessions and ticks all sessions together."""
+
+    def __init__(self, playout_ms=150, tick_hz=30.0, countdown=3, result_ms=3000, strategy="uniform",
+                 stats=None, station=0, seed=None):
+        self.playout_ms = playout_ms
+        self.tick_s = 1.0 / tick_hz
+        self.countdown = countdown
+        self.result_ms = result_ms
+        self.strategy = strategy
+        self.stats_recorder = stats
+        self.station = station
+        self.rng = random.Random(seed)
+        self.players = {}
+        self._ids = itertools.count(1)
+        self._t0 = time.monotonic()
+        self.rounds = 0
+        self.late = 0
+        self.samples = 0
+        self.connections = 0
+        self.ticks = 0
+        self.tick_ms_max = 0.0
+        self.tick_ms_total = 0.0
+        self.slow_ticks = 0   # ticks that took longer than the tick period (sessions fall behind)
+
+    def now_ms(self):
+        return int((time.monotonic() - self._t0) * 1000)
+
+    async def serve(self, host, port, ready=None):
+        server = await asyncio.start_server(self._handle, host, port)
+        ticker = asyncio.create_task(self._tick_loop())
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            ticker.cancel()
+
+    async def _tick_loop(self):
+        next_tick = time.monotonic()
+        while True:
+            t0 = time.monotonic()
+            session_ms = self.now_ms() - self.playout_ms
+            if session_ms >= 0:
+                for player in list(self.players.values()):
+                    player.advance(session_ms)
+            elapsed = time.monotonic() - t0
+            self.ticks += 1
+            self.tick_ms_total += elapsed * 1000
+            self.tick_ms_max = max(self.tick_ms_max, elapsed * 1000)
+            if elapsed > self.tick_s:
+                self.slow_ticks += 1
+            next_tick = max(next_tick + self.tick_s, time.monotonic())
+            await asyncio.sleep(next_tick - time.monotonic())
+
+    def _result(self, player, result_text):
+        self.rounds += 1
+        if self.stats_recorder:
+            engine = player.session.engine
+            self.stats_recorder.record(self.station, engine.player_gesture, engine.cat_gesture, result_text,
+                                       engine.reveal_ms)
+
+    async def _handle(self, reader, writer):
+        player = None
+        messages = proto.MessageReader(reader)
+        try:
+            batch = await messages.read()
+            msg_type, payload = batch.pop(0)
+            if msg_type != proto.HELLO or proto.decode(msg_type, payload)[0] != proto.VERSION:
+                return
+            player_id = next(self._ids)
+            session = GameSession(station_id=player_id, rng=random.Random(self.rng.getrandbits(64)),
+                                  countdown=self.countdown, result_ms=self.result_ms, strategy=self.strategy,
+                                  **NET_PAW)
+            player = RemotePlayer(player_id, writer, session, self._result)
+            self.players[player_id] = player
+            self.connections += 1
+            writer.write(proto.encode_welcome(player_id, self.now_ms()))
+            while True:
+                for msg_type, payload in batch:
+                    self._on_message(player, msg_type, payload)
+                batch = await messages.read()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ValueError as exc:
+            print(f"player {player.player_id if player else '?'}: {exc}")
+        finally:
+            if player is not None:
+                self.samples += player.samples
+                self.late += player.late
+                del self.players[player.player_id]
+            writer.close()
+
+    def _on_message(self, player, msg_type, payload):
+        if msg_type == proto.SAMPLE:
+            t_ms, codes, confidences, positions = proto.decode(msg_type, payload)
+            player.push(t_ms, [gesture_name(c) for c in codes], confidences, positions, self.now_ms())
+        elif msg_type == proto.LANDMARKS:
+            t_ms, landmarks, handedness = proto.decode(msg_type, payload)
+            codes = classify_batch(landmarks, handedness) if len(landmarks) else []
+            player.push(t_ms, [gesture_name(c) for c in codes], None, landmarks[:, 0, :2].tolist(),
+                        self.now_ms())
+        elif msg_type == proto.PING:
+            player.writer.write(proto.encode_pong(proto.decode(msg_type, payload)[0], self.now_ms()))
+        else:
+            raise ValueError(f"unexpected message type {msg_type}")
+
+    def stats(self):
+        players = list(self.players.values())
+        samples = self.samples + sum(p.samples for p in players)
+        late = self.late + sum(p.late for p in players)
+        return {"players": len(players), "connections": self.connections, "rounds": self.rounds,
+                "samples": samples, "late_samples": late,
+                "mean_tick_ms": self.tick_ms_total / self.ticks if self.ticks else 0.0,
+                "max_tick_ms": self.tick_ms_max, "ticks": self.ticks, "slow_ticks": self.slow_ticks}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--playout-ms", type=int, default=150,
+                        help="how far sessions run behind the server clock (network jitter tolerated)")
+    parser.add_argument("--tick-hz", type=float, default=30.0, help="session update rate")
+    parser.add_argument("--result-ms", type=int, default=3000, help="how long each result is shown")
+    parser.add_argument("--cat-strategy", default="uniform", choices=("uniform", "frequency", "markov"))
+    parser.add_argument("--stats-db", metavar="PATH", help="record every round in this stats database")
+    parser.add_argument("--station", type=int, default=0, help="station id recorded with --stats-db")
+    args = parser.parse_args()
+
+    stats = StatsRecorder(args.stats_db) if args.stats_db else None
+    server = NetServer(args.playout_ms, args.tick_hz, result_ms=args.result_ms, strategy=args.cat_strategy,
+                       stats=stats, station=args.station)
+    print(f"Paw-Punch server on {args.host}:{args.port} (playout {args.playout_ms} ms)")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("Server stats:", server.stats())
+        if stats:
+            stats.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
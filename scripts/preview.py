@@ -0,0 +1,62 @@
+"""Camera preview for the Paw-Punch HUD without per-frame allocations.
+
+The RGB frame that was already prepared for MediaPipe is downscaled by OpenCV
+straight into one preallocated preview-sized buffer. A pygame surface created
+with pygame.image.frombuffer shares that buffer's memory, so after the first
+frame there is no color conversion, no full-resolution surface and no new
+array or surface per frame.
+"""
+import cv2
+import numpy as np
+import pygame
+
+
+def fit_size(src_w, src_h, max_w, max_h):
+    """Largest (w, h) with the source aspect ratio that fits inside (max_w, max_h)."""
+    aspect = src_w / src_h
+    if max_w / max_h > aspect:
+        return int(max_h * aspect), max_h
+    return max_w, int(max_w / aspect)
+
+
+class CameraPreview:
+    """Preview-sized RGB buffer + a pygame surface that views the same memory."""
+
+    def __init__(self, max_size):
+        self.max_w, self.max_h = max_size
+        self.buffer = None
+        self.surface = None
+        self._source_shape = None
+        self._frame_index = None
+        self.allocations = 0
+
+    def _allocate(self, frame_rgb):
+        src_h, src_w = frame_rgb.shape[:2]
+        w, h = fit_size(src_w, src_h, self.max_w, self.max_h)
+        self.buffer = np.empty((h, w, 3), dtype=np.uint8)
+        # frombuffer doesn't copy: the surface reads whatever is in self.buffer at blit time
+        self.surface = pygame.image.frombuffer(self.buffer, (w, h), 'RGB')
+        self._source_shape = frame_rgb.shape
+        self.allocations += 1
+
+    def resize(self, max_size):
+        """New preview bounds; the buffer is reallocated from the next frame."""
+        self.max_w, self.max_h = max_size
+        self.buffer = self.surface = None
+        self._frame_index = None
+
+    def update(self, frame_rgb, frame_index=None):
+        """Downscale a new RGB frame into the preview buffer; no-op if frame_index was already shown."""
+        if frame_index is not None and frame_index == self._frame_index:
+            return False
+        if self.buffer is None or frame_rgb.shape != self._source_shape:
+            self._allocate(frame_rgb)
+        h, w = self.buffer.shape[:2]
+        out = cv2.resize(frame_rgb, (w, h), dst=self.buffer, interpolation=cv2.INTER_AREA)
+        if out is not self.buffer:
+            np.copyto(self.buffer, out)
+        self._frame_index = frame_index
+        return True
+
+    def get_size(self):
+        return self.surface.get_size() if self.surface is not None else (0, 0)
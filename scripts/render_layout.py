@@ -0,0 +1,51 @@
+"""Display mode and resolution-independent layout for Paw-Punch.
+
+All positions, font sizes and speeds in Paw-Punch.py were tuned for an 800x480
+window. Layout scales them by window height / 480 (the paw atlas in assets.py
+scales the same way, and is cached per window size), so the game looks the
+same on a 480p panel and a 4K TV.
+"""
+import pygame
+
+DESIGN_SIZE = (800, 480)
+
+
+def parse_size(text):
+    """"1280x720" -> (1280, 720) (argparse type)."""
+    w, sep, h = text.lower().partition("x")
+    if not sep or not w.isdigit() or not h.isdigit() or int(w) <= 0 or int(h) <= 0:
+        raise ValueError(f"expected WIDTHxHEIGHT, got {text!r}")
+    return int(w), int(h)
+
+
+def open_window(size, fullscreen=False, vsync=False):
+    """Create the display surface. fullscreen with size=None uses the desktop resolution."""
+    flags = pygame.FULLSCREEN if fullscreen else 0
+    if size is None:
+        size = (0, 0) if fullscreen else DESIGN_SIZE
+    if vsync:
+        try:
+            # SDL only honours vsync for renderer-backed windows, hence SCALED
+            return pygame.display.set_mode(size, flags | pygame.SCALED, vsync=1)
+        except pygame.error:
+            pass  # no vsync on this driver: fall back to a plain window
+    return pygame.display.set_mode(size, flags)
+
+
+class Layout:
+    """Maps 800x480 design coordinates and sizes to the actual window."""
+
+    def __init__(self, size, design_size=DESIGN_SIZE):
+        self.width, self.height = size
+        self.scale = self.height / float(design_size[1])
+
+    def px(self, value):
+        """Design pixels -> window pixels."""
+        return int(round(value * self.scale))
+
+    def font(self, size):
+        return max(8, self.px(size))
+
+    @property
+    def center(self):
+        return self.width // 2, self.height // 2
@@ -0,0 +1,64 @@
+"""Re-evaluate recorded traces with different classifier thresholds, without MediaPipe.
+
+Usage:
+    python scripts/Paw-Punch.py --record-trace venue.trace          # record while playing
+    python scripts/replay_trace.py venue.trace --thresh-y 0.05      # replay with a new threshold
+
+Prints the gesture distribution recorded live vs. re-classified, how many hand
+classifications changed, the rounds the game would have played and how many
+inferences replay in a different phase than the one recorded live.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from gesture_classifier import THRESH_THUMB_X, THRESH_Y
+from trace_log import MAX_HANDS, RoundReplay, TraceReader, gesture_histogram, reclassify
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a Paw-Punch landmark trace")
+    parser.add_argument("trace", nargs="+", help="trace file(s) written with --record-trace")
+    parser.add_argument("--thresh-y", type=float, default=THRESH_Y)
+    parser.add_argument("--thresh-thumb-x", type=float, default=THRESH_THUMB_X)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    for path in args.trace:
+        reader = TraceReader(path)
+        if not len(reader):
+            print(f"{path}: empty trace")
+            continue
+        # Chunk by chunk from the memory map: a trace of hours is never loaded at once
+        recorded_hist, reclassified_hist = {}, {}
+        hands = changed = 0
+        replays = {"recorded": RoundReplay(), "re-classified": RoundReplay()}
+        for records in reader.chunks():
+            codes = reclassify(records, args.thresh_y, args.thresh_thumb_x)
+            valid = np.arange(MAX_HANDS)[None, :] < records["n_hands"][:, None]
+            hands += int(valid.sum())
+            changed += int((codes[valid] != records["gesture"][valid]).sum())
+            for hist, chunk_codes in ((recorded_hist, records["gesture"]), (reclassified_hist, codes)):
+                for name, count in gesture_histogram(records, chunk_codes).items():
+                    hist[name] = hist.get(name, 0) + count
+            replays["recorded"].feed(records)
+            replays["re-classified"].feed(records, codes)
+        duration = float(reader.index["t_last"][-1] - reader.index["t_first"][0])
+
+        print(f"{path}: {len(reader)} inferences over {duration / 60.0:.1f} min, {hands} hands")
+        print("  recorded gestures:    ", recorded_hist)
+        print("  re-classified (thresh_y=%.3f, thresh_thumb_x=%.3f):" % (args.thresh_y, args.thresh_thumb_x),
+              reclassified_hist)
+        print(f"  hands whose gesture changed: {changed}")
+        for label, replay in replays.items():
+            outcomes = {}
+            for result, _, _ in replay.results:
+                outcomes[result] = outcomes.get(result, 0) + 1
+            print(f"  rounds ({label}): {len(replay.results)} {outcomes}, phase differs from the recording in "
+                  f"{replay.mismatches} inferences")
+    print("Replay took %.2fs" % (time.perf_counter() - t0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Pure Rock-Paper-Scissors round logic: rules, cat strategies, phase state machine, batch simulation.
+
+Nothing here touches pygame, the camera or wall-clock time, so rounds can be
+simulated as fast as NumPy allows (see tournament.py / bench_round_engine.py).
+
+Gestures are codes ROCK=0, PAPER=1, SCISSORS=2 (as in gesture_classifier), so
+the outcome of a round is `(player - cat) % 3`: 0 draw, 1 player wins, 2 cat wins.
+
+Cat strategies all work on a batch of n independent games at once (n=1 for the
+live game): choose(rng) returns one move per game, observe(player, cat)
+updates their state after a round.
+    uniform    -- random move (the original cat)
+    frequency  -- counters the player's most frequent move so far (optionally decayed)
+    markov     -- counters the move the player most often made after their last `order` moves
+"""
+import numpy as np
+
+GESTURES = ("rock", "paper", "scissors")
+PHASES = ("idle", "countdown", "reveal", "result")
+DRAW, PLAYER_WINS, CAT_WINS = 0, 1, 2
+NO_MOVE = 3  # round ended without a player gesture (determine_result's "No Move")
+RESULT_TEXT = {DRAW: "Draw", PLAYER_WINS: "You Win!", CAT_WINS: "You Lose!"}
+
+
+def outcome(player, cat):
+    """Outcome code(s) for gesture code(s); works on scalars and arrays."""
+    return (np.asarray(player) - np.asarray(cat)) % 3
+
+
+def counter(move):
+    """The move that beats `move` (codes, scalars or arrays)."""
+    return (np.asarray(move) + 1) % 3
+
+
+def determine_result(player, cat):
+    """Determine result of the round.
+    Normalizes inputs and handles invalid input by returning "No Move".
+    Returns: "Draw" / "You Win!" / "You Lose!" / "No Move"
+    """
+    if not player or not cat:
+        return "No Move"
+    p = str(player).lower()
+    c = str(cat).lower()
+    if p not in GESTURES or c not in GESTURES:
+        # Unknown gestures never win (the old string comparison treated them as a loss)
+        return "Draw" if p == c else "You Lose!"
+    return RESULT_TEXT[int(outcome(GESTURES.index(p), GESTURES.index(c)))]
+
+
+# =======================
+# Cat strategies
+# =======================
+class UniformStrategy:
+    name = "uniform"
+
+    def __init__(self, n=1):
+        self.n = n
+
+    def choose(self, rng):
+        return rng.integers(0, 3, size=self.n)
+
+    def observe(self, player, cat):
+        pass
+
+
+class FrequencyStrategy:
+    name = "frequency"
+
+    def __init__(self, n=1, decay=1.0):
+        self.n = n
+        self.decay = decay
+        self.counts = np.zeros((n, 3))
+
+    def choose(self, rng):
+        # Tiny noise breaks ties randomly (and makes the first round uniform)
+        predicted = np.argmax(self.counts + rng.random((self.n, 3)) * 1e-3, axis=1)
+        return counter(predicted)
+
+    def observe(self, player, cat):
+        if self.decay != 1.0:
+            self.counts *= self.decay
+        self.counts[np.arange(self.n), player] += 1.0
+
+
+class MarkovStrategy:
+    name = "markov"
+
+    def __init__(self, n=1, order=1):
+        self.n = n
+        self.order = order
+        self.states = 3 ** order
+        self.transitions = np.zeros((n, self.states, 3))
+        self.state = np.zeros(n, dtype=np.int64)  # last `order` player moves, base 3
+        self.seen = 0
+
+    def choose(self, rng):
+        rows = self.transitions[np.arange(self.n), self.state]
+        predicted = np.argmax(rows + rng.random((self.n, 3)) * 1e-3, axis=1)
+        if self.seen < self.order:
+            return rng.integers(0, 3, size=self.n)
+        return counter(predicted)
+
+    def observe(self, player, cat):
+        if self.seen >= self.order:
+            self.transitions[np.arange(self.n), self.state, player] += 1.0
+        self.state = (self.state * 3 + player) % self.states
+        self.seen += 1
+
+
+STRATEGIES = {cls.name: cls for cls in (UniformStrategy, FrequencyStrategy, MarkovStrategy)}
+
+
+def make_strategy(name, n=1, **kwargs):
+    try:
+        return STRATEGIES[name](n, **kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown cat strategy {name!r} (choose from {', '.join(STRATEGIES)})") from None
+
+
+# =======================
+# Round state machine
+# =======================
+class RoundEngine:
+    """Phases of one station: idle -> countdown -> reveal -> result -> idle.
+
+    Callers supply integer millisecond timestamps. Transitions only happen from
+    the phase they belong to (a start while a round is running is ignored).
+    """
+
+    def __init__(self, strategy="uniform", countdown=3, result_ms=5000, rng=None):
+        self.strategy = make_strategy(strategy) if isinstance(strategy, str) else strategy
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.countdown = countdown
+        self.result_ms = result_ms
+        self.phase = "idle"
+        self.phase_start = 0
+        self.cat_gesture = None
+        self.player_gesture = None
+        self.result_text = ""
+        self.reveal_ms = 0  # how long the last reveal took (shorter once the reveal vote decides)
+        self.history = []  # (player, cat, result text) per finished round
+
+    def start(self, now_ms):
+        """Player triggered a round; returns False (and does nothing) unless idle."""
+        if self.phase != "idle":
+            return False
+        self._enter("countdown", now_ms)
+        return True
+
+    def countdown_remaining(self, now_ms):
+        return max(0, self.countdown - (now_ms - self.phase_start) // 1000)
+
+    def tick(self, now_ms):
+        """Time-driven transitions: countdown -> reveal (cat picks its move) and result -> idle.
+
+        Returns the phase that was entered, or None.
+        """
+        if self.phase == "countdown" and self.countdown_remaining(now_ms) <= 0:
+            self.cat_gesture = GESTURES[int(self.strategy.choose(self.rng)[0])]
+            self._enter("reveal", now_ms)
+            return "reveal"
+        if self.phase == "result" and now_ms - self.phase_start > self.result_ms:
+            self._enter("idle", now_ms)
+            return "idle"
+        return None
+
+    def finish(self, player_gesture, now_ms):
+        """End the reveal with the player's gesture (None = no move); returns the result text."""
+        if self.phase != "reveal":
+            return None
+        self.player_gesture = player_gesture
+        self.reveal_ms = now_ms - self.phase_start
+        self.result_text = determine_result(player_gesture, self.cat_gesture)
+        if player_gesture in GESTURES:
+            self.strategy.observe(np.array([GESTURES.index(player_gesture)]),
+                                  np.array([GESTURES.index(self.cat_gesture)]))
+        self.history.append((player_gesture, self.cat_gesture, self.result_text))
+        self._enter("result", now_ms)
+        return self.result_text
+
+    def _enter(self, phase, now_ms):
+        self.phase = phase
+        self.phase_start = now_ms
+
+
+# =======================
+# Batch simulation
+# =======================
+def _uniform_player(prev_player, prev_cat, prev_outcome, rng, n):
+    return rng.integers(0, 3, size=n)
+
+
+def _biased_player(prev_player, prev_cat, prev_outcome, rng, n, p=(0.45, 0.30, 0.25)):
+    # People throw rock more often than 1/3
+    return rng.choice(3, size=n, p=p)
+
+
+def _cycle_player(prev_player, prev_cat, prev_outcome, rng, n):
+    return (prev_player + 1) % 3
+
+
+def _sticky_player(prev_player, prev_cat, prev_outcome, rng, n, stay=0.6):
+    return np.where(rng.random(n) < stay, prev_player, rng.integers(0, 3, size=n))
+
+
+def _win_stay_lose_shift_player(prev_player, prev_cat, prev_outcome, rng, n):
+    # Repeat a winning move, otherwise play what would have beaten the cat's last move
+    return np.where(prev_outcome == PLAYER_WINS, prev_player, counter(prev_cat))
+
+
+PLAYER_MODELS = {
+    "uniform": _uniform_player,
+    "biased": _biased_player,
+    "cycle": _cycle_player,
+    "sticky": _sticky_player,
+    "win-stay-lose-shift": _win_stay_lose_shift_player,
+}
+
+
+def simulate(strategy, player_model, games=10000, rounds=100, seed=0, **strategy_kwargs):
+    """Play `games` independent games of `rounds` rounds, all games advanced together per round.
+
+    Returns {"rounds", "draw", "player_wins", "cat_wins"} with rates over all rounds.
+    """
+    rng = np.random.default_rng(seed)
+    cat_strategy = make_strategy(strategy, games, **strategy_kwargs)
+    player_fn = PLAYER_MODELS[player_model]
+    totals = np.zeros(3, dtype=np.int64)
+    prev_player = rng.integers(0, 3, size=games)
+    prev_cat = rng.integers(0, 3, size=games)
+    prev_outcome = np.full(games, DRAW)
+    for _ in range(rounds):
+        player = player_fn(prev_player, prev_cat, prev_outcome, rng, games)
+        cat = cat_strategy.choose(rng)
+        result = outcome(player, cat)
+        totals += np.bincount(result, minlength=3)
+        cat_strategy.observe(player, cat)
+        prev_player, prev_cat, prev_outcome = player, cat, result
+    n = float(games * rounds)
+    return {"rounds": games * rounds, "draw": totals[DRAW] / n, "player_wins": totals[PLAYER_WINS] / n,
+            "cat_wins": totals[CAT_WINS] / n}
@@ -0,0 +1,230 @@
+"""Opt-in round clips: the composited screen (and optionally the camera frame) from countdown to result.
+
+The render loop only copies bytes: capture() takes a free buffer from a fixed
+ring, copies the screen surface's raw pixels into it (one memcpy, no per-pixel
+conversion) and queues the buffer's index. A background thread converts,
+scales and encodes the frames with cv2.VideoWriter (OpenCV releases the GIL
+while it works), one file per round, and hands each buffer back to the ring
+as soon as it has been converted. When every buffer is still waiting for the
+encoder the frame is dropped and counted: recording never blocks rendering.
+A frame or clip the encoder fails on is counted in `errors` and skipped; its
+buffer still goes back to the ring and the thread carries on.
+
+Clips run at a fixed rate whatever the render rate: a frame is only captured
+when one is due, and a frame standing in for several due ticks (a slow frame,
+a stall, a dropped frame) is written that many times, so clip time stays wall
+time.
+"""
+import collections
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# BGR channel order -> cvtColor code, for the byte orders pygame surfaces come in
+_TO_BGR = {
+    (4, (0, 1, 2)): cv2.COLOR_BGRA2BGR,
+    (4, (2, 1, 0)): cv2.COLOR_RGBA2BGR,
+    (3, (0, 1, 2)): None,
+    (3, (2, 1, 0)): cv2.COLOR_RGB2BGR,
+}
+
+
+def surface_format(surface):
+    """(width, height, pitch, bytes per pixel, byte index of B, G, R) of a 24/32-bit surface."""
+    width, height = surface.get_size()
+    r_shift, g_shift, b_shift, _ = surface.get_shifts()
+    return width, height, surface.get_pitch(), surface.get_bytesize(), (b_shift // 8, g_shift // 8, r_shift // 8)
+
+
+def raw_to_bgr(raw, fmt):
+    """Contiguous (H, W, 3) BGR image from the raw bytes of a surface with format fmt."""
+    width, height, pitch, bpp, order = fmt
+    pixels = raw.reshape(height, pitch)[:, :width * bpp].reshape(height, width, bpp)
+    code = _TO_BGR.get((bpp, order), -1)
+    if code == -1:
+        return np.ascontiguousarray(pixels[:, :, list(order)])
+    return np.ascontiguousarray(pixels) if code is None else cv2.cvtColor(pixels, code)
+
+
+class RoundRecorder:
+    """Writes one clip per round from a bounded ring of frame buffers on a background encoder thread."""
+
+    def __init__(self, directory, fps=15.0, scale=1.0, camera=False, slots=8, fourcc="mp4v", extension=".mp4",
+                 prefix="round"):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fps = fps
+        self.scale = scale
+        self.camera = camera
+        self.fourcc = fourcc
+        self.extension = extension
+        self.prefix = prefix
+        self.slots = slots
+        self._screen = [None] * slots   # raw surface bytes per slot, allocated on first use
+        self._camera = [None] * slots   # RGB camera frame per slot (camera=True)
+        self._free = collections.deque(range(slots))  # append / popleft are atomic: no lock needed
+        self._queue = queue.SimpleQueue()
+        self.recording = False
+        self._next_due = 0.0
+        self._format = None
+        self.clips_started = 0
+        self.clips_written = 0
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_encoded = 0
+        self.frames_written = 0   # including repeats
+        self.capture_ms = 0.0     # render-thread time spent in capture()
+        self.encode_ms = 0.0      # encoder-thread time per captured frame: convert, scale, write
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name="round-recorder", daemon=True)
+        self._thread.start()
+
+    def start_clip(self, now_ms):
+        """A round started (countdown): frames captured from now on go into a new clip."""
+        if self.recording:
+            self.end_clip()
+        self.recording = True
+        self._next_due = now_ms
+        self._format = None
+        self.clips_started += 1
+        name = "%s-%s-%04d" % (self.prefix, time.strftime("%Y%m%d-%H%M%S"), self.clips_started)
+        self._queue.put(("open", os.path.join(self.directory, name)))
+
+    def end_clip(self, tag=None):
+        """The round is over; tag (e.g. "win") is appended to the file name."""
+        if self.recording:
+            self.recording = False
+            self._queue.put(("close", tag))
+
+    def capture(self, surface, now_ms, camera_rgb=None):
+        """Copy the composited frame if a clip frame is due. Never waits; returns True if a frame was queued."""
+        if not self.recording or now_ms < self._next_due:
+            return False
+        t0 = time.perf_counter()
+        try:
+            slot = self._free.popleft()
+        except IndexError:
+            # Encoder is behind: drop this one; the next frame that gets through covers its time
+            self.frames_dropped += 1
+            return False
+        if self._format is None:
+            if surface.get_bytesize() not in (3, 4):
+                surface = surface.convert(32)  # 8/16-bit displays: one extra conversion per frame
+            self._format = surface_format(surface)
+        elif surface.get_bytesize() not in (3, 4):
+            surface = surface.convert(32)
+        raw = np.frombuffer(surface.get_buffer(), dtype=np.uint8)
+        buf = self._screen[slot]
+        if buf is None or buf.shape != raw.shape:
+            buf = self._screen[slot] = np.empty_like(raw)
+        np.copyto(buf, raw)
+        has_camera = self.camera and camera_rgb is not None
+        if has_camera:
+            cam = self._camera[slot]
+            if cam is None or cam.shape != camera_rgb.shape:
+                cam = self._camera[slot] = np.empty_like(camera_rgb)
+            # The capture ring reuses its buffers, so the frame is copied, not referenced
+            np.copyto(cam, camera_rgb)
+        period = 1000.0 / self.fps
+        repeat = 1 + int((now_ms - self._next_due) // period)
+        self._next_due += repeat * period
+        self._queue.put(("frame", slot, repeat, self._format, has_camera))
+        self.frames_captured += 1
+        self.capture_ms += (time.perf_counter() - t0) * 1000.0
+        return True
+
+    def _open_writer(self, path, image):
+        h, w = image.shape[:2]
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (w, h))
+        if not writer.isOpened():
+            self.errors += 1
+            print(f"recorder: cannot write {path}")
+            return None
+        return writer
+
+    def _scaled(self, image):
+        if self.scale == 1.0:
+            return image
+        h, w = image.shape[:2]
+        size = (max(2, int(w * self.scale) // 2 * 2), max(2, int(h * self.scale) // 2 * 2))
+        return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+    def _run(self):
+        self._base = None
+        self._writers = {}  # "screen" / "camera" -> cv2.VideoWriter (None if it failed to open)
+        while True:
+            item = self._queue.get()
+            try:
+                self._handle(item)
+            except (cv2.error, OSError, ValueError) as exc:
+                # One bad frame or clip must not stop the encoder: count it and go on with the next item
+                self.errors += 1
+                print(f"recorder: {item[0]} failed ({exc})")
+            if item[0] == "stop":
+                return
+
+    def _handle(self, item):
+        kind = item[0]
+        if kind == "frame":
+            _, slot, repeat, fmt, has_camera = item
+            t0 = time.perf_counter()
+            try:
+                images = {"screen": raw_to_bgr(self._screen[slot], fmt)}
+                if has_camera:
+                    images["camera"] = cv2.cvtColor(self._camera[slot], cv2.COLOR_RGB2BGR)
+            finally:
+                self._free.append(slot)  # converted copies from here on (or nothing to keep): refill the buffer
+            for key, image in images.items():
+                image = self._scaled(image)
+                if key not in self._writers:
+                    suffix = "" if key == "screen" else "-camera"
+                    self._writers[key] = self._open_writer(self._base + suffix + ".part" + self.extension, image)
+                if self._writers[key] is not None:
+                    for _ in range(repeat):
+                        self._writers[key].write(image)
+            self.encode_ms += (time.perf_counter() - t0) * 1000.0
+            self.frames_encoded += 1
+            self.frames_written += repeat
+        elif kind in ("close", "stop", "open"):
+            if self._base is not None:
+                base, writers = self._base, self._writers
+                self._base, self._writers = None, {}
+                self._finish(base, writers, item[1] if kind == "close" else None)
+            if kind == "open":
+                self._base = item[1]
+
+    def _finish(self, base, writers, tag):
+        """Release the clip's writers and give the files their final names."""
+        for key, writer in writers.items():
+            if writer is None:
+                continue
+            writer.release()
+            suffix = "" if key == "screen" else "-camera"
+            final = base + ("-" + tag if tag else "") + suffix + self.extension
+            try:
+                os.replace(base + suffix + ".part" + self.extension, final)
+            except OSError as exc:
+                self.errors += 1
+                print(f"recorder: cannot rename clip ({exc})")
+        if any(w is not None for w in writers.values()):
+            self.clips_written += 1
+
+    def stats(self):
+        encoded = max(self.frames_encoded, 1)
+        offered = self.frames_captured + self.frames_dropped
+        return {"clips": self.clips_written, "frames": self.frames_captured, "dropped": self.frames_dropped,
+                "drop_rate": round(self.frames_dropped / offered, 4) if offered else 0.0,
+                "capture_ms": round(self.capture_ms / max(self.frames_captured, 1), 3),
+                "encode_ms": round(self.encode_ms / encoded, 3),
+                "encode_fps": round(self.frames_encoded / (self.encode_ms / 1000.0), 1) if self.encode_ms else 0.0,
+                "backlog": self.slots - len(self._free), "errors": self.errors}
+
+    def close(self):
+        """Finish the clip in progress and wait for the encoder to write everything queued."""
+        self.end_clip()
+        self._queue.put(("stop", None))
+        self._thread.join()
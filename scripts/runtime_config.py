@@ -0,0 +1,250 @@
+"""Runtime tuning: named performance profiles, a validated JSON config file and hot reload.
+
+A config is a dict of sections (render / inference / classifier / smoothing).
+It starts from DEFAULTS, applies the chosen profile, then the file's own
+values, so a config file only lists what it changes:
+
+    {
+        "profile": "low-power",
+        "inference": {"idle_hz": 8},
+        "classifier": {"thresh_y": 0.05}
+    }
+
+Profiles trade CPU for responsiveness:
+    low-power  -- lite MediaPipe model, one hand, fewer inferences, 30 fps, smaller preview
+    balanced   -- the defaults
+    quality    -- full model on a larger search frame, inference on every frame, larger preview
+
+ConfigWatcher re-reads the file when its modification time changes; an
+invalid file is reported and the previous config stays active. Paw-Punch.py
+applies a new config without reopening the camera (only the MediaPipe graphs
+are rebuilt, and only when a graph setting changed). ProfileMeter measures what
+the active profile costs (CPU, inference time, frame rate) for the overlay.
+"""
+import copy
+import json
+import os
+import time
+
+DEFAULTS = {
+    "render": {
+        "fps": 60,                     # render frame rate cap, 0 = uncapped
+        "show_landmarks": False,       # draw hand landmarks on the camera preview
+        "preview_scale": 0.25,         # camera preview size as a fraction of the window
+        "cat_speed": 2.5,              # paw pixels per 60 Hz step (800x480 layout)
+        "bg_speed": [0.25, 0.125],     # background scroll pixels per 60 Hz step (x, y)
+    },
+    "inference": {
+        "max_num_hands": 2,
+        "model_complexity": 1,         # MediaPipe Hands: 0 = lite, 1 = full
+        "min_detection_confidence": 0.5,
+        "min_tracking_confidence": 0.5,
+        "idle_hz": 15.0,               # inference rate while waiting for the start gesture
+        "reveal_hz": None,             # during the reveal; None = every captured frame
+        "search_width": 320,           # full-frame searches are downscaled to this width (0 = full size)
+        "use_roi": True,               # crop around the last hand while it keeps being found
+    },
+    "classifier": {
+        "thresh_y": 0.04,
+        "thresh_thumb_x": 0.03,
+    },
+    "smoothing": {
+        "start_frames": 3,
+        "reveal_frames": 5,
+        "reveal_half_life": 2.0,
+        "reveal_share": 0.75,
+        "reveal_min_weight": 1.5,
+    },
+}
+
+PROFILES = {
+    "low-power": {
+        "render": {"fps": 30, "preview_scale": 0.2},
+        "inference": {"max_num_hands": 1, "model_complexity": 0, "idle_hz": 6.0, "reveal_hz": 15.0,
+                      "search_width": 256},
+    },
+    "balanced": {},
+    "quality": {
+        "render": {"preview_scale": 0.3},
+        "inference": {"idle_hz": 30.0, "search_width": 480},
+    },
+}
+
+# (type(s), minimum, maximum) per setting; None bounds are open
+_SPEC = {
+    "render": {
+        "fps": (int, 0, 240),
+        "show_landmarks": (bool, None, None),
+        "preview_scale": ((int, float), 0.05, 0.5),
+        "cat_speed": ((int, float), 0.1, 50.0),
+        "bg_speed": (list, None, None),
+    },
+    "inference": {
+        "max_num_hands": (int, 1, 4),
+        "model_complexity": (int, 0, 1),
+        "min_detection_confidence": ((int, float), 0.0, 1.0),
+        "min_tracking_confidence": ((int, float), 0.0, 1.0),
+        "idle_hz": ((int, float), 0.0, 120.0),
+        "reveal_hz": ((int, float, type(None)), 0.0, 120.0),
+        "search_width": (int, 0, 4096),
+        "use_roi": (bool, None, None),
+    },
+    "classifier": {
+        "thresh_y": ((int, float), 0.0, 0.5),
+        "thresh_thumb_x": ((int, float), 0.0, 0.5),
+    },
+    "smoothing": {
+        "start_frames": (int, 1, 30),
+        "reveal_frames": (int, 1, 60),
+        "reveal_half_life": ((int, float), 0.0, 60.0),
+        "reveal_share": ((int, float), 0.5, 1.0),
+        "reveal_min_weight": ((int, float), 0.0, 60.0),
+    },
+}
+# Changing any of these needs new MediaPipe graphs
+GRAPH_SETTINGS = ("max_num_hands", "model_complexity", "min_detection_confidence", "min_tracking_confidence")
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def _merge(base, overrides, where):
+    for section, values in overrides.items():
+        if section == "profile":
+            continue
+        if section not in _SPEC:
+            raise ConfigError(f"{where}: unknown section {section!r} (expected one of {', '.join(_SPEC)})")
+        if not isinstance(values, dict):
+            raise ConfigError(f"{where}: section {section!r} must be an object")
+        for key, value in values.items():
+            if key not in _SPEC[section]:
+                raise ConfigError(f"{where}: unknown setting {section}.{key}")
+            base[section][key] = value
+    return base
+
+
+def validate(config):
+    """Raise ConfigError naming the first setting with a wrong type or out-of-range value."""
+    for section, spec in _SPEC.items():
+        for key, (types, lo, hi) in spec.items():
+            value = config[section][key]
+            name = f"{section}.{key}"
+            # bool is an int subclass; only accept it where a bool is expected
+            if not isinstance(value, types) or (isinstance(value, bool) and types is not bool):
+                raise ConfigError(f"{name}: {value!r} has the wrong type")
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                if (lo is not None and value < lo) or (hi is not None and value > hi):
+                    raise ConfigError(f"{name}: {value!r} is outside [{lo}, {hi}]")
+    bg = config["render"]["bg_speed"]
+    if len(bg) != 2 or not all(isinstance(v, (int, float)) for v in bg):
+        raise ConfigError(f"render.bg_speed: expected [x, y] pixels per step, got {bg!r}")
+    return config
+
+
+def build_config(profile="balanced", overrides=None, where="config"):
+    """DEFAULTS + profile + overrides, validated. overrides may name its own "profile"."""
+    overrides = overrides or {}
+    profile = overrides.get("profile", profile)
+    if profile not in PROFILES:
+        raise ConfigError(f"{where}: unknown profile {profile!r} (choose from {', '.join(PROFILES)})")
+    config = _merge(copy.deepcopy(DEFAULTS), PROFILES[profile], f"profile {profile}")
+    config = _merge(config, overrides, where)
+    config["profile"] = profile
+    return validate(config)
+
+
+def load_config(path, profile="balanced"):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as exc:
+        raise ConfigError(f"{path}: {exc}") from None
+    if not isinstance(data, dict):
+        raise ConfigError(f"{path}: expected a JSON object")
+    return build_config(profile, data, where=path)
+
+
+def changed_settings(old, new):
+    """{(section, key)} whose values differ between two configs."""
+    return {(section, key) for section in _SPEC for key in _SPEC[section]
+            if old[section][key] != new[section][key]}
+
+
+class ConfigWatcher:
+    """Polls a config file's modification time; poll() returns a new config when it changed and is valid."""
+
+    def __init__(self, path, profile="balanced", interval=1.0):
+        self.path = path
+        self.profile = profile
+        self.interval = interval
+        self._mtime = None
+        self._last_check = 0.0
+        self.reloads = 0
+        self.errors = 0
+        self.last_error = None
+
+    def load(self):
+        """Initial load; a missing or invalid file at startup is an error the caller reports."""
+        self._mtime = os.stat(self.path).st_mtime
+        return load_config(self.path, self.profile)
+
+    def poll(self, now=None):
+        now = time.perf_counter() if now is None else now
+        if now - self._last_check < self.interval:
+            return None
+        self._last_check = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return None
+        if mtime == self._mtime:
+            return None
+        self._mtime = mtime
+        try:
+            config = load_config(self.path, self.profile)
+        except (OSError, ConfigError) as exc:
+            # Keep running on the previous config; report once per bad version of the file
+            self.errors += 1
+            self.last_error = str(exc)
+            print(f"Config not reloaded: {exc}")
+            return None
+        self.reloads += 1
+        self.last_error = None
+        return config
+
+
+class ProfileMeter:
+    """CPU share, frame rate and mean inference time since the active profile was (re)applied."""
+
+    def __init__(self):
+        self.profile = None
+        self.reset(None)
+
+    def reset(self, profile):
+        self.profile = profile
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self.frames = 0
+        self.inferences = 0
+        self.inference_ms = 0.0
+
+    def frame(self):
+        self.frames += 1
+
+    def inference(self, inference_ms):
+        self.inferences += 1
+        self.inference_ms += inference_ms
+
+    def summary(self):
+        wall = time.perf_counter() - self._wall0
+        return {"profile": self.profile,
+                "cpu_percent": (time.process_time() - self._cpu0) / wall * 100.0 if wall > 0 else 0.0,
+                "fps": self.frames / wall if wall > 0 else 0.0,
+                "inferences_per_s": self.inferences / wall if wall > 0 else 0.0,
+                "mean_inference_ms": self.inference_ms / self.inferences if self.inferences else 0.0}
+
+    def line(self):
+        s = self.summary()
+        return "profile %s: cpu %.0f%%  %.0f fps  %.1f inf/s @ %.1f ms" % (
+            s["profile"], s["cpu_percent"], s["fps"], s["inferences_per_s"], s["mean_inference_ms"])
@@ -0,0 +1,153 @@
+"""Lightweight per-stage timers for the Paw-Punch main loop.
+
+Usage:
+    timer = StageTimer()
+    timer.start("render")
+    ...
+    timer.stop("render")
+    print(timer.format_report(frames, wall_seconds))
+
+A disabled timer (StageTimer(enabled=False)) turns start/stop into no-ops so the
+calls can stay in the main loop permanently. With `window` set, only the most
+recent samples per stage are kept (rolling percentiles for the live overlay);
+the count and sum of every sample ever recorded are kept as well (for exporting
+as monotonic counters). Worker threads report durations they measured
+themselves with record(). A stage timed in several sections of one frame uses
+pause() after each section and flush() once per frame, so it counts as one sample.
+"""
+import math
+import time
+from collections import deque
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = int(math.ceil(pct / 100.0 * len(sorted_values))) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, k))]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if the platform doesn't expose it)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    if peak > 1 << 32:
+        return peak / (1024.0 * 1024.0)
+    return peak / 1024.0
+
+
+class Milestones:
+    """Wall-clock milestones since a start time (ms), e.g. for time-to-first-frame at startup."""
+
+    def __init__(self, t0=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.marks = {}
+
+    def mark(self, name):
+        """Record `name` once (later marks of the same name are ignored); returns its time in ms."""
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - self.t0) * 1000.0
+        return self.marks[name]
+
+    def format_report(self):
+        return "Startup (ms since launch): " + ", ".join("%s %.1f" % (n, ms) for n, ms in self.marks.items())
+
+
+class StageTimer:
+    """Collects wall-clock durations (ms) per named stage."""
+
+    def __init__(self, enabled=True, window=None):
+        self.enabled = enabled
+        self.window = window
+        self.samples = {}
+        self.totals = {}  # {stage: [count, sum ms]} since the start, unaffected by the window
+        self._open = {}
+        self._pending = {}
+
+    def start(self, name):
+        if self.enabled:
+            self._open[name] = time.perf_counter()
+
+    def stop(self, name):
+        if not self.enabled:
+            return
+        t0 = self._open.pop(name, None)
+        if t0 is not None:
+            self.record(name, (time.perf_counter() - t0) * 1000.0)
+
+    def pause(self, name):
+        """Stop timing `name` but keep adding up its time until flush(name)."""
+        if not self.enabled:
+            return
+        t0 = self._open.pop(name, None)
+        if t0 is not None:
+            self._pending[name] = self._pending.get(name, 0.0) + (time.perf_counter() - t0) * 1000.0
+
+    def flush(self, name):
+        """Record the time added up by pause() since the last flush as one sample."""
+        ms = self._pending.pop(name, None)
+        if ms is not None:
+            self.record(name, ms)
+
+    def record(self, name, ms):
+        """Add a duration measured elsewhere (e.g. on the capture or inference thread)."""
+        if not self.enabled:
+            return
+        values = self.samples.get(name)
+        if values is None:
+            values = self.samples[name] = deque(maxlen=self.window)
+        values.append(ms)
+        total = self.totals.get(name)
+        if total is None:
+            total = self.totals[name] = [0, 0.0]
+        total[0] += 1
+        total[1] += ms
+
+    def reset(self):
+        self.samples = {}
+        self.totals = {}
+        self._open = {}
+        self._pending = {}
+
+    def summary(self):
+        """{stage: {"count", "mean", "p50", "p95", "p99", "max", "total_count", "total_ms"}} in milliseconds.
+
+        count .. max describe the window; total_count / total_ms every sample since the start.
+        """
+        out = {}
+        for name, values in list(self.samples.items()):
+            # copy() is atomic, so worker threads may keep recording while we sort
+            ordered = sorted(values.copy())
+            if not ordered:
+                continue
+            total_count, total_ms = self.totals.get(name, (len(ordered), sum(ordered)))
+            stats = {"count": len(ordered), "mean": sum(ordered) / len(ordered), "max": ordered[-1],
+                     "total_count": total_count, "total_ms": total_ms}
+            for pct in PERCENTILES:
+                stats["p%d" % pct] = percentile(ordered, pct)
+            out[name] = stats
+        return out
+
+    def format_report(self, frames, wall_seconds, stage_order=()):
+        fps = frames / wall_seconds if wall_seconds > 0 else 0.0
+        lines = ["Frames: %d in %.2fs (%.1f frames/sec)" % (frames, wall_seconds, fps)]
+        summary = self.summary()
+        names = [n for n in stage_order if n in summary] + sorted(n for n in summary if n not in stage_order)
+        lines.append("%-14s %7s %8s %8s %8s %8s %8s" % ("stage (ms)", "count", "mean", "p50", "p95", "p99", "max"))
+        for name in names:
+            s = summary[name]
+            lines.append("%-14s %7d %8.2f %8.2f %8.2f %8.2f %8.2f" % (
+                name, s["count"], s["mean"], s["p50"], s["p95"], s["p99"], s["max"]))
+        rss = peak_rss_mb()
+        lines.append("Peak RSS: %s" % ("%.1f MB" % rss if rss is not None else "n/a"))
+        return "\n".join(lines)
@@ -0,0 +1,77 @@
+"""Print round statistics from a Paw-Punch stats database.
+
+Usage:
+    python scripts/stats_report.py paw-punch.db                 # last 24 hours, per station
+    python scripts/stats_report.py paw-punch.db --hours 168 --station 2 --hourly
+
+Recorded with `Paw-Punch.py --stats-db paw-punch.db` or `arena.py --stats-db ...`.
+The totals come from the hourly rollups (see stats_store.py); --check also
+computes them from the raw rounds and compares the two, with timings.
+"""
+import argparse
+import sys
+import time
+
+from stats_store import open_existing, query_hourly, query_summary, query_summary_raw
+
+
+def print_summary(summary):
+    print("%-8s %9s %8s %8s %8s %8s %7s %7s %9s %11s" % (
+        "station", "rounds", "win", "lose", "draw", "no move", "rock", "paper", "scissors", "reveal ms"))
+    for station, s in summary.items():
+        gestures = s["rock"] + s["paper"] + s["scissors"] or 1
+        print("%-8d %9d %7.1f%% %7.1f%% %7.1f%% %8d %6.1f%% %6.1f%% %8.1f%% %11.0f" % (
+            station, s["rounds"], 100 * s["player_wins_rate"], 100 * s["cat_wins_rate"], 100 * s["draw_rate"],
+            s["no_move"], 100 * s["rock"] / gestures, 100 * s["paper"] / gestures, 100 * s["scissors"] / gestures,
+            s["mean_reveal_ms"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("db", help="stats database (Paw-Punch.py --stats-db)")
+    parser.add_argument("--hours", type=float, default=24.0, help="report the last N hours")
+    parser.add_argument("--station", type=int, help="only this station")
+    parser.add_argument("--hourly", action="store_true", help="also list rounds and win rates per hour")
+    parser.add_argument("--check", action="store_true", help="compare rollup totals with a raw scan and time both")
+    args = parser.parse_args()
+
+    try:
+        conn = open_existing(args.db)
+    except FileNotFoundError:
+        print(f"No stats database at {args.db}")
+        return 1
+    until = time.time()
+    since = until - args.hours * 3600
+    t0 = time.perf_counter()
+    summary = query_summary(conn, since, until, args.station)
+    query_ms = (time.perf_counter() - t0) * 1000
+    print("Last %g hours (%s - %s), %.2f ms" % (args.hours, time.strftime("%Y-%m-%d %H:%M", time.localtime(since)),
+                                                 time.strftime("%Y-%m-%d %H:%M", time.localtime(until)), query_ms))
+    if not summary:
+        print("No rounds recorded in this period")
+    else:
+        print_summary(summary)
+
+    if args.hourly:
+        print()
+        print("%-8s %-17s %8s %8s %8s" % ("station", "hour", "rounds", "win", "lose"))
+        for station, hour, rounds, player_wins, cat_wins, draw in query_hourly(conn, since, until, args.station):
+            print("%-8d %-17s %8d %7.1f%% %7.1f%%" % (
+                station, time.strftime("%Y-%m-%d %H:00", time.localtime(hour)), rounds,
+                100 * player_wins / rounds, 100 * cat_wins / rounds))
+
+    failed = False
+    if args.check:
+        t0 = time.perf_counter()
+        raw = query_summary_raw(conn, since, until, args.station)
+        raw_ms = (time.perf_counter() - t0) * 1000
+        failed = raw != summary
+        print()
+        print("raw scan %.2f ms vs rollups %.2f ms (%.0fx): %s" % (
+            raw_ms, query_ms, raw_ms / max(query_ms, 1e-6), "MISMATCH" if failed else "totals match"))
+    conn.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
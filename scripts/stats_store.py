@@ -0,0 +1,241 @@
+"""Persistent round statistics: append-only SQLite (WAL) store with hourly rollups.
+
+Every finished round becomes one row in `rounds` (time, station, player and
+cat gesture codes, outcome, reveal duration). The same transaction adds the
+round to `rollup_hourly`, one row per (station, hour) with outcome counts,
+player gesture counts and the reveal time sum, so "last 24 hours per station"
+reads at most 24 rollup rows per station plus the rounds of the partial first
+hour (found through the (station, t) index) instead of scanning every round.
+
+StatsRecorder never blocks the caller: record() puts a tuple on a queue and a
+background thread writes whatever has arrived every `flush_s` seconds, in
+transactions of up to `batch_size` rounds. Readers (stats_report.py)
+can query the database while a game is writing to it.
+
+Gesture codes are ROCK=0, PAPER=1, SCISSORS=2 (as in round_engine); a round
+without a player move is stored with player -1 and outcome NO_MOVE.
+"""
+import math
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from round_engine import CAT_WINS, DRAW, GESTURES, NO_MOVE, PLAYER_WINS, RESULT_TEXT
+
+OUTCOMES = (DRAW, PLAYER_WINS, CAT_WINS, NO_MOVE)
+OUTCOME_NAMES = {DRAW: "draw", PLAYER_WINS: "player_wins", CAT_WINS: "cat_wins", NO_MOVE: "no_move"}
+_OUTCOME_CODES = {text: code for code, text in RESULT_TEXT.items()}
+HOUR = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    t REAL NOT NULL,            -- unix time the result was shown
+    station INTEGER NOT NULL,
+    player INTEGER NOT NULL,    -- gesture code, -1 = no move
+    cat INTEGER NOT NULL,
+    outcome INTEGER NOT NULL,   -- DRAW / PLAYER_WINS / CAT_WINS / NO_MOVE
+    reveal_ms INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rounds_station_t ON rounds (station, t);
+CREATE TABLE IF NOT EXISTS rollup_hourly (
+    station INTEGER NOT NULL,
+    hour INTEGER NOT NULL,      -- floor(t / 3600)
+    rounds INTEGER NOT NULL,
+    draw INTEGER NOT NULL,
+    player_wins INTEGER NOT NULL,
+    cat_wins INTEGER NOT NULL,
+    no_move INTEGER NOT NULL,
+    rock INTEGER NOT NULL,
+    paper INTEGER NOT NULL,
+    scissors INTEGER NOT NULL,
+    reveal_ms_sum INTEGER NOT NULL,
+    PRIMARY KEY (station, hour)
+) WITHOUT ROWID;
+"""
+
+_COUNT_COLUMNS = ("rounds", "draw", "player_wins", "cat_wins", "no_move", "rock", "paper", "scissors",
+                  "reveal_ms_sum")
+_UPSERT = ("INSERT INTO rollup_hourly (station, hour, %s) VALUES (?, ?, %s) "
+           "ON CONFLICT (station, hour) DO UPDATE SET %s" % (
+               ", ".join(_COUNT_COLUMNS), ", ".join("?" * len(_COUNT_COLUMNS)),
+               ", ".join("%s = %s + excluded.%s" % (c, c, c) for c in _COUNT_COLUMNS)))
+
+
+def encode_round(station, player_gesture, cat_gesture, result_text, reveal_ms, t=None):
+    """One `rounds` row from what the game knows when a round ends."""
+    player = GESTURES.index(player_gesture) if player_gesture in GESTURES else -1
+    outcome = _OUTCOME_CODES.get(result_text, NO_MOVE) if player >= 0 else NO_MOVE
+    return (time.time() if t is None else t, int(station), player, GESTURES.index(cat_gesture), outcome,
+            int(reveal_ms))
+
+
+def connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL + NORMAL: a crash can lose the last batch, never corrupt the file
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def write_batch(conn, rows):
+    """Append rounds and fold them into the hourly rollups in one transaction."""
+    rollups = {}
+    for t, station, player, cat, outcome, reveal_ms in rows:
+        key = (station, int(t // HOUR))
+        counts = rollups.get(key)
+        if counts is None:
+            counts = rollups[key] = [0] * len(_COUNT_COLUMNS)
+        counts[0] += 1
+        counts[1 + outcome] += 1
+        if player >= 0:
+            counts[5 + player] += 1
+        counts[8] += reveal_ms
+    with conn:
+        conn.executemany("INSERT INTO rounds VALUES (?, ?, ?, ?, ?, ?)", rows)
+        conn.executemany(_UPSERT, [key + tuple(counts) for key, counts in rollups.items()])
+
+
+class StatsRecorder:
+    """Queues finished rounds and writes them from a background thread in batches."""
+
+    def __init__(self, path, flush_s=1.0, batch_size=512):
+        self.path = path
+        self.flush_s = flush_s
+        self.batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self.rounds_written = 0
+        self.batches_written = 0
+        self.errors = 0
+        # Open (and create) the database up front so a bad path fails at startup, not in the thread
+        self._conn = connect(path)
+        self._thread = threading.Thread(target=self._run, name="stats-writer", daemon=True)
+        self._thread.start()
+
+    def record(self, station, player_gesture, cat_gesture, result_text, reveal_ms, t=None):
+        """Called from the render loop when a round ends; only enqueues."""
+        self._queue.put(encode_round(station, player_gesture, cat_gesture, result_text, reveal_ms, t))
+
+    def record_rows(self, rows):
+        for row in rows:
+            self._queue.put(row)
+
+    def _drain(self):
+        rows = []
+        while len(rows) < self.batch_size:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _run(self):
+        while True:
+            stopping = self._stop.wait(self.flush_s)
+            while True:
+                rows = self._drain()
+                if not rows:
+                    break
+                try:
+                    write_batch(self._conn, rows)
+                    self.rounds_written += len(rows)
+                    self.batches_written += 1
+                except sqlite3.Error as exc:
+                    # Statistics are best effort: keep the game running (e.g. disk full, database locked)
+                    self.errors += 1
+                    print(f"stats: dropped {len(rows)} rounds ({exc})")
+            if stopping:
+                return
+
+    def stats(self):
+        return {"rounds_written": self.rounds_written, "batches": self.batches_written,
+                "pending": self._queue.qsize(), "errors": self.errors}
+
+    def close(self):
+        """Write everything still queued and close the database."""
+        self._stop.set()
+        self._thread.join()
+        self._conn.close()
+
+
+def _summary_from(row):
+    rounds = row[0] or 0
+    summary = {"rounds": rounds}
+    for i, name in enumerate(_COUNT_COLUMNS[1:8], start=1):
+        summary[name] = row[i] or 0
+    played = rounds - summary["no_move"]
+    for code in (DRAW, PLAYER_WINS, CAT_WINS):
+        name = OUTCOME_NAMES[code]
+        summary[name + "_rate"] = summary[name] / played if played else 0.0
+    summary["mean_reveal_ms"] = (row[8] or 0) / rounds if rounds else 0.0
+    return summary
+
+
+def query_summary(conn, since, until=None, station=None):
+    """Per-station totals for rounds with since <= t < until (unix seconds): {station: summary dict}.
+
+    Whole hours come from rollup_hourly; only the partial hours at either end read
+    individual rounds (an index range scan).
+    """
+    until = time.time() if until is None else until
+    first_full = math.ceil(since / HOUR)
+    last_full = math.floor(until / HOUR)  # exclusive
+    station_sql, station_args = ("AND station = ?", (station,)) if station is not None else ("", ())
+    totals = {}
+
+    def add(rows):
+        for st, *values in rows:
+            acc = totals.setdefault(st, [0] * len(_COUNT_COLUMNS))
+            for i, v in enumerate(values):
+                acc[i] += v or 0
+
+    if first_full < last_full:
+        add(conn.execute(
+            "SELECT station, %s FROM rollup_hourly WHERE hour >= ? AND hour < ? %s GROUP BY station" % (
+                ", ".join("SUM(%s)" % c for c in _COUNT_COLUMNS), station_sql),
+            (first_full, last_full) + station_args))
+        edges = [(since, first_full * HOUR), (last_full * HOUR, until)]
+    else:
+        edges = [(since, until)]
+    raw = ("SELECT station, COUNT(*), SUM(outcome = 0), SUM(outcome = 1), SUM(outcome = 2), SUM(outcome = 3), "
+           "SUM(player = 0), SUM(player = 1), SUM(player = 2), SUM(reveal_ms) FROM rounds "
+           "WHERE station = ? AND t >= ? AND t < ?")
+    stations = [station] if station is not None else [
+        r[0] for r in conn.execute("SELECT DISTINCT station FROM rollup_hourly")]
+    for lo, hi in edges:
+        if lo < hi:
+            for st in stations:
+                # Per station so each lookup is a range scan of the (station, t) index
+                add(r for r in conn.execute(raw + " GROUP BY station", (st, lo, hi)))
+    return {st: _summary_from(values) for st, values in sorted(totals.items())}
+
+
+def query_summary_raw(conn, since, until=None, station=None):
+    """Same result as query_summary() computed from the rounds table only (for checking the rollups)."""
+    until = time.time() if until is None else until
+    station_sql, station_args = ("AND station = ?", (station,)) if station is not None else ("", ())
+    rows = conn.execute(
+        "SELECT station, COUNT(*), SUM(outcome = 0), SUM(outcome = 1), SUM(outcome = 2), SUM(outcome = 3), "
+        "SUM(player = 0), SUM(player = 1), SUM(player = 2), SUM(reveal_ms) FROM rounds "
+        "WHERE t >= ? AND t < ? %s GROUP BY station" % station_sql, (since, until) + station_args)
+    return {st: _summary_from(values) for st, *values in rows}
+
+
+def query_hourly(conn, since, until=None, station=None):
+    """Rollup rows (station, hour start unix time, rounds, player_wins, cat_wins, draw) for a time range."""
+    until = time.time() if until is None else until
+    station_sql, station_args = ("AND station = ?", (station,)) if station is not None else ("", ())
+    return conn.execute(
+        "SELECT station, hour * %d, rounds, player_wins, cat_wins, draw FROM rollup_hourly "
+        "WHERE hour >= ? AND hour <= ? %s ORDER BY station, hour" % (HOUR, station_sql),
+        (int(since) // HOUR, int(until) // HOUR) + station_args).fetchall()
+
+
+def open_existing(path):
+    """Connection for reports; unlike connect() it doesn't create a missing database."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return connect(path)
@@ -0,0 +1,174 @@
+"""Procedural MediaPipe-style hand landmarks for rock / paper / scissors.
+
+A hand is a small parameter set: gesture, handedness, per-finger flexion
+(0 = straight, 1 = fully curled; thumb first), palm size, in-plane roll,
+yaw / pitch (foreshortening) and wrist position. render() turns any number of
+them into (N, 21, 3) landmarks in MediaPipe's normalized image coordinates,
+in the same layout results_to_arrays() produces, so they go straight into
+classify_batch() or a GameSession.
+
+Finger joints bend in the plane of the finger and towards the camera (-z), so
+a curled fingertip ends up below its PIP joint as in real detections. The
+thumb swings out to the thumb side (+x for a "Right" hand in the mirrored
+preview, as the classifier expects) when open and folds across the palm when
+closed. Noise, landmark jitter between frames and occlusion (one finger's
+outer joints hallucinated towards its knuckle) are applied on top.
+
+in_between() blends the flexion of two gestures: poses a player passes
+through while changing their mind, with no single right answer.
+"""
+import numpy as np
+
+from gesture_classifier import GESTURES, HAND_LEFT, HAND_RIGHT, HAND_UNKNOWN, NUM_LANDMARKS, PAPER, ROCK, SCISSORS
+
+# Flexion ranges per gesture: (low, high) for thumb, index, middle, ring, pinky
+FLEX_RANGES = {
+    ROCK: ((0.75, 1.0), (0.85, 1.0), (0.85, 1.0), (0.85, 1.0), (0.85, 1.0)),
+    PAPER: ((0.0, 0.2), (0.0, 0.15), (0.0, 0.15), (0.0, 0.15), (0.0, 0.15)),
+    SCISSORS: ((0.0, 1.0), (0.0, 0.15), (0.0, 0.15), (0.85, 1.0), (0.85, 1.0)),
+}
+
+# Hand geometry in palm lengths (wrist -> middle knuckle = 1), x towards the thumb, y up the palm
+KNUCKLES = np.array([(0.30, 0.95), (0.10, 1.0), (-0.10, 0.95), (-0.30, 0.85)])   # index..pinky MCP
+SEGMENTS = np.array([(0.42, 0.25, 0.20), (0.47, 0.29, 0.21), (0.43, 0.27, 0.20), (0.33, 0.20, 0.18)])
+SPREAD_DEG = np.array([8.0, 0.0, -6.0, -12.0])   # fan-out of straight fingers
+MAX_FLEX_DEG = np.array([80.0, 100.0, 60.0])     # MCP, PIP, DIP at flexion 1
+THUMB_BASE = (0.18, 0.12)                        # CMC
+THUMB_SEGMENTS = np.array([0.32, 0.28, 0.24])    # CMC->MCP, MCP->IP, IP->TIP
+THUMB_OPEN_DEG = np.array([55.0, 55.0, 55.0])    # away from the palm, from vertical
+THUMB_CLOSED_DEG = np.array([35.0, -20.0, -80.0])
+
+# Default variation of a generated hand
+DEFAULT_RANGES = {
+    "scale": (0.14, 0.26),        # palm length as a fraction of the frame height
+    "roll_deg": (-20.0, 20.0),
+    "yaw_deg": (-35.0, 35.0),
+    "pitch_deg": (-25.0, 25.0),
+    "center_x": (0.3, 0.7),       # wrist position
+    "center_y": (0.6, 0.9),
+}
+
+
+def sample_params(n, rng, gestures=None, unknown_handedness=0.05, **ranges):
+    """Parameters of n random hands. gestures: codes per hand (default: uniform over the three)."""
+    r = dict(DEFAULT_RANGES, **ranges)
+    gestures = rng.integers(0, len(GESTURES), n) if gestures is None else np.asarray(gestures)
+    flex = np.empty((n, 5))
+    for code, finger_ranges in FLEX_RANGES.items():
+        mask = gestures == code
+        lo, hi = np.array(finger_ranges).T
+        flex[mask] = rng.uniform(lo, hi, size=(int(mask.sum()), 5))
+    side = np.where(rng.random(n) < 0.5, 1, -1)
+    handedness = np.where(side > 0, HAND_RIGHT, HAND_LEFT)
+    handedness[rng.random(n) < unknown_handedness] = HAND_UNKNOWN
+    return {
+        "gesture": gestures.astype(np.int8),
+        "handedness": handedness.astype(np.int8),
+        "side": side,
+        "flex": flex,
+        **{key: rng.uniform(lo, hi, n) for key, (lo, hi) in r.items()},
+    }
+
+
+def in_between(n, rng, **ranges):
+    """Hands blended 35-65% of the way between two different gestures; also returns both endpoints."""
+    a = rng.integers(0, len(GESTURES), n)
+    b = (a + rng.integers(1, len(GESTURES), n)) % len(GESTURES)
+    params = sample_params(n, rng, a, **ranges)
+    t = rng.uniform(0.35, 0.65, (n, 1))
+    params["flex"] = (1 - t) * params["flex"] + t * sample_params(n, rng, b, **ranges)["flex"]
+    return params, a.astype(np.int8), b.astype(np.int8)
+
+
+def jitter(params, rng, flex=0.03, roll_deg=2.0, move=0.005):
+    """The same hands one inference later: small changes in pose and position."""
+    out = dict(params)
+    n = len(params["flex"])
+    out["flex"] = np.clip(params["flex"] + rng.normal(0, flex, (n, 5)), 0.0, 1.0)
+    out["roll_deg"] = params["roll_deg"] + rng.normal(0, roll_deg, n)
+    out["center_x"] = params["center_x"] + rng.normal(0, move, n)
+    out["center_y"] = params["center_y"] + rng.normal(0, move, n)
+    return out
+
+
+def _bend(base, direction, lengths, angles):
+    """Joint positions of a chain starting at base, bending from `direction` (unit xy) towards the camera."""
+    points = []
+    p = base
+    total = np.zeros_like(angles[..., 0])
+    for k in range(lengths.shape[-1]):
+        total = total + angles[..., k]
+        c, s = np.cos(total)[..., None], np.sin(total)[..., None]
+        seg = np.concatenate([c * direction, -s], axis=-1) * lengths[..., k:k + 1]
+        p = p + seg
+        points.append(p)
+    return points
+
+
+def render(params, rng=None, noise=0.004, occlusion=0.0, aspect=4.0 / 3.0):
+    """(N, 21, 3) float32 landmarks for the hands in params.
+
+    noise: Gaussian jitter per coordinate (normalized units); occlusion: share of hands with one
+    finger hidden; aspect: frame width / height (x is normalized by the width).
+    """
+    rng = rng or np.random.default_rng()
+    flex = params["flex"]
+    n = len(flex)
+    side = params["side"][:, None].astype(float)
+    lm = np.zeros((n, NUM_LANDMARKS, 3))
+
+    # Thumb: CMC, then three segments whose in-plane angle goes from "open" to "across the palm"
+    lm[:, 1, 0] = THUMB_BASE[0] * side[:, 0]
+    lm[:, 1, 1] = THUMB_BASE[1]
+    theta = np.radians(THUMB_OPEN_DEG * (1 - flex[:, :1]) + THUMB_CLOSED_DEG * flex[:, :1])
+    p = lm[:, 1]
+    for k in range(3):
+        p = p + THUMB_SEGMENTS[k] * np.stack([side[:, 0] * np.sin(theta[:, k]), np.cos(theta[:, k]),
+                                              -0.1 * flex[:, 0]], axis=1)
+        lm[:, 2 + k] = p
+
+    # Fingers: knuckle, then PIP, DIP, TIP bent by flexion
+    for f in range(4):
+        base = np.zeros((n, 3))
+        base[:, 0] = KNUCKLES[f, 0] * side[:, 0]
+        base[:, 1] = KNUCKLES[f, 1]
+        spread = np.radians(SPREAD_DEG[f] * (1 - flex[:, f + 1]))
+        direction = np.stack([side[:, 0] * np.sin(spread), np.cos(spread)], axis=1)
+        angles = np.radians(flex[:, f + 1:f + 2] * MAX_FLEX_DEG)
+        lengths = np.broadcast_to(SEGMENTS[f], (n, 3))
+        first = 5 + 4 * f
+        lm[:, first] = base
+        for k, point in enumerate(_bend(base, direction, lengths, angles)):
+            lm[:, first + 1 + k] = point
+
+    if occlusion > 0:
+        # A hidden finger: MediaPipe still reports it, somewhere between its knuckle and the real pose
+        hidden = np.flatnonzero(rng.random(n) < occlusion)
+        finger = rng.integers(0, 5, len(hidden))
+        knuckle = 1 + 4 * finger  # thumb CMC or finger MCP; the three joints after it move
+        pull = rng.uniform(0.3, 1.0, (len(hidden), 1))
+        for k in (1, 2, 3):
+            idx = knuckle + k
+            lm[hidden, idx] += pull * (lm[hidden, knuckle] - lm[hidden, idx]) + rng.normal(0, 0.1, (len(hidden), 3))
+
+    # Pose: roll in the image plane, foreshortening from yaw / pitch, then palm size and position.
+    # y above is "up the palm"; image y grows downwards.
+    roll = np.radians(params["roll_deg"])[:, None]
+    x = lm[:, :, 0] * np.cos(np.radians(params["yaw_deg"]))[:, None]
+    y = lm[:, :, 1] * np.cos(np.radians(params["pitch_deg"]))[:, None]
+    xr = x * np.cos(roll) - y * np.sin(roll)
+    yr = x * np.sin(roll) + y * np.cos(roll)
+    scale = params["scale"][:, None]
+    out = np.empty((n, NUM_LANDMARKS, 3), dtype=np.float32)
+    out[:, :, 0] = params["center_x"][:, None] + xr * scale / aspect
+    out[:, :, 1] = params["center_y"][:, None] - yr * scale
+    out[:, :, 2] = lm[:, :, 2] * scale / aspect
+    if noise:
+        out += rng.normal(0, noise, out.shape).astype(np.float32)
+    return out
+
+
+def generate(n, rng, gestures=None, noise=0.004, occlusion=0.0, **ranges):
+    """n random hands: (landmarks (n, 21, 3), handedness (n,), gesture codes (n,))."""
+    params = sample_params(n, rng, gestures, **ranges)
+    return render(params, rng, noise, occlusion), params["handedness"], params["gesture"]
@@ -0,0 +1,100 @@
+"""Cached, pre-outlined text surfaces for the Paw-Punch HUD.
+
+Rendering an outlined string used to cost one font.render per outline offset
+(24 renders for width 2, 80 for width 4) every frame. Here each distinct
+(text, size, fg, outline, width) is rendered once: the glyphs are drawn a
+single time, the outline comes from one mask dilation (Mask.convolve with a
+square kernel, matching the old square offset pattern) and the finished
+surface is kept in a small LRU cache. Fonts are loaded once per size.
+"""
+import time
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """LRU cache of outlined text surfaces keyed by (text, size, fg, outline, width)."""
+
+    def __init__(self, max_entries=64, font_path=None):
+        self.max_entries = max_entries
+        self.font_path = font_path
+        self._fonts = {}
+        self._kernels = {}
+        self._surfaces = OrderedDict()  # key -> (surface, build_ms)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_ms = 0.0  # total render time avoided by cache hits
+        self.frame_hits = 0
+        self.frame_saved_ms = 0.0
+
+    def font(self, size):
+        font = self._fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(self.font_path, size)
+            self._fonts[size] = font
+        return font
+
+    def _kernel(self, width):
+        kernel = self._kernels.get(width)
+        if kernel is None:
+            kernel = pygame.mask.Mask((2 * width + 1, 2 * width + 1), fill=True)
+            self._kernels[width] = kernel
+        return kernel
+
+    def _build(self, text, size, fg, outline, width):
+        glyphs = self.font(size).render(text, True, fg)
+        if width <= 0:
+            return glyphs.convert_alpha() if pygame.display.get_surface() else glyphs
+        # Dilating the glyph mask by a (2w+1)^2 square covers every offset the old N^2 loop drew,
+        # and comes out already padded by `width` on each side
+        outline_mask = pygame.mask.from_surface(glyphs).convolve(self._kernel(width))
+        surf = outline_mask.to_surface(setcolor=tuple(outline)[:3] + (255,), unsetcolor=(0, 0, 0, 0))
+        surf.blit(glyphs, (width, width))
+        return surf.convert_alpha() if pygame.display.get_surface() else surf
+
+    def render(self, text, size, fg, outline, width=2):
+        """Outlined text surface; the glyphs start at (width, width) inside it."""
+        key = (text, size, tuple(fg), tuple(outline), width)
+        entry = self._surfaces.get(key)
+        if entry is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            self.frame_hits += 1
+            self.saved_ms += entry[1]
+            self.frame_saved_ms += entry[1]
+            return entry[0]
+        t0 = time.perf_counter()
+        surf = self._build(text, size, fg, outline, width)
+        self.misses += 1
+        self._surfaces[key] = (surf, (time.perf_counter() - t0) * 1000.0)
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def draw(self, surface, text, size, pos, fg, outline, width=2):
+        """Blit outlined text so the glyphs (not the outline) start at pos, like the old helper."""
+        surf = self.render(text, size, fg, outline, width)
+        return surface.blit(surf, (pos[0] - width, pos[1] - width))
+
+    def draw_centered(self, surface, text, size, center, fg, outline, width=2):
+        surf = self.render(text, size, fg, outline, width)
+        return surface.blit(surf, surf.get_rect(center=center))
+
+    def begin_frame(self):
+        """Reset the per-frame counters (call once at the start of every rendered frame)."""
+        self.frame_hits = 0
+        self.frame_saved_ms = 0.0
+
+    def stats(self):
+        return {
+            "entries": len(self._surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "saved_ms": self.saved_ms,
+            "frame_hits": self.frame_hits,
+            "frame_saved_ms": self.frame_saved_ms,
+        }
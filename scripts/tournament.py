@@ -0,0 +1,55 @@
+"""Headless cat-strategy tournament: every cat strategy against every simulated player model.
+
+Usage:
+    python scripts/tournament.py
+    python scripts/tournament.py --strategies uniform frequency:0.9 markov:1 markov:2 --games 50000 --rounds 300
+
+Strategy specs are NAME or NAME:PARAM (frequency:DECAY, markov:ORDER). Each
+cell is the cat's edge over the player (cat win rate - player win rate) over
+games x rounds simulated rounds; positive means the cat is winning.
+"""
+import argparse
+import sys
+import time
+
+from round_engine import PLAYER_MODELS, STRATEGIES, simulate
+
+
+def parse_strategy(spec):
+    name, _, param = spec.partition(":")
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown cat strategy {name!r} (choose from {', '.join(STRATEGIES)})")
+    kwargs = {}
+    if param:
+        kwargs = {"frequency": {"decay": float(param)}, "markov": {"order": int(param)}}.get(name, {})
+    return name, kwargs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strategies", nargs="+", default=["uniform", "frequency", "markov:1", "markov:2"])
+    parser.add_argument("--players", nargs="+", default=list(PLAYER_MODELS), choices=list(PLAYER_MODELS))
+    parser.add_argument("--games", type=int, default=20000, help="independent games per pairing")
+    parser.add_argument("--rounds", type=int, default=100, help="rounds per game")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    strategies = [(spec,) + parse_strategy(spec) for spec in args.strategies]
+    width = max(len(p) for p in args.players) + 2
+    print("%-14s" % "cat \\ player" + "".join("%*s" % (width, p) for p in args.players))
+    total_rounds = 0
+    t0 = time.perf_counter()
+    for spec, name, kwargs in strategies:
+        cells = []
+        for player in args.players:
+            r = simulate(name, player, args.games, args.rounds, args.seed, **kwargs)
+            total_rounds += r["rounds"]
+            cells.append("%+*.3f" % (width, r["cat_wins"] - r["player_wins"]))
+        print("%-14s" % spec + "".join(cells))
+    wall = time.perf_counter() - t0
+    print("%d rounds in %.2fs (%.2f M rounds/s)" % (total_rounds, wall, total_rounds / wall / 1e6))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""Landmark / gesture trace recording and memory-mapped replay.
+
+A trace holds one fixed-size record per MediaPipe inference: landmarks of up to
+MAX_HANDS hands (21x3 float32 each), their handedness, the gesture the
+classifier returned, the game phase and the start / reveal vote buffers.
+
+File layout (little endian, append-only):
+    header:  MAGIC, uint32 header length, JSON header (record dtype, created time)
+    chunks:  CHUNK_MAGIC, uint32 record count, then count raw records
+Next to it, "<trace>.idx" gets one INDEX_DTYPE row per chunk (file offset, count,
+first frame, first/last timestamp). The index is only an accelerator: if it is
+missing or shorter than the trace (e.g. after a crash) the chunks are found by
+scanning their headers.
+
+Appending to an existing trace continues its clock: the new session's times
+start SESSION_GAP_S after the last stored record, so "t" never goes backwards
+and a round left unfinished by the previous session times out in the gap.
+
+TraceReader memory-maps the file, so hours of records can be re-classified
+(e.g. with different THRESH_Y / THRESH_THUMB_X) without reading them into memory
+first, and RoundReplay drives GameSession from them without MediaPipe.
+"""
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+from game_session import GESTURES, PHASES, GameSession
+from gesture_classifier import GESTURE_CODES, NO_GESTURE, NUM_LANDMARKS, classify_batch, gesture_name
+
+MAGIC = b"PAWTRACE"
+CHUNK_MAGIC = b"CHNK"
+MAX_HANDS = 2
+BUFFER_SLOTS = 8  # room for the start / reveal vote buffers
+EMPTY_SLOT = -2   # unused buffer slot (NO_GESTURE = -1 is a real "uncertain" entry)
+SESSION_GAP_S = 10.0  # time between the last record of a trace and the first one appended to it
+
+RECORD_DTYPE = np.dtype([
+    ("frame", "<u4"),
+    ("t", "<f8"),                     # seconds since the recording started
+    ("phase", "u1"),                  # index into game_session.PHASES
+    ("n_hands", "u1"),
+    ("handedness", "i1", (MAX_HANDS,)),
+    ("gesture", "i1", (MAX_HANDS,)),  # classifier output per hand (gesture code, NO_GESTURE if None)
+    ("landmarks", "<f4", (MAX_HANDS, NUM_LANDMARKS, 3)),
+    ("start_buffer", "i1", (BUFFER_SLOTS,)),
+    ("final_buffer", "i1", (BUFFER_SLOTS,)),
+])
+INDEX_DTYPE = np.dtype([("offset", "<u8"), ("count", "<u4"), ("frame", "<u4"),
+                        ("t_first", "<f8"), ("t_last", "<f8")])
+_CHUNK_HEADER = struct.Struct("<4sI")
+
+
+def encode_gesture(gesture):
+    return GESTURE_CODES.get(gesture, NO_GESTURE)
+
+
+def encode_buffer(buffer):
+    out = np.full(BUFFER_SLOTS, EMPTY_SLOT, dtype=np.int8)
+    for i, g in enumerate(list(buffer)[-BUFFER_SLOTS:]):
+        out[i] = encode_gesture(g)
+    return out
+
+
+def decode_buffer(codes):
+    return [gesture_name(c) for c in codes if c != EMPTY_SLOT]
+
+
+class TraceWriter:
+    """Buffers records in memory and appends them to the trace one chunk at a time."""
+
+    def __init__(self, path, chunk_records=256):
+        self.path = path
+        self.chunk_records = chunk_records
+        self._chunk = np.zeros(chunk_records, dtype=RECORD_DTYPE)
+        self._n = 0
+        self.records_written = 0
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        start = 0.0
+        if not new_file:
+            index = TraceReader(path).index
+            if len(index):
+                # Appended records carry on from the last stored time instead of starting over at 0
+                start = float(index["t_last"][-1]) + SESSION_GAP_S
+            idx_path = path + ".idx"
+            if not os.path.exists(idx_path) or os.path.getsize(idx_path) != index.nbytes:
+                # Index lost or behind (crash): rewrite it, or appended entries would hide the chunks before them
+                index.tofile(idx_path)
+        self._t0 = time.perf_counter() - start
+        self._file = open(path, "ab")
+        self._index = open(path + ".idx", "ab")
+        if new_file:
+            header = json.dumps({"version": 1, "created": time.time(),
+                                 "dtype": RECORD_DTYPE.descr, "phases": PHASES}).encode("utf-8")
+            self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def write(self, frame_index, phase, landmarks, handedness, gestures, start_buffer=(), final_buffer=()):
+        """Append one inference: landmarks (N, 21, 3), handedness codes (N,), gestures per hand."""
+        chunk, i = self._chunk, self._n
+        n = min(len(landmarks), MAX_HANDS)
+        chunk["frame"][i] = frame_index
+        chunk["t"][i] = time.perf_counter() - self._t0
+        chunk["phase"][i] = PHASES.index(phase)
+        chunk["n_hands"][i] = n
+        chunk["handedness"][i] = 0
+        chunk["gesture"][i] = NO_GESTURE
+        chunk["landmarks"][i] = 0.0
+        if n:
+            chunk["landmarks"][i, :n] = landmarks[:n]
+            chunk["handedness"][i, :n] = handedness[:n]
+            chunk["gesture"][i, :n] = [encode_gesture(g) for g in gestures[:n]]
+        chunk["start_buffer"][i] = encode_buffer(start_buffer)
+        chunk["final_buffer"][i] = encode_buffer(final_buffer)
+        self._n += 1
+        if self._n == self.chunk_records:
+            self.flush()
+
+    def flush(self):
+        if not self._n:
+            return
+        chunk = self._chunk[:self._n]
+        offset = self._file.tell()
+        self._file.write(_CHUNK_HEADER.pack(CHUNK_MAGIC, self._n))
+        self._file.write(chunk.tobytes())
+        self._file.flush()
+        entry = np.array([(offset, self._n, chunk["frame"][0], chunk["t"][0], chunk["t"][-1])], dtype=INDEX_DTYPE)
+        self._index.write(entry.tobytes())
+        self._index.flush()
+        self.records_written += self._n
+        self._n = 0
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        self._index.close()
+
+
+class TraceReader:
+    """Memory-mapped read access to a trace file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._mm = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(self._mm[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"Not a Paw-Punch trace: {path}")
+        (header_len,) = struct.unpack("<I", bytes(self._mm[len(MAGIC):len(MAGIC) + 4]))
+        self._data_start = len(MAGIC) + 4 + header_len
+        self.header = json.loads(bytes(self._mm[len(MAGIC) + 4:self._data_start]).decode("utf-8"))
+        self.index = self._load_index()
+
+    def _load_index(self):
+        index = np.zeros(0, dtype=INDEX_DTYPE)
+        idx_path = self.path + ".idx"
+        if os.path.exists(idx_path):
+            index = np.fromfile(idx_path, dtype=INDEX_DTYPE)
+        end = int(index["offset"][-1]) + _CHUNK_HEADER.size + int(index["count"][-1]) * RECORD_DTYPE.itemsize \
+            if len(index) else self._data_start
+        if end < len(self._mm):
+            # Index is missing chunks: scan the chunk headers after the last indexed one
+            index = np.concatenate([index, self._scan(end)])
+        return index
+
+    def _scan(self, pos):
+        entries = []
+        size = len(self._mm)
+        while pos + _CHUNK_HEADER.size <= size:
+            magic, count = _CHUNK_HEADER.unpack(bytes(self._mm[pos:pos + _CHUNK_HEADER.size]))
+            data_end = pos + _CHUNK_HEADER.size + count * RECORD_DTYPE.itemsize
+            if magic != CHUNK_MAGIC or count == 0 or data_end > size:
+                break  # torn write at the end of the file
+            recs = self._records_at(pos, count)
+            entries.append((pos, count, recs["frame"][0], recs["t"][0], recs["t"][-1]))
+            pos = data_end
+        return np.array(entries, dtype=INDEX_DTYPE)
+
+    def _records_at(self, offset, count):
+        return np.ndarray((count,), dtype=RECORD_DTYPE, buffer=self._mm,
+                          offset=int(offset) + _CHUNK_HEADER.size)
+
+    def __len__(self):
+        return int(self.index["count"].sum())
+
+    def chunks(self):
+        """Zero-copy structured-array views, one per chunk."""
+        for entry in self.index:
+            yield self._records_at(entry["offset"], entry["count"])
+
+
+def reclassify(records, thresh_y=None, thresh_thumb_x=None):
+    """Re-run the classifier over every recorded hand; returns (N, MAX_HANDS) gesture codes."""
+    kwargs = {}
+    if thresh_y is not None:
+        kwargs["thresh_y"] = thresh_y
+    if thresh_thumb_x is not None:
+        kwargs["thresh_thumb_x"] = thresh_thumb_x
+    codes = classify_batch(records["landmarks"].reshape(-1, NUM_LANDMARKS, 3),
+                           records["handedness"].reshape(-1), **kwargs).reshape(len(records), MAX_HANDS)
+    # Slots beyond n_hands hold no hand
+    codes[np.arange(MAX_HANDS)[None, :] >= records["n_hands"][:, None]] = NO_GESTURE
+    return codes
+
+
+class RoundReplay:
+    """Drives a GameSession with recorded (or re-classified) gestures, without MediaPipe.
+
+    feed() takes consecutive parts of a trace (e.g. TraceReader.chunks()). Like the live loop,
+    the session is stepped every step_ms between records (rounds end and the result times out
+    when they would have live, not at the next inference) and to each record's own time before
+    the record is fed to it (as net_server's RemotePlayer does), so the first reveal inference
+    after the countdown counts. `mismatches` counts records whose recorded phase differs from
+    the replayed one.
+    """
+
+    def __init__(self, session=None, step_ms=1000.0 / 60):
+        self.session = session or GameSession()
+        self.step_ms = step_ms
+        self.results = []  # (result text, player gesture, cat gesture) per round
+        self.mismatches = 0
+        self._last_ms = None
+
+    def feed(self, records, codes=None):
+        if codes is None:
+            codes = records["gesture"]
+        session = self.session
+        for t, phase, n, row, landmarks in zip(records["t"], records["phase"], records["n_hands"], codes,
+                                               records["landmarks"]):
+            now_ms = int(t * 1000)
+            steps = [] if self._last_ms is None else \
+                np.arange(self._last_ms + self.step_ms, now_ms, self.step_ms).astype(int).tolist()
+            for step in steps + [now_ms]:
+                finished = session.update(step)
+                if finished:
+                    self.results.append((finished, session.player_gesture, session.cat_gesture))
+            self._last_ms = now_ms
+            if PHASES[phase] != session.phase:
+                self.mismatches += 1
+            session.on_inference([gesture_name(c) for c in row[:n]], now_ms, landmarks=landmarks[:n])
+
+
+def gesture_histogram(records, codes):
+    valid = np.arange(MAX_HANDS)[None, :] < records["n_hands"][:, None]
+    values = codes[valid]
+    hist = {name: int((values == code).sum()) for code, name in enumerate(GESTURES)}
+    hist[None] = int((values == NO_GESTURE).sum())
+    return hist
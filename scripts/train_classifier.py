@@ -0,0 +1,50 @@
+"""Train the learned gesture classifier from labelled landmark recordings.
+
+Usage:
+    python scripts/train_classifier.py rock=rock.npz paper=paper.npz scissors=scissors.npz -o gesture_model.npz
+    python scripts/train_classifier.py labelled.npz rock=rock.trace --hidden 32
+
+Inputs are "LABEL=PATH" (a --dump-landmarks .npz or a --record-trace file where
+every hand shows LABEL) or "PATH" (an .npz that carries its own `labels`).
+After training, accuracy on the held-out split is printed next to the
+rule-based classifier's; run bench_learned_classifier.py for timings.
+"""
+import argparse
+import sys
+
+from gesture_classifier import GESTURES, NO_GESTURE, classify_batch
+from learned_classifier import GestureModel, load_labelled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("data", nargs="+", help="LABEL=PATH or PATH (npz with labels)")
+    parser.add_argument("-o", "--output", default="gesture_model.npz")
+    parser.add_argument("--hidden", type=int, default=0, help="hidden units (0 = logistic regression)")
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--lr", type=float, default=0.01)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    landmarks, handedness, labels = load_labelled(args.data)
+    print("Training on %d hands %s" % (len(labels), {g: int((labels == i).sum()) for i, g in enumerate(GESTURES)}))
+    model, val = GestureModel.train(landmarks, handedness, labels, hidden=args.hidden, epochs=args.epochs,
+                                    lr=args.lr, l2=args.l2, seed=args.seed, log=print)
+    model.save(args.output)
+    print("Saved %s (temperature %.2f)" % (args.output, model.temperature))
+
+    if not len(val):
+        return 0
+    codes, confidence = model.predict(landmarks[val], handedness[val])
+    rules = classify_batch(landmarks[val], handedness[val])
+    y = labels[val]
+    print("Held-out: %d hands" % len(val))
+    print("  learned accuracy:     %.3f  (mean confidence %.2f)" % ((codes == y).mean(), confidence.mean()))
+    print("  rule-based accuracy:  %.3f  (uncertain on %.1f%%)"
+          % ((rules == y).mean(), (rules == NO_GESTURE).mean() * 100.0))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())